@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+  backlog.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 14:02:16
+
+  Purpose: Batch conversion of screenshots left in the source directory.
+"""
+
+import calendar
+import json
+import os
+import time
+from glob import glob
+from inspect import currentframe
+from queue import Queue, SimpleQueue
+from typing import Any, Dict, List, Optional, Set, Union
+
+from edpc.jsktoolbox.raisetool import Raise
+from edpc.jsktoolbox.edmctool.base import BLogClient
+from edpc.jsktoolbox.edmctool.logs import LogClient
+from edpc.converter import ConvertJob
+from edpc.keys import EDPCKeys
+from edpc.streams import BmpReader
+
+
+class Backlog(BLogClient):
+    """Backlog class.
+
+    Collects the screenshots which were never announced by the journal
+    events, recovers their metadata from the journal files and hands them
+    out in portions. Finished files are recorded in the checkpoint file,
+    so the interrupted batch can be resumed without repeating the work.
+    """
+
+    # number of finished jobs between checkpoint writes
+    SAVE_EVERY: int = 10
+    # allowed difference between the event timestamp and file mtime
+    TIME_SLACK: int = 120
+    # journal timestamp format
+    LOG_TIME: str = "%Y-%m-%dT%H:%M:%SZ"
+
+    __src_dir: str = None  # type: ignore
+    __journal_dir: Optional[str] = None
+    __checkpoint: str = None  # type: ignore
+    __pending: List[Dict[str, Any]] = None  # type: ignore
+    __done: Set[str] = None  # type: ignore
+    __total: int = 0
+    __finished: int = 0
+    __failed: int = 0
+    __running: int = 0
+    __unsaved: int = 0
+    __scanned: bool = False
+
+    def __init__(
+        self,
+        queue: Union[Queue, SimpleQueue],
+        src_dir: str,
+        journal_dir: Optional[str],
+        checkpoint: str,
+    ) -> None:
+        """Initialize Backlog class.
+
+        src_dir: directory with the screenshots,
+        journal_dir: directory with the game journal files,
+        checkpoint: path to the checkpoint file.
+        """
+        if not isinstance(queue, (Queue, SimpleQueue)):
+            raise Raise.error(
+                f"Queue or SimpleQueue type expected, '{type(queue)}' received.",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        self.logger = LogClient(queue)
+        self.__src_dir = src_dir
+        self.__journal_dir = journal_dir
+        self.__checkpoint = checkpoint
+        self.__pending = []
+        self.__done = set()
+
+    @property
+    def total(self) -> int:
+        """Give me the number of screenshots in the batch."""
+        return self.__total
+
+    @property
+    def finished(self) -> int:
+        """Give me the number of finished jobs."""
+        return self.__finished
+
+    @property
+    def failed(self) -> int:
+        """Give me the number of failed jobs."""
+        return self.__failed
+
+    @property
+    def running(self) -> int:
+        """Give me the number of jobs handed out and not finished yet."""
+        return self.__running
+
+    @property
+    def active(self) -> bool:
+        """Give me True if the batch is not finished."""
+        return not self.__scanned or bool(self.__pending) or self.__running > 0
+
+    @property
+    def progress(self) -> str:
+        """Give me the progress message."""
+        msg: str = f"Backlog: {self.__finished + self.__failed}/{self.__total}"
+        if self.__failed:
+            msg += f", {self.__failed} failed"
+        return msg
+
+    def scan(self) -> int:
+        """Build the list of screenshots to convert.
+
+        Files finished in the previous runs and files newer than the scan,
+        which are handled by the journal events, are skipped.
+        Returns the number of screenshots found.
+        """
+        started: float = time.time()
+        self.__load()
+        files: List[os.DirEntry] = []
+        with os.scandir(self.__src_dir) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith(".bmp"):
+                    continue
+                stat: os.stat_result = entry.stat()
+                if stat.st_mtime >= started or self.__key(entry) in self.__done:
+                    continue
+                files.append(entry)
+        files.sort(key=lambda entry: entry.stat().st_mtime)
+        events: Dict[str, List[Dict[str, Any]]] = {}
+        if files:
+            events = self.__journal_events(files[0].stat().st_mtime)
+        recovered: int = 0
+        for entry in files:
+            item: Optional[Dict[str, Any]] = self.__match(
+                entry, events.get(entry.name.lower(), [])
+            )
+            if item is None:
+                item = self.__synthesize(entry)
+            else:
+                recovered += 1
+            item[EDPCKeys.P_BACKLOG] = self.__key(entry)
+            self.__pending.append(item)
+        self.__total = len(self.__pending)
+        self.__scanned = True
+        self.logger.info = (
+            f"Backlog: {self.__total} screenshots found, "
+            f"{recovered} matched with journal events"
+        )
+        return self.__total
+
+    def take(self, count: int) -> List[Dict[str, Any]]:
+        """Give me up to count screenshot events to convert."""
+        out: List[Dict[str, Any]] = self.__pending[:count]
+        del self.__pending[:count]
+        self.__running += len(out)
+        return out
+
+    def finish(self, job: ConvertJob) -> None:
+        """Record the result of the finished job."""
+        self.__running -= 1
+        if job.done:
+            self.__finished += 1
+            self.__done.add(job.item[EDPCKeys.P_BACKLOG])
+            self.__unsaved += 1
+        else:
+            self.__failed += 1
+        if self.__unsaved >= self.SAVE_EVERY or not self.active:
+            self.save()
+
+    def cancel(self) -> None:
+        """Drop the jobs not handed out yet and save the checkpoint."""
+        self.__pending.clear()
+        self.__scanned = True
+        self.save()
+
+    def save(self) -> None:
+        """Write the checkpoint file."""
+        if not self.__unsaved:
+            return
+        tmp: str = f"{self.__checkpoint}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as file:
+                json.dump(
+                    {"src_dir": self.__src_dir, "done": sorted(self.__done)}, file
+                )
+            os.replace(tmp, self.__checkpoint)
+            self.__unsaved = 0
+        except OSError as ex:
+            self.logger.error = f"Cannot write backlog checkpoint: {ex}"
+
+    def __load(self) -> None:
+        """Read the checkpoint file of the previous run."""
+        self.__done = set()
+        if not os.path.exists(self.__checkpoint):
+            return
+        try:
+            with open(self.__checkpoint, "r", encoding="utf-8") as file:
+                data: Dict[str, Any] = json.load(file)
+            if data.get("src_dir") == self.__src_dir:
+                self.__done = set(data.get("done", []))
+        except (OSError, ValueError) as ex:
+            self.logger.warning = f"Backlog checkpoint ignored: {ex}"
+
+    @staticmethod
+    def __key(entry: os.DirEntry) -> str:
+        """Give me the checkpoint key of the file."""
+        stat: os.stat_result = entry.stat()
+        return f"{entry.name}:{stat.st_size}:{int(stat.st_mtime)}"
+
+    def __journal_events(self, since: float) -> Dict[str, List[Dict[str, Any]]]:
+        """Give me Screenshot events from the journals, grouped by filename.
+
+        since: journal files not modified since that time are skipped.
+        """
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        if not self.__journal_dir or not os.path.isdir(self.__journal_dir):
+            self.logger.warning = "Backlog: journal directory not found"
+            return out
+        for path in sorted(glob(os.path.join(self.__journal_dir, "Journal.*.log"))):
+            try:
+                if os.path.getmtime(path) < since:
+                    continue
+                cmdr: str = ""
+                with open(path, "r", encoding="utf-8", errors="replace") as file:
+                    for line in file:
+                        if (
+                            '"Screenshot"' not in line
+                            and '"Commander"' not in line
+                            and '"LoadGame"' not in line
+                        ):
+                            continue
+                        try:
+                            entry: Dict[str, Any] = json.loads(line)
+                        except ValueError:
+                            continue
+                        event: str = entry.get(EDPCKeys.P_EVENT, "")
+                        if event == "Commander":
+                            cmdr = entry.get("Name", cmdr)
+                        elif event == "LoadGame":
+                            cmdr = entry.get("Commander", cmdr)
+                        elif event == EDPCKeys.P_SCREENSHOT:
+                            item: Dict[str, Any] = self.__event(entry, cmdr)
+                            out.setdefault(
+                                item[EDPCKeys.P_FILENAME].lower(), []
+                            ).append(item)
+            except OSError as ex:
+                self.logger.warning = f"Backlog: cannot read {path}: {ex}"
+        return out
+
+    def __event(self, entry: Dict[str, Any], cmdr: str) -> Dict[str, Any]:
+        """Give me screenshot event in the journal_entry format."""
+        event: Dict[str, Any] = {}
+        event[EDPCKeys.P_CMDR] = cmdr
+        event[EDPCKeys.P_TIMESTAMP] = entry[EDPCKeys.P_TIMESTAMP]
+        event[EDPCKeys.P_FILENAME] = (
+            entry[EDPCKeys.P_FILENAME].replace("\\", "/").split("/")[-1]
+        )
+        event[EDPCKeys.P_WIDTH] = entry.get(EDPCKeys.P_WIDTH, 0)
+        event[EDPCKeys.P_HEIGHT] = entry.get(EDPCKeys.P_HEIGHT, 0)
+        if EDPCKeys.P_SYSTEM in entry:
+            event[EDPCKeys.P_SYSTEM] = entry[EDPCKeys.P_SYSTEM]
+        if EDPCKeys.P_BODY in entry:
+            event[EDPCKeys.P_BODY] = entry[EDPCKeys.P_BODY]
+        else:
+            event[EDPCKeys.P_BODY] = entry.get(
+                EDPCKeys.P_SYSTEM, os.path.splitext(event[EDPCKeys.P_FILENAME])[0]
+            )
+        return event
+
+    def __match(
+        self, entry: os.DirEntry, events: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Give me the latest event written before the file was modified.
+
+        The game reuses the screenshot filenames, so the event closest
+        to the file modification time wins.
+        """
+        mtime: float = entry.stat().st_mtime + self.TIME_SLACK
+        found: Optional[Dict[str, Any]] = None
+        found_time: int = 0
+        for event in events:
+            try:
+                stamp: int = calendar.timegm(
+                    time.strptime(event[EDPCKeys.P_TIMESTAMP], self.LOG_TIME)
+                )
+            except ValueError:
+                continue
+            if found_time <= stamp <= mtime:
+                found = event
+                found_time = stamp
+        if found is not None:
+            found = dict(found)
+            found[EDPCKeys.P_FILENAME] = entry.name
+        return found
+
+    def __synthesize(self, entry: os.DirEntry) -> Dict[str, Any]:
+        """Give me screenshot event built from the file itself."""
+        event: Dict[str, Any] = {}
+        event[EDPCKeys.P_CMDR] = ""
+        event[EDPCKeys.P_TIMESTAMP] = time.strftime(
+            self.LOG_TIME, time.gmtime(entry.stat().st_mtime)
+        )
+        event[EDPCKeys.P_FILENAME] = entry.name
+        event[EDPCKeys.P_WIDTH] = 0
+        event[EDPCKeys.P_HEIGHT] = 0
+        try:
+            with BmpReader(entry.path) as reader:
+                event[EDPCKeys.P_WIDTH] = reader.width
+                event[EDPCKeys.P_HEIGHT] = reader.height
+        except Exception:
+            pass
+        event[EDPCKeys.P_BODY] = os.path.splitext(entry.name)[0]
+        return event
+
+
+# #[EOF]#######################################################################
@@ -8,20 +8,160 @@ Created on 30 dec 2022.
 from inspect import currentframe
 import os
 import shutil
-import time
 import tkinter as tk
 from datetime import datetime, timedelta
 from queue import Queue, SimpleQueue
-from typing import Optional, Union
+from threading import Lock
+from _thread import LockType
+from typing import Callable, Dict, List, Optional, Set, Union
 
 from PIL import Image
 
 from edpc.jsktoolbox.raisetool import Raise
+from edpc.jsktoolbox.basetool.classes import BClasses
 from edpc.jsktoolbox.edmctool.base import BLogClient
 from edpc.jsktoolbox.edmctool.logs import LogClient
 from edpc.jsktoolbox.edmctool.system import Directory
 from edpc.base_message import BMessages
+from edpc.dedup import DedupIndex, DedupModes
+from edpc.gametime import GameTime
 from edpc.keys import EDPCKeys
+from edpc.metadata import Metadata
+from edpc.profiles import EncoderProfiles, ProfileKeys
+from edpc.streams import StreamConverter
+from edpc.thumbs import Pyramid
+
+
+class ConvertJob(BMessages):
+    """ConvertJob container class.
+
+    Holds a single screenshot event and the result of its conversion,
+    so that the jobs can be processed in parallel.
+    """
+
+    def __init__(self, item: Dict) -> None:
+        """Initialize ConvertJob class."""
+        self._set_data(key=EDPCKeys.JOB_ITEM, value=item, set_default_type=Dict)
+        self._set_data(key=EDPCKeys.JOB_DONE, value=False, set_default_type=bool)
+        self._set_data(
+            key=EDPCKeys.JOB_CONVERT, value=None, set_default_type=Optional[bool]
+        )
+        self._set_data(
+            key=EDPCKeys.JOB_REMOVE, value=None, set_default_type=Optional[bool]
+        )
+        self._set_data(key=EDPCKeys.JOB_DST, value=None, set_default_type=Optional[str])
+        self.messages = None
+
+    @property
+    def item(self) -> Dict:
+        """Give me the screenshot event."""
+        return self._get_data(key=EDPCKeys.JOB_ITEM)  # type: ignore
+
+    @property
+    def done(self) -> bool:
+        """Give me the conversion result flag."""
+        return self._get_data(key=EDPCKeys.JOB_DONE)  # type: ignore
+
+    @done.setter
+    def done(self, arg: bool) -> None:
+        self._set_data(key=EDPCKeys.JOB_DONE, value=arg)
+
+    @property
+    def convert(self) -> Optional[bool]:
+        """Give me the convert flag, None - use the converter setting."""
+        return self._get_data(key=EDPCKeys.JOB_CONVERT)
+
+    @convert.setter
+    def convert(self, arg: Optional[bool]) -> None:
+        self._set_data(key=EDPCKeys.JOB_CONVERT, value=arg)
+
+    @property
+    def remove(self) -> Optional[bool]:
+        """Give me the remove flag, None - use the converter setting."""
+        return self._get_data(key=EDPCKeys.JOB_REMOVE)
+
+    @remove.setter
+    def remove(self, arg: Optional[bool]) -> None:
+        self._set_data(key=EDPCKeys.JOB_REMOVE, value=arg)
+
+    @property
+    def dst(self) -> Optional[str]:
+        """Give me the path of the output file."""
+        return self._get_data(key=EDPCKeys.JOB_DST)
+
+    @dst.setter
+    def dst(self, arg: Optional[str]) -> None:
+        self._set_data(key=EDPCKeys.JOB_DST, value=arg)
+
+
+class NameIndex(BClasses):
+    """NameIndex class.
+
+    In-memory index of the filenames taken in destination directories.
+    Every directory is scanned once, the names are then allocated with
+    exclusive-create, so two jobs can never get the same filename.
+    """
+
+    __lock: LockType = None  # type: ignore
+    __dirs: Dict[str, Set[str]] = None  # type: ignore
+    __hints: Dict[str, int] = None  # type: ignore
+
+    def __init__(self) -> None:
+        """Initialize NameIndex class."""
+        self.__lock = Lock()
+        self.__dirs = {}
+        self.__hints = {}
+
+    def __taken(self, directory: str) -> Set[str]:
+        """Give me the set of taken names, seed it on first use."""
+        key: str = os.path.normcase(os.path.abspath(directory))
+        if key not in self.__dirs:
+            with os.scandir(directory) as entries:
+                self.__dirs[key] = {os.path.normcase(entry.name) for entry in entries}
+        return self.__dirs[key]
+
+    def allocate(
+        self, directory: str, names: Callable[[int], str], limit: int = 99
+    ) -> Optional[str]:
+        """Allocate unique filename in the directory.
+
+        names: function returning the filename for the given counter,
+        limit: maximum value of the counter.
+
+        Creates an empty placeholder file and returns its path,
+        or None if all the names are taken.
+        """
+        with self.__lock:
+            taken: Set[str] = self.__taken(directory)
+            base: str = os.path.normcase(os.path.join(directory, names(0)))
+            count: int = self.__hints.get(base, 0)
+            while count <= limit:
+                filename: str = names(count)
+                count += 1
+                if os.path.normcase(filename) in taken:
+                    continue
+                path: str = os.path.join(directory, filename)
+                try:
+                    os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                except FileExistsError:
+                    taken.add(os.path.normcase(filename))
+                    continue
+                taken.add(os.path.normcase(filename))
+                self.__hints[base] = count
+                return path
+        return None
+
+    def release(self, path: str) -> None:
+        """Remove the allocated file and free its name."""
+        with self.__lock:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError:
+                return
+            directory, filename = os.path.split(path)
+            self.__taken(directory).discard(os.path.normcase(filename))
+            self.__hints.clear()
 
 
 class PicConverter(BLogClient, BMessages):
@@ -46,11 +186,31 @@ class PicConverter(BLogClient, BMessages):
             key=EDPCKeys.SRC_DIR, value=None, set_default_type=Optional[Directory]
         )
         self._set_data(key=EDPCKeys.SUFFIX, value="bmp", set_default_type=str)
+        self._set_data(
+            key=EDPCKeys.PROFILE, value=ProfileKeys.BALANCED, set_default_type=str
+        )
         self._set_data(key=EDPCKeys.REMOVE, value=True, set_default_type=bool)
         self._set_data(
             key=EDPCKeys.DELTA_TIME, value=None, set_default_type=Optional[timedelta]
         )
         self._set_data(key=EDPCKeys.CONVERT_TYPE, value=False, set_default_type=bool)
+        # screenshots larger than the limit are converted strip by strip
+        self._set_data(
+            key=EDPCKeys.STREAM_LIMIT, value=3840 * 2160, set_default_type=int
+        )
+        # sizes of the downscaled renditions
+        self._set_data(key=EDPCKeys.THUMBNAILS, value=[], set_default_type=List)
+        # screenshot event written to the image headers
+        self._set_data(key=EDPCKeys.METADATA, value=True, set_default_type=bool)
+        # duplicates detection
+        self._set_data(key=EDPCKeys.DEDUP, value=DedupModes.OFF, set_default_type=str)
+        self._set_data(
+            key=EDPCKeys.DEDUP_INDEX, value=None, set_default_type=Optional[DedupIndex]
+        )
+        # destination names taken in the destination directories
+        self._set_data(
+            key=EDPCKeys.NAMES_INDEX, value=NameIndex(), set_default_type=NameIndex
+        )
 
         self.src_dir = Directory()
         self.dst_dir = Directory()
@@ -75,6 +235,14 @@ class PicConverter(BLogClient, BMessages):
             key=EDPCKeys.DELTA_TIME,
             value=datetime(3309, 1, 1, 1, 1, 43) - datetime(2023, 1, 1, 2, 1, 43),
         )
+        self._set_data(
+            key=EDPCKeys.GAME_TIME,
+            value=GameTime(
+                self._get_data(key=EDPCKeys.DELTA_TIME),  # type: ignore
+                self._get_data(key=EDPCKeys.PIC_TIME),  # type: ignore
+            ),
+            set_default_type=GameTime,
+        )
 
         # init log subsystem
         if not isinstance(queue, (Queue, SimpleQueue)):
@@ -146,115 +314,341 @@ class PicConverter(BLogClient, BMessages):
         """Setter for suffix pic filename."""
         self._set_data(key=EDPCKeys.SUFFIX, value=arg)
 
+    @property
+    def profile(self) -> str:
+        """Encoder profile name."""
+        return self._get_data(key=EDPCKeys.PROFILE)  # type: ignore
+
+    @profile.setter
+    def profile(self, arg: str) -> None:
+        """Setter for encoder profile name."""
+        self._set_data(key=EDPCKeys.PROFILE, value=arg)
+
+    @property
+    def stream_limit(self) -> int:
+        """Give me the number of pixels, above which the streaming is used."""
+        return self._get_data(key=EDPCKeys.STREAM_LIMIT)  # type: ignore
+
+    @stream_limit.setter
+    def stream_limit(self, arg: int) -> None:
+        self._set_data(key=EDPCKeys.STREAM_LIMIT, value=arg)
+
+    @property
+    def thumbnails(self) -> List[int]:
+        """Give me the sizes of the downscaled renditions."""
+        return self._get_data(key=EDPCKeys.THUMBNAILS)  # type: ignore
+
+    @thumbnails.setter
+    def thumbnails(self, arg: Union[str, List[int]]) -> None:
+        """Set the sizes, list or '256,1024,2048' like string."""
+        self._set_data(key=EDPCKeys.THUMBNAILS, value=Pyramid.parse(arg))
+
+    @property
+    def metadata(self) -> bool:
+        """Give me True if the metadata is embedded into converted files."""
+        return self._get_data(key=EDPCKeys.METADATA)  # type: ignore
+
+    @metadata.setter
+    def metadata(self, arg: Union[bool, int, tk.IntVar]) -> None:
+        if isinstance(arg, bool):
+            self._set_data(key=EDPCKeys.METADATA, value=arg)
+        elif isinstance(arg, int) and arg == 1:
+            self._set_data(key=EDPCKeys.METADATA, value=True)
+        elif isinstance(arg, tk.IntVar) and arg.get() == 1:
+            self._set_data(key=EDPCKeys.METADATA, value=True)
+        else:
+            self._set_data(key=EDPCKeys.METADATA, value=False)
+
+    @property
+    def dedup(self) -> str:
+        """Give me the duplicates handling mode."""
+        return self._get_data(key=EDPCKeys.DEDUP)  # type: ignore
+
+    @dedup.setter
+    def dedup(self, arg: str) -> None:
+        self._set_data(key=EDPCKeys.DEDUP, value=arg)
+
+    @property
+    def dedup_index(self) -> Optional[DedupIndex]:
+        """Give me the index of the saved screenshots."""
+        return self._get_data(key=EDPCKeys.DEDUP_INDEX)
+
+    @dedup_index.setter
+    def dedup_index(self, arg: Optional[DedupIndex]) -> None:
+        self._set_data(key=EDPCKeys.DEDUP_INDEX, value=arg)
+
     def str_time(self, arg: str) -> str:
         """Timestamp from logs in local time convert to game time string.
 
         input: 2023-01-01T03:01:43Z
         output: 33090101-010143
         """
-        # create struct_time
-        str_time: time.struct_time = time.strptime(arg, self._get_data(key=EDPCKeys.LOG_TIME))  # type: ignore
-
-        # create datetime object
-        dt_obj = datetime(*str_time[:6])
-
-        # conversion local time to game time
-        dt_obj2: datetime = dt_obj + self._get_data(key=EDPCKeys.DELTA_TIME)  # type: ignore
-
-        return dt_obj2.strftime(self._get_data(key=EDPCKeys.PIC_TIME))  # type: ignore
+        return self._get_data(key=EDPCKeys.GAME_TIME).convert(arg)  # type: ignore
 
     def convert(self, arg: dict) -> bool:
         """Pictures converter."""
-        done: bool = False
+        job: ConvertJob = self.process(ConvertJob(arg))
+        self.messages = job.messages
+        return job.done
+
+    def process(self, job: ConvertJob) -> ConvertJob:
+        """Process single conversion job.
+
+        The method does not modify the state of the converter,
+        so it can be called from many threads at once.
+        """
+        arg: Dict = job.item
         convert: bool = False
+        remove: bool = self.remove if job.remove is None else job.remove
 
         local_suffix = os.path.splitext(arg[EDPCKeys.P_FILENAME])[1][1:]
-        self.logger.debug = "def convert"
+        self.logger.debug = "def process"
         self.logger.debug = f"Local suffix: {local_suffix}"
         self.logger.debug = f"Suffix: {self._get_data(key=EDPCKeys.SUFFIX)}"
         self.logger.debug = (
             f"Local convert flag: {self._get_data(key=EDPCKeys.CONVERT_TYPE)}"
         )
-        if self._get_data(key=EDPCKeys.CONVERT_TYPE):
+        if (
+            self._get_data(key=EDPCKeys.CONVERT_TYPE)
+            if job.convert is None
+            else job.convert
+        ):
             local_suffix = self._get_data(key=EDPCKeys.SUFFIX)
             convert = True
 
         # check dirs
         if not Directory().is_directory(self.src_dir.dir):
             self.logger.error = f"Source directory is invalid: {self.src_dir.dir}"
-            return done
+            return job
         if not Directory().is_directory(self.dst_dir.dir):
             self.logger.error = f"Destination directory is invalid: {self.dst_dir.dir}"
-            return done
+            return job
         # check filename
         src: str = os.path.join(self.src_dir.dir, arg[EDPCKeys.P_FILENAME])
         if not os.path.exists(src):
             self.logger.error = f"Source file not found: {src}"
-            return done
+            return job
+        # look for the identical screenshot saved before
+        digest: Optional[str] = None
+        params: str = f"{local_suffix}:{self.profile if convert else ''}"
+        if self.dedup != DedupModes.OFF and self.dedup_index is not None:
+            digest = self.__digest(src)
+            if digest is not None and self.__dedup(job, digest, params, local_suffix):
+                if remove:
+                    self.__remove_source(src)
+                return job
         # generate dst filename
-        name = arg[EDPCKeys.P_BODY]
-        dst: str = os.path.join(
-            self.dst_dir.dir,
-            self._get_data(key=EDPCKeys.PIC_FILE).format(  # type: ignore
-                self.str_time(arg[EDPCKeys.P_TIMESTAMP]), name, local_suffix
-            ),
-        )
-        # if dst file is present, generate new unique name
-        count = 0
-        while os.path.exists(dst):
-            count += 1
-            dst = os.path.join(
-                self.dst_dir.dir,
-                self._get_data(key=EDPCKeys.PIC_COUNT_FILE).format(  # type: ignore
-                    self.str_time(arg[EDPCKeys.P_TIMESTAMP]), name, count, local_suffix
-                ),
-            )
-            if count == 99:
-                self.logger.error = "Cannot generate a valid filename"
-                return done
-        # save or convert file
-        if convert:
-            if self.__pil_convert(src, dst):
-                done = True
-            else:
-                self.logger.error = "Cannot convert type of file, try to make copy..."
-                if self.__copy_file(src, dst):
-                    done = True
+        dst: Optional[str] = self.__reserve_name(arg, local_suffix)
+        if dst is None:
+            self.logger.error = "Cannot generate a valid filename"
+            return job
+        try:
+            # save or convert file
+            if convert:
+                streamed: Optional[bool] = self.__stream_convert(job, src, dst)
+                # the full decode only if the streaming was not possible,
+                # after its error the memory bound is kept
+                if streamed or (
+                    streamed is False and self.__pil_convert(job, src, dst)
+                ):
+                    job.done = True
                 else:
-                    return done
-        else:
-            done = self.__copy_file(src, dst)
-            if not done:
-                return done
+                    self.logger.error = (
+                        "Cannot convert type of file, try to make copy..."
+                    )
+                    if self.__copy_file(job, src, dst):
+                        job.done = True
+                    else:
+                        return job
+            elif remove:
+                # source file is removed by the move
+                job.done = self.__move_file(job, src, dst)
+                if job.done:
+                    job.dst = dst
+                    self.__remember(digest, params, dst)
+                return job
+            else:
+                job.done = self.__copy_file(job, src, dst)
+                if not job.done:
+                    return job
+        finally:
+            if not job.done:
+                self.__release_name(dst)
+        job.dst = dst
+        self.__remember(digest, params, dst)
         # remove src
+        if remove:
+            self.__remove_source(src)
+
+        return job
+
+    def __remove_source(self, src: str) -> None:
+        """Remove the source file."""
         try:
-            if self.remove:
-                self.logger.debug = (
-                    f"try to remove file: {arg[EDPCKeys.P_FILENAME]}....."
-                )
-                os.remove(src)
-                self.logger.debug = "... done"
+            self.logger.debug = f"try to remove file: {os.path.basename(src)}....."
+            os.remove(src)
+            self.logger.debug = "... done"
+        except Exception as ex:
+            self.logger.error = f"ERROR: {ex}"
+
+    def __digest(self, src: str) -> Optional[str]:
+        """Give me the content hash of the source file."""
+        try:
+            return DedupIndex.digest(src)
+        except OSError as ex:
+            self.logger.warning = f"Cannot hash the file: {ex}"
+        return None
+
+    def __remember(self, digest: Optional[str], params: str, dst: str) -> None:
+        """Record the saved file in the duplicates index."""
+        if digest is None or self.dedup_index is None:
+            return
+        try:
+            self.dedup_index.add(digest, params, dst)
+        except Exception as ex:
+            self.logger.warning = f"Cannot update the duplicates index: {ex}"
+
+    def __dedup(self, job: ConvertJob, digest: str, params: str, suffix: str) -> bool:
+        """Handle the duplicate of the saved screenshot.
+
+        Returns True if the job is finished: the duplicate is skipped
+        or hard-linked to the saved file, False if it must be processed.
+        """
+        try:
+            found: Optional[str] = self.dedup_index.find(digest, params)  # type: ignore
         except Exception as ex:
-            self.logger.error = f"ERROR: {ex.args[1]}"
+            self.logger.warning = f"Cannot search the duplicates index: {ex}"
+            return False
+        if found is None:
+            return False
+        filename: str = os.path.basename(found)
+        if self.dedup == DedupModes.SKIP:
+            job.done = True
+            job.messages = f"duplicate of {filename} skipped"
+            return True
+        dst: Optional[str] = self.__reserve_name(job.item, suffix)
+        if dst is None:
+            return False
+        try:
+            # replace the placeholder, the name stays reserved in the index
+            os.remove(dst)
+            os.link(found, dst)
+        except OSError as ex:
+            self.logger.debug = f"Cannot link the duplicate: {ex}"
+            self.__release_name(dst)
+            return False
+        job.done = True
+        job.dst = dst
+        job.messages = f"{os.path.basename(dst)} linked to {filename}"
+        return True
+
+    def __reserve_name(self, arg: Dict, suffix: str) -> Optional[str]:
+        """Reserve unique destination filename for the job."""
+        name = arg[EDPCKeys.P_BODY]
+        stamp: str = self.str_time(arg[EDPCKeys.P_TIMESTAMP])
+        file: str = self._get_data(key=EDPCKeys.PIC_FILE)  # type: ignore
+        count_file: str = self._get_data(key=EDPCKeys.PIC_COUNT_FILE)  # type: ignore
+        index: NameIndex = self._get_data(key=EDPCKeys.NAMES_INDEX)  # type: ignore
+        return index.allocate(
+            self.dst_dir.dir,
+            lambda count: (
+                count_file.format(stamp, name, count, suffix)
+                if count
+                else file.format(stamp, name, suffix)
+            ),
+        )
 
-        return done
+    def __release_name(self, dst: str) -> None:
+        """Release reserved destination filename of failed job."""
+        self._get_data(key=EDPCKeys.NAMES_INDEX).release(dst)  # type: ignore
 
-    def __copy_file(self, src: str, dst: str) -> bool:
+    def __copy_file(self, job: ConvertJob, src: str, dst: str) -> bool:
         """Copy file to new location."""
         # save file
         filename1: str = os.path.basename(src)
         filename2: str = os.path.basename(dst)
         try:
             self.logger.debug = f"try to copy file: {filename1} to: {filename2}....."
-            shutil.copy(src, dst)
-            self.messages = f"{filename2} copied"
+            self.__kernel_copy(src, dst)
+            job.messages = f"{filename2} copied"
             self.logger.debug = "... done"
             return True
         except Exception as ex:
-            self.logger.error = f"ERROR: {ex.args[1]}"
+            self.logger.error = f"ERROR: {ex}"
+            # never leave a partial copy behind
+            try:
+                if os.path.exists(dst):
+                    os.remove(dst)
+            except OSError:
+                pass
         return False
 
-    def __pil_convert(self, src: str, dst: str) -> bool:
+    def __move_file(self, job: ConvertJob, src: str, dst: str) -> bool:
+        """Move file to new location.
+
+        On the same device the file is renamed, otherwise it is copied
+        and the source is removed only after the copy is complete.
+        """
+        filename1: str = os.path.basename(src)
+        filename2: str = os.path.basename(dst)
+        try:
+            if os.stat(src).st_dev == os.stat(os.path.dirname(dst)).st_dev:
+                self.logger.debug = (
+                    f"try to move file: {filename1} to: {filename2}....."
+                )
+                os.replace(src, dst)
+                job.messages = f"{filename2} moved"
+                self.logger.debug = "... done"
+                return True
+        except OSError as ex:
+            self.logger.debug = f"rename failed, fallback to copy: {ex}"
+        if not self.__copy_file(job, src, dst):
+            return False
+        try:
+            self.logger.debug = f"try to remove file: {filename1}....."
+            os.remove(src)
+            self.logger.debug = "... done"
+        except Exception as ex:
+            self.logger.error = f"ERROR: {ex}"
+        return True
+
+    def __kernel_copy(self, src: str, dst: str) -> None:
+        """Copy file content in the kernel if possible.
+
+        Uses copy_file_range where available and shutil.copyfile, which
+        falls back to sendfile/fcopyfile or to a buffered copy, otherwise.
+        Raises OSError if the copy is not complete.
+        """
+        size: int = os.path.getsize(src)
+        done: bool = False
+        if hasattr(os, "copy_file_range"):
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                copied: int = 0
+                try:
+                    while copied < size:
+                        count: int = os.copy_file_range(  # type: ignore
+                            fsrc.fileno(), fdst.fileno(), size - copied
+                        )
+                        if count == 0:
+                            break
+                        copied += count
+                    done = copied == size
+                except OSError as ex:
+                    if copied > 0:
+                        raise
+                    self.logger.debug = f"copy_file_range not available: {ex}"
+        if not done:
+            shutil.copyfile(src, dst)
+        shutil.copymode(src, dst)
+        if os.path.getsize(dst) != size:
+            raise Raise.error(
+                f"Incomplete copy of file: {os.path.basename(src)}",
+                OSError,
+                self._c_name,
+                currentframe(),
+            )
+
+    def __pil_convert(self, job: ConvertJob, src: str, dst: str) -> bool:
         """Convert file to new type."""
         filename1: str = os.path.basename(src)
         filename2: str = os.path.basename(dst)
@@ -262,11 +656,69 @@ class PicConverter(BLogClient, BMessages):
         self.logger.debug = f"DST: {dst}"
         try:
             self.logger.debug = f"try to convert file: {filename1} to: {filename2}....."
-            img = Image.open(src)
-            img.save(dst)
-            self.messages = f"{filename2} converted"
+            suffix: str = os.path.splitext(dst)[1][1:]
+            params = EncoderProfiles().params(suffix, self.profile)
+            self.logger.debug = f"Profile: {self.profile}, params: {params}"
+            if self.metadata:
+                # written by the encoder, no second pass over the file
+                params.update(Metadata(job.item).pil_params(suffix))
+            with Image.open(src) as img:
+                if img.mode not in ("RGB", "L"):
+                    img = img.convert("RGB")
+                img.save(dst, **params)
+                # renditions from the same decoded image
+                if self.thumbnails:
+                    self.__thumbnails(Pyramid(dst, self.thumbnails).from_image, img)
+            job.messages = f"{filename2} converted"
             self.logger.debug = "... done"
             return True
         except Exception as ex:
-            self.logger.error = f"ERROR: {ex.args[1]}"
+            self.logger.error = f"ERROR: {ex}"
         return False
+
+    def __thumbnails(self, func: Callable, *args) -> None:
+        """Write the renditions, the errors do not fail the conversion."""
+        try:
+            paths: List[str] = func(*args)
+            self.logger.debug = f"Thumbnails: {paths}"
+        except Exception as ex:
+            self.logger.error = f"Cannot write thumbnails: {ex}"
+
+    def __stream_convert(self, job: ConvertJob, src: str, dst: str) -> Optional[bool]:
+        """Convert large file to new type with bounded memory usage.
+
+        Returns False if the streaming cannot be used for given file,
+        None if the streaming failed.
+        """
+        suffix: str = os.path.splitext(dst)[1][1:]
+        if suffix.lower() not in StreamConverter.SUFFIXES:
+            return False
+        if StreamConverter.pixels(src) < self.stream_limit:
+            return False
+        filename1: str = os.path.basename(src)
+        filename2: str = os.path.basename(dst)
+        try:
+            self.logger.debug = f"try to stream file: {filename1} to: {filename2}....."
+            pyramid: Optional[Pyramid] = (
+                Pyramid(dst, self.thumbnails) if self.thumbnails else None
+            )
+            StreamConverter().convert(
+                src,
+                dst,
+                suffix,
+                EncoderProfiles().compress_level(suffix, self.profile),
+                pyramid,
+                Metadata(job.item) if self.metadata else None,
+            )
+            if pyramid is not None:
+                self.__thumbnails(pyramid.finish)
+            job.messages = f"{filename2} converted"
+            self.logger.debug = "... done"
+            return True
+        except ValueError as ex:
+            # format not supported by the streaming reader or writer
+            self.logger.debug = f"Cannot stream file: {ex}"
+            return False
+        except Exception as ex:
+            self.logger.error = f"ERROR: {ex}"
+        return None
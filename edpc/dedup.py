@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+  dedup.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 19:05:12
+
+  Purpose: Content-hash index of the saved screenshots.
+"""
+
+import hashlib
+import os
+import sqlite3
+from threading import Lock
+from _thread import LockType
+from typing import Optional
+
+try:
+    # fast non-cryptographic hash, optional
+    import xxhash  # type: ignore
+except ModuleNotFoundError:
+    xxhash = None
+
+from edpc.jsktoolbox.attribtool import ReadOnlyClass
+from edpc.jsktoolbox.basetool.classes import BClasses
+
+
+class DedupModes(object, metaclass=ReadOnlyClass):
+    """Keys for deduplication modes."""
+
+    OFF: str = "off"
+    LINK: str = "link"
+    SKIP: str = "skip"
+
+
+class DedupIndex(BClasses):
+    """DedupIndex class.
+
+    Persistent index of the saved screenshots keyed by the hash of the
+    source file and the output parameters, so an identical screenshot
+    can be hard-linked or skipped instead of being saved again.
+    """
+
+    # size of the read buffer
+    CHUNK: int = 1024 * 1024
+
+    __lock: LockType = None  # type: ignore
+    __db: Optional[sqlite3.Connection] = None
+
+    def __init__(self, path: str) -> None:
+        """Initialize DedupIndex class.
+
+        path: database file.
+        """
+        self.__lock = Lock()
+        # used by the conversion threads, access is serialized by the lock
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("PRAGMA synchronous=NORMAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "digest TEXT NOT NULL, "
+            "params TEXT NOT NULL, "
+            "path TEXT NOT NULL, "
+            "PRIMARY KEY (digest, params))"
+        )
+        self.__db.commit()
+
+    @classmethod
+    def digest(cls, path: str) -> str:
+        """Give me the content hash of the file.
+
+        xxh3-128 if xxhash is installed, BLAKE2b otherwise,
+        the name of the algorithm is a part of the result.
+        """
+        if xxhash is not None:
+            hasher = xxhash.xxh3_128()
+            name: str = "xxh3"
+        else:
+            hasher = hashlib.blake2b(digest_size=16)
+            name = "b2"
+        buffer = bytearray(cls.CHUNK)
+        view = memoryview(buffer)
+        with open(path, "rb", buffering=0) as file:
+            while True:
+                size: int = file.readinto(buffer)  # type: ignore
+                if not size:
+                    break
+                hasher.update(view[:size])
+        return f"{name}:{hasher.hexdigest()}"
+
+    def find(self, digest: str, params: str) -> Optional[str]:
+        """Give me the path of the saved file, None if not found.
+
+        Entries pointing to removed files are dropped.
+        """
+        with self.__lock:
+            if self.__db is None:
+                return None
+            row = self.__db.execute(
+                "SELECT path FROM files WHERE digest = ? AND params = ?",
+                (digest, params),
+            ).fetchone()
+            if row is None:
+                return None
+            if os.path.isfile(row[0]):
+                return row[0]
+            self.__db.execute(
+                "DELETE FROM files WHERE digest = ? AND params = ?", (digest, params)
+            )
+            self.__db.commit()
+        return None
+
+    def add(self, digest: str, params: str, path: str) -> None:
+        """Record the saved file."""
+        with self.__lock:
+            if self.__db is None:
+                return
+            self.__db.execute(
+                "INSERT OR REPLACE INTO files (digest, params, path) VALUES (?, ?, ?)",
+                (digest, params, path),
+            )
+            self.__db.commit()
+
+    def close(self) -> None:
+        """Close the index."""
+        with self.__lock:
+            if self.__db is not None:
+                self.__db.close()
+                self.__db = None
+
+
+# #[EOF]#######################################################################
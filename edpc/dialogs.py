@@ -9,7 +9,7 @@ from inspect import currentframe
 import tkinter as tk
 from queue import Queue, SimpleQueue
 from tkinter import filedialog, ttk
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 import myNotebook as nb
 from edpc.jsktoolbox.raisetool import Raise
@@ -17,6 +17,8 @@ from edpc.jsktoolbox.edmctool.base import BLogClient
 from edpc.jsktoolbox.edmctool.system import EnvLocal
 from edpc.jsktoolbox.edmctool.logs import LogClient
 from edpc.keys import EDPCKeys
+from edpc.dedup import DedupModes
+from edpc.profiles import EncoderProfiles, ProfileKeys
 
 
 class ConfigDialog(BLogClient):
@@ -76,9 +78,49 @@ class ConfigDialog(BLogClient):
             value=tk.IntVar(value=1),
             set_default_type=tk.IntVar,
         )
+        self._set_data(
+            key=EDPCKeys.PIC_PROFILE,
+            value=tk.StringVar(value=ProfileKeys.BALANCED),
+            set_default_type=tk.StringVar,
+        )
+        self._set_data(
+            key=EDPCKeys.PIC_WORKERS,
+            value=tk.IntVar(value=1),
+            set_default_type=tk.IntVar,
+        )
+        self._set_data(
+            key=EDPCKeys.PIC_DEFER,
+            value=tk.IntVar(value=0),
+            set_default_type=tk.IntVar,
+        )
+        self._set_data(
+            key=EDPCKeys.PIC_LOW_PRIO,
+            value=tk.IntVar(value=0),
+            set_default_type=tk.IntVar,
+        )
+        self._set_data(
+            key=EDPCKeys.PIC_DEDUP,
+            value=tk.StringVar(value=DedupModes.OFF),
+            set_default_type=tk.StringVar,
+        )
+        self._set_data(
+            key=EDPCKeys.PIC_THUMBS,
+            value=tk.StringVar(value=""),
+            set_default_type=tk.StringVar,
+        )
+        self._set_data(
+            key=EDPCKeys.PIC_METADATA,
+            value=tk.IntVar(value=1),
+            set_default_type=tk.IntVar,
+        )
         self._set_data(
             key=EDPCKeys.STATUS, value=None, set_default_type=Optional[tk.Label]
         )
+        self._set_data(
+            key=EDPCKeys.BACKLOG_COMMAND,
+            value=None,
+            set_default_type=Optional[Callable],
+        )
         self._set_data(
             key=EDPCKeys.PIC_STATUS, value=None, set_default_type=Optional[nb.Label]
         )
@@ -212,6 +254,78 @@ class ConfigDialog(BLogClient):
     def pic_type(self, arg: tk.StringVar) -> None:
         self._set_data(key=EDPCKeys.PIC_TYPE, value=arg)
 
+    @property
+    def pic_profile(self) -> Optional[tk.StringVar]:
+        """Give me picprofile value Str."""
+        return self._get_data(key=EDPCKeys.PIC_PROFILE)
+
+    @pic_profile.setter
+    def pic_profile(self, arg: tk.StringVar) -> None:
+        self._set_data(key=EDPCKeys.PIC_PROFILE, value=arg)
+
+    @property
+    def pic_workers(self) -> Optional[tk.IntVar]:
+        """Give me picworkers value Int."""
+        return self._get_data(key=EDPCKeys.PIC_WORKERS)
+
+    @pic_workers.setter
+    def pic_workers(self, arg: tk.IntVar) -> None:
+        self._set_data(key=EDPCKeys.PIC_WORKERS, value=arg)
+
+    @property
+    def pic_defer(self) -> Optional[tk.IntVar]:
+        """Give me picdefer value Int."""
+        return self._get_data(key=EDPCKeys.PIC_DEFER)
+
+    @pic_defer.setter
+    def pic_defer(self, arg: tk.IntVar) -> None:
+        self._set_data(key=EDPCKeys.PIC_DEFER, value=arg)
+
+    @property
+    def pic_low_prio(self) -> Optional[tk.IntVar]:
+        """Give me piclowprio value Int."""
+        return self._get_data(key=EDPCKeys.PIC_LOW_PRIO)
+
+    @pic_low_prio.setter
+    def pic_low_prio(self, arg: tk.IntVar) -> None:
+        self._set_data(key=EDPCKeys.PIC_LOW_PRIO, value=arg)
+
+    @property
+    def pic_dedup(self) -> Optional[tk.StringVar]:
+        """Give me picdedup value Str."""
+        return self._get_data(key=EDPCKeys.PIC_DEDUP)
+
+    @pic_dedup.setter
+    def pic_dedup(self, arg: tk.StringVar) -> None:
+        self._set_data(key=EDPCKeys.PIC_DEDUP, value=arg)
+
+    @property
+    def pic_thumbs(self) -> Optional[tk.StringVar]:
+        """Give me picthumbs value Str."""
+        return self._get_data(key=EDPCKeys.PIC_THUMBS)
+
+    @pic_thumbs.setter
+    def pic_thumbs(self, arg: tk.StringVar) -> None:
+        self._set_data(key=EDPCKeys.PIC_THUMBS, value=arg)
+
+    @property
+    def pic_metadata(self) -> Optional[tk.IntVar]:
+        """Give me picmetadata value Int."""
+        return self._get_data(key=EDPCKeys.PIC_METADATA)
+
+    @pic_metadata.setter
+    def pic_metadata(self, arg: tk.IntVar) -> None:
+        self._set_data(key=EDPCKeys.PIC_METADATA, value=arg)
+
+    @property
+    def backlog_command(self) -> Optional[Callable]:
+        """Give me the backlog conversion callback."""
+        return self._get_data(key=EDPCKeys.BACKLOG_COMMAND)
+
+    @backlog_command.setter
+    def backlog_command(self, arg: Callable) -> None:
+        self._set_data(key=EDPCKeys.BACKLOG_COMMAND, value=arg)
+
     def create_dialog(self, parent: nb.Notebook) -> nb.Frame:
         """Create and return config dialog."""
         frame = nb.Frame(parent)
@@ -241,9 +355,23 @@ class ConfigDialog(BLogClient):
         frame.rowconfigure(rc_conv + 1, weight=1)
         frame.rowconfigure(rc_conv + 2, weight=1)
         frame.rowconfigure(rc_conv + 3, weight=1)
+        frame.rowconfigure(rc_conv + 4, weight=1)
+        frame.rowconfigure(rc_conv + 5, weight=1)
+        # conversion threads
+        rc_work = rc_conv + 6
+        frame.rowconfigure(rc_work, weight=1)
+        # deferred conversion
+        rc_defer = rc_work + 1
+        frame.rowconfigure(rc_defer, weight=1)
+        # duplicates
+        rc_dup = rc_defer + 1
+        frame.rowconfigure(rc_dup, weight=1)
+        # thumbnails
+        rc_thumb = rc_dup + 1
+        frame.rowconfigure(rc_thumb, weight=1)
 
         # spring row
-        rc_spr = rc_conv + 4
+        rc_spr = rc_thumb + 1
         frame.rowconfigure(rc_spr, weight=100)
 
         # stat row
@@ -303,24 +431,108 @@ class ConfigDialog(BLogClient):
         self.pic_conv_check.grid(
             padx=10, row=rc_conv, column=0, columnspan=2, sticky=tk.W
         )
-        nb.Radiobutton(
+        formats = EncoderProfiles().formats
+        for idx, (text, value) in enumerate(
+            (
+                ("JPG", "jpg"),
+                ("PNG", "png"),
+                ("TIFF", "tif"),
+                ("WEBP", "webp"),
+                ("AVIF", "avif"),
+            )
+        ):
+            nb.Radiobutton(
+                frame,
+                text=text,
+                value=value,
+                variable=self._get_data(key=EDPCKeys.PIC_TYPE),
+                state=tk.NORMAL if value in formats else tk.DISABLED,
+            ).grid(padx=10, row=rc_conv + 1 + idx, column=1, sticky=tk.W)
+
+        # encoder profile
+        nb.Label(frame, text="Encoder profile:").grid(
+            padx=10, row=rc_conv, column=2, sticky=tk.W
+        )
+        for idx, (text, value) in enumerate(
+            (
+                ("fast", ProfileKeys.FAST),
+                ("balanced", ProfileKeys.BALANCED),
+                ("small files", ProfileKeys.SMALL),
+            )
+        ):
+            nb.Radiobutton(
+                frame,
+                text=text,
+                value=value,
+                variable=self.pic_profile,
+            ).grid(padx=10, row=rc_conv + 1 + idx, column=2, sticky=tk.W)
+
+        # conversion threads
+        nb.Label(frame, text="Conversion threads:").grid(
+            padx=10, row=rc_work, column=0, sticky=tk.W
+        )
+        workers = self.pic_workers.get() if self.pic_workers else 1
+        nb.OptionMenu(
             frame,
-            text="JPG",
-            value="jpg",
-            variable=self._get_data(key=EDPCKeys.PIC_TYPE),
-        ).grid(padx=10, row=rc_conv + 1, column=1, sticky=tk.W)
-        nb.Radiobutton(
+            self.pic_workers,
+            workers,
+            *sorted({1, 2, 4, 8, workers}),
+        ).grid(padx=10, row=rc_work, column=1, sticky=tk.W)
+
+        # deferred conversion
+        nb.Label(frame, text="Defer conversion while playing [s]:").grid(
+            padx=10, row=rc_defer, column=0, sticky=tk.W
+        )
+        defer = self.pic_defer.get() if self.pic_defer else 0
+        nb.OptionMenu(
             frame,
-            text="PNG",
-            value="png",
-            variable=self._get_data(key=EDPCKeys.PIC_TYPE),
-        ).grid(padx=10, row=rc_conv + 2, column=1, sticky=tk.W)
-        nb.Radiobutton(
+            self.pic_defer,
+            defer,
+            *sorted({0, 30, 120, 600, defer}),
+        ).grid(padx=10, row=rc_defer, column=1, sticky=tk.W)
+        nb.Checkbutton(
             frame,
-            text="TIFF",
-            value="tif",
-            variable=self._get_data(key=EDPCKeys.PIC_TYPE),
-        ).grid(padx=10, row=rc_conv + 3, column=1, sticky=tk.W)
+            text="low priority",
+            variable=self.pic_low_prio,
+            onvalue=1,
+            offvalue=0,
+        ).grid(padx=10, row=rc_defer, column=2, sticky=tk.W)
+
+        # duplicates
+        nb.Label(frame, text="Duplicate screenshots:").grid(
+            padx=10, row=rc_dup, column=0, sticky=tk.W
+        )
+        nb.OptionMenu(
+            frame,
+            self.pic_dedup,
+            self.pic_dedup.get() if self.pic_dedup else DedupModes.OFF,
+            DedupModes.OFF,
+            DedupModes.LINK,
+            DedupModes.SKIP,
+        ).grid(padx=10, row=rc_dup, column=1, sticky=tk.W)
+        nb.Checkbutton(
+            frame,
+            text="embed metadata",
+            variable=self.pic_metadata,
+            onvalue=1,
+            offvalue=0,
+        ).grid(padx=10, row=rc_dup, column=2, sticky=tk.W)
+
+        # thumbnails
+        nb.Label(frame, text="Thumbnail sizes [px]:").grid(
+            padx=10, row=rc_thumb, column=0, sticky=tk.W
+        )
+        nb.EntryMenu(frame, textvariable=self.pic_thumbs).grid(
+            padx=10, row=rc_thumb, column=1, sticky=tk.EW
+        )
+        nb.Label(frame, text="e.g. 256,1024,2048").grid(
+            padx=10, row=rc_thumb, column=2, sticky=tk.W
+        )
+
+        # backlog
+        nb.Button(frame, text="Convert backlog", command=self.button_backlog).grid(
+            padx=10, row=rc_work, column=2, sticky=tk.E
+        )
 
         # status
         self._set_data(key=EDPCKeys.PIC_STATUS, value=nb.Label(frame, text=""))
@@ -379,3 +591,10 @@ class ConfigDialog(BLogClient):
             else:
                 (self.pic_status)["text"] = ""
         self.logger.info = out
+
+    def button_backlog(self) -> None:
+        """Run Button callback."""
+        self.logger.info = "Backlog button pressed"
+        if self.backlog_command is not None:
+            self.backlog_command()
+            self.pic_status["text"] = "Backlog conversion started"
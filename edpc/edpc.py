@@ -9,23 +9,43 @@
 
 
 from edpc.jsktoolbox.edmctool.base import BLogClient, BLogProcessor
-from edpc.jsktoolbox.edmctool.logs import LogClient, LogProcessor
-from edpc.converter import PicConverter
+from edpc.jsktoolbox.edmctool.logs import Log, LogClient, LogProcessor
+from edpc.backlog import Backlog
+from edpc.converter import ConvertJob, PicConverter
+from edpc.dedup import DedupIndex
 from edpc.dialogs import ConfigDialog
+from edpc.jobstore import JobStore
+from edpc.scheduler import DeferredScheduler, ThreadPriority
 
 
 from edpc.jsktoolbox.datetool import Timestamp
 from edpc.keys import EDPCKeys
 
-import time
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from queue import Queue, SimpleQueue, Empty
 from threading import Thread
-from typing import List, Union
+from typing import Any, Dict, List, Optional, Union
 
 
 class EDPC(BLogProcessor, BLogClient):
     """EDPC main class."""
 
+    # default number of the conversion threads
+    POOL_SIZE: int = min(4, os.cpu_count() or 1)
+    # idle animation period in seconds
+    IDLE_PERIOD: float = 1.0
+    # backlog jobs in flight per conversion thread
+    BACKLOG_WINDOW: int = 2
+    # backlog checkpoint filename
+    BACKLOG_FILE: str = "backlog.json"
+    # persistent job store filename
+    JOBS_FILE: str = "jobs.db"
+    # duplicates index filename
+    DEDUP_FILE: str = "dedup.db"
+    # maximum number of log messages written in one batch
+    LOG_BATCH: int = 500
+
     def __init__(self) -> None:
         """Initialize main class."""
         self.shutting_down = False
@@ -35,7 +55,7 @@ class EDPC(BLogProcessor, BLogClient):
 
         # logging subsystem
         self.qlog = SimpleQueue()
-        self.log_processor = LogProcessor(self.plugin_name)
+        self.log_processor = LogProcessor(self.plugin_name, self.qlog)
         self.logger = LogClient(self.qlog)
 
         # logging thread
@@ -48,6 +68,7 @@ class EDPC(BLogProcessor, BLogClient):
         self.config_dialog = ConfigDialog(self.qlog)
         self.config_dialog.plugin_name = self.plugin_name
         self.config_dialog.version = version
+        self.config_dialog.backlog_command = self.backlog_start
 
         # worker thread
         self.th_worker_engine = Thread(
@@ -62,6 +83,14 @@ class EDPC(BLogProcessor, BLogClient):
             set_default_type=Union[Queue, SimpleQueue],
         )
         self.engine = PicConverter(self.qlog)
+        self._set_data(
+            key=EDPCKeys.SCHEDULER,
+            value=DeferredScheduler(),
+            set_default_type=DeferredScheduler,
+        )
+
+        # conversion pool
+        self.pool_size = self.POOL_SIZE
 
     @property
     def engine(self) -> PicConverter:
@@ -98,6 +127,133 @@ class EDPC(BLogProcessor, BLogClient):
             set_default_type=Thread,
         )
 
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        """Give me the conversion pool.
+
+        Pillow releases the GIL while decoding and encoding images,
+        so a pool of threads is enough to use all the cores.
+        """
+        return self._get_data(key=EDPCKeys.POOL)  # type: ignore
+
+    @property
+    def pool_size(self) -> int:
+        """Give me the number of the conversion threads."""
+        return self._get_data(key=EDPCKeys.POOL_SIZE, default_value=1)  # type: ignore
+
+    @pool_size.setter
+    def pool_size(self, value: int) -> None:
+        """Set the number of the conversion threads and rebuild the pool."""
+        if value < 1:
+            value = 1
+        if self.pool is not None and self.pool_size == value:
+            return
+        self._set_data(key=EDPCKeys.POOL_SIZE, value=value, set_default_type=int)
+        self.__build_pool()
+
+    @property
+    def low_priority(self) -> bool:
+        """Give me the flag of the conversion threads running at low priority."""
+        return self._get_data(
+            key=EDPCKeys.LOW_PRIORITY, default_value=False
+        )  # type: ignore
+
+    @low_priority.setter
+    def low_priority(self, value: bool) -> None:
+        """Set the priority flag and rebuild the pool."""
+        value = bool(value)
+        if self.low_priority == value:
+            return
+        self._set_data(key=EDPCKeys.LOW_PRIORITY, value=value, set_default_type=bool)
+        self.__build_pool()
+
+    def __build_pool(self) -> None:
+        """Create new conversion pool, the old one finishes its jobs."""
+        old_pool: ThreadPoolExecutor = self.pool
+        self._set_data(
+            key=EDPCKeys.POOL,
+            value=ThreadPoolExecutor(
+                max_workers=self.pool_size,
+                thread_name_prefix=f"{self.plugin_name} converter",
+                initializer=self._th_init,
+                initargs=(self.low_priority,),
+            ),
+            set_default_type=ThreadPoolExecutor,
+        )
+        if old_pool is not None:
+            # jobs already dispatched to the old pool will be finished
+            old_pool.shutdown(wait=False)
+
+    def _th_init(self, low_priority: bool) -> None:
+        """Def th_init - conversion thread initializer."""
+        if low_priority and not ThreadPriority.lower():
+            self.logger.warning = "Cannot lower priority of the conversion thread"
+
+    @property
+    def scheduler(self) -> DeferredScheduler:
+        """Give me the scheduler of the deferred conversions."""
+        return self._get_data(key=EDPCKeys.SCHEDULER)  # type: ignore
+
+    @property
+    def defer_delay(self) -> float:
+        """Give me the idle period before the deferred conversion, 0 - disabled."""
+        return self.scheduler.delay
+
+    @defer_delay.setter
+    def defer_delay(self, value: float) -> None:
+        self.scheduler.delay = value
+
+    @property
+    def deferred_jobs(self) -> List[Dict[str, Any]]:
+        """Give me the list of deferred conversions waiting for idle time.
+
+        Every element is a dict with the screenshot event under 'item' key
+        and the number of seconds left to its due time under 'due' key.
+        """
+        return self.scheduler.pending
+
+    @property
+    def plugin_dir(self) -> str:
+        """Give me the plugin directory."""
+        return self._get_data(key=EDPCKeys.PLUGIN_DIR, default_value="")  # type: ignore
+
+    @plugin_dir.setter
+    def plugin_dir(self, value: str) -> None:
+        self._set_data(key=EDPCKeys.PLUGIN_DIR, value=value, set_default_type=str)
+
+    @property
+    def journal_dir(self) -> Optional[str]:
+        """Give me the game journal directory."""
+        return self._get_data(key=EDPCKeys.JOURNAL_DIR, default_value=None)
+
+    @journal_dir.setter
+    def journal_dir(self, value: Optional[str]) -> None:
+        self._set_data(
+            key=EDPCKeys.JOURNAL_DIR, value=value, set_default_type=Optional[str]
+        )
+
+    @property
+    def backlog(self) -> Optional[Backlog]:
+        """Give me the running backlog batch."""
+        return self._get_data(key=EDPCKeys.BACKLOG, default_value=None)
+
+    @backlog.setter
+    def backlog(self, value: Optional[Backlog]) -> None:
+        self._set_data(
+            key=EDPCKeys.BACKLOG, value=value, set_default_type=Optional[Backlog]
+        )
+
+    @property
+    def job_store(self) -> Optional[JobStore]:
+        """Give me the persistent job store."""
+        return self._get_data(key=EDPCKeys.JOB_STORE, default_value=None)
+
+    @job_store.setter
+    def job_store(self, value: Optional[JobStore]) -> None:
+        self._set_data(
+            key=EDPCKeys.JOB_STORE, value=value, set_default_type=Optional[JobStore]
+        )
+
     @property
     def plugin_name(self) -> str:
         """Give me access to pluginname variable."""
@@ -122,13 +278,23 @@ class EDPC(BLogProcessor, BLogClient):
         """Def th_logger - thread logs processor."""
         self.logger.info = "Starting logger worker"
         while not self.shutting_down:
-            log = self.qlog.get(block=True)
-            if log is None:
+            # wait for the first message and drain everything queued after it
+            batch: List[Optional[Log]] = [self.qlog.get(block=True)]
+            try:
+                while len(batch) < self.LOG_BATCH:
+                    batch.append(self.qlog.get_nowait())
+            except Empty:
+                pass
+            self.log_processor.send_batch([log for log in batch if log is not None])
+            if None in batch:
                 break
-            self.log_processor.send(log)
 
     def _th_worker(self) -> None:
-        """Def th_worker - thread processor."""
+        """Def th_worker - thread processor.
+
+        The thread blocks on the queue and wakes up as soon as a new item
+        arrives, the timeout is used only to drive the idle animation.
+        """
         self.logger.info = "Starting worker..."
         idle: List[str] = [".", "..", "...", "...."]
         idle_idx = 0
@@ -136,75 +302,280 @@ class EDPC(BLogProcessor, BLogClient):
         timestamp = Timestamp.now()  # type: ignore
 
         while not self.shutting_down:
-            idle_idx += 1
-            if idle_idx >= len(idle):
-                idle_idx = 0
-
-            # processing queue
-            timestamp: int = self.queue_processor(timestamp)
+            # start the deferred conversions, which are due
+            self.__deferred_feed()
+            timeout: Optional[float] = (
+                self.IDLE_PERIOD if self.config_dialog.status is not None else None
+            )
+            wait: Optional[float] = self.scheduler.wait()
+            if wait is not None:
+                timeout = wait if timeout is None else min(timeout, wait)
             try:
-                if (
-                    timestamp < Timestamp.now()
-                    and self.config_dialog.status is not None
-                ):
-                    self.config_dialog.status["text"] = idle[idle_idx]
-            except:
-                pass
+                item = self.qth.get(block=True, timeout=timeout)
+            except Empty:
+                idle_idx += 1
+                if idle_idx >= len(idle):
+                    idle_idx = 0
+                try:
+                    if (
+                        timestamp < Timestamp.now()
+                        and self.config_dialog.status is not None
+                    ):
+                        self.config_dialog.status["text"] = idle[idle_idx]
+                except:
+                    pass
+                continue
 
-            if self.shutting_down:
+            if item is None:
                 break
 
-            time.sleep(1)
+            # processing queue item
+            timestamp = self.queue_processor(item, timestamp)
 
+        # drop the jobs not started yet and wait for the running ones
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        if self.backlog is not None:
+            self.backlog.cancel()
+        # collect the results of the last jobs, the events left in the queue
+        # stay in the job store and will be converted on the next start
+        while True:
+            try:
+                item = self.qth.get(block=False)
+            except Empty:
+                break
+            if isinstance(item, ConvertJob):
+                self.queue_processor(item, timestamp)
+            elif isinstance(item, dict):
+                self.__store_job(item)
+        if self.job_store is not None:
+            self.job_store.close()
+        if self.engine.dedup_index is not None:
+            self.engine.dedup_index.close()
         self.logger.info = "Worker finished..."
 
+    def open_job_store(self) -> None:
+        """Open the job store and replay the jobs not finished before.
+
+        Must be called before the worker thread is started.
+        """
+        try:
+            self.job_store = JobStore(
+                self.qlog, os.path.join(self.plugin_dir, self.JOBS_FILE)
+            )
+            pending: List[Dict[str, Any]] = self.job_store.pending()
+        except Exception as ex:
+            self.logger.error = f"Cannot open job store: {ex}"
+            self.job_store = None
+            return
+        if pending:
+            self.logger.info = f"Replaying {len(pending)} unfinished job(s)..."
+        for item in pending:
+            self.qth.put(item)
+
+    def open_dedup_index(self) -> None:
+        """Open the index of the saved screenshots for duplicates detection."""
+        try:
+            self.engine.dedup_index = DedupIndex(
+                os.path.join(self.plugin_dir, self.DEDUP_FILE)
+            )
+        except Exception as ex:
+            self.logger.error = f"Cannot open duplicates index: {ex}"
+
+    def backlog_start(self) -> None:
+        """Start conversion of the screenshots left in the source directory.
+
+        The directory and journals are scanned in a separate thread,
+        the ready batch is then passed to the worker through the queue.
+        """
+        if self.backlog is not None and self.backlog.active:
+            self.logger.warning = "Backlog conversion is already running"
+            return
+        self.logger.info = "Starting backlog conversion..."
+        backlog = Backlog(
+            self.qlog,
+            self.engine.src_dir.dir,
+            self.journal_dir,
+            os.path.join(self.plugin_dir, self.BACKLOG_FILE),
+        )
+        self.backlog = backlog
+        Thread(
+            target=self._th_backlog,
+            args=(backlog,),
+            name=f"{self.plugin_name} backlog scanner",
+            daemon=True,
+        ).start()
+
+    def _th_backlog(self, backlog: Backlog) -> None:
+        """Def th_backlog - scan the backlog and pass it to the worker."""
+        try:
+            backlog.scan()
+        except Exception as ex:
+            self.logger.error = f"Backlog scan exception: {ex}"
+            backlog.cancel()
+            return
+        self.qth.put(backlog)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the worker thread and wait for it to finish."""
+        self.shutting_down = True
+        self.qth.put(None)
+        if self.th_worker_engine.is_alive():
+            self.th_worker_engine.join(timeout)
+
     @property
     def qth(self) -> Union[Queue, SimpleQueue]:
         """Give me th queue."""
         return self._get_data(key=EDPCKeys.TH_QUEUE)  # type: ignore
 
-    def queue_processor(self, timestamp: int) -> int:
-        """Convert queue items."""
+    def queue_processor(self, item: Any, timestamp: int) -> int:
+        """Dispatch queue item to the conversion pool or collect the result.
+
+        The queue carries screenshot events, which are sent to the pool,
+        and finished ConvertJob objects put back by the pool threads,
+        so the status messages are reported in completion order.
+        """
         time_break: int = 20
-        test: bool = False
 
-        # processing queue
-        while not self.qth.empty() and not self.shutting_down:
-            test = True
-            self.logger.info = "Start processing the queue..."
-            timestamp = Timestamp.now() + time_break  # type: ignore
-            try:
-                item = self.qth.get(block=False)
-                self.logger.debug = f"queue_processor: item = {item}"
-                if item is None:
-                    break
-                if self.engine.convert(item):
-                    # processing is done
-                    if self.engine.has_messages():
-                        for msg in self.engine.messages:
-                            self.logger.info = msg
-                            if self.config_dialog and self.config_dialog.status:
-                                self.config_dialog.status["text"] = msg
-                        self.engine.messages = None
+        timestamp = Timestamp.now() + time_break  # type: ignore
+        self.logger.debug = f"queue_processor: item = {item}"
+        try:
+            if isinstance(item, ConvertJob):
+                self.__job_report(item)
+                self.__deferred_push(item)
+                if EDPCKeys.P_BACKLOG in item.item and self.backlog is not None:
+                    self.backlog.finish(item)
+                    self.__backlog_feed()
+            elif isinstance(item, Backlog):
+                self.__backlog_feed()
+            else:
+                self.__store_job(item)
+                if EDPCKeys.P_DEFERRED in item:
+                    # deferred conversion replayed from the job store
+                    self.scheduler.push(item)
                 else:
-                    # processing error
-                    self.logger.error = "Image processing error"
-                    if self.config_dialog and self.config_dialog.status:
-                        self.config_dialog.status["text"] = "Image processing error"
-                del item
-            except Empty:
-                continue
-            except Exception as ex:
-                self.logger.debug = f"Worker exception: {ex}"
-                if self.config_dialog and self.config_dialog.status:
-                    self.config_dialog.status["text"] = "ERROR: check logs"
-                continue
-            self.logger.info = "Done."
-        if test:
-            self.logger.debug = (
-                f"queue_processor: queue empty, shut down time: {self.shutting_down}"
-            )
+                    self.logger.info = "Dispatching the conversion job..."
+                    job = ConvertJob(item)
+                    if self.scheduler.enabled and self.engine.convert_type:
+                        # copy or move now, convert when the game is idle
+                        job.convert = False
+                    self.__submit(job)
+        except Exception as ex:
+            self.logger.debug = f"Worker exception: {ex}"
+            if self.config_dialog and self.config_dialog.status:
+                self.config_dialog.status["text"] = "ERROR: check logs"
         return timestamp
 
+    def queue_job(self, item: Dict[str, Any]) -> None:
+        """Save the screenshot event in the job store and queue it.
+
+        The event is stored before it is queued, so it is not lost
+        if EDMC is killed before the worker picks it up.
+        """
+        self.__store_job(item)
+        self.qth.put(item)
+
+    def __submit(self, job: ConvertJob) -> None:
+        """Send the job to the conversion pool.
+
+        The job is removed from the job store, when its task completes.
+        The task cancelled on shutdown stays in the store.
+        """
+        future: Future = self.pool.submit(self._th_convert, job)
+        future.add_done_callback(
+            lambda task: None if task.cancelled() else self.__store_done(job)
+        )
+
+    def _th_convert(self, job: ConvertJob) -> None:
+        """Def th_convert - conversion pool task.
+
+        Runs the conversion and puts the finished job back into the queue.
+        """
+        try:
+            self.engine.process(job)
+        except Exception as ex:
+            self.logger.error = f"Conversion exception: {ex}"
+            job.done = False
+        self.qth.put(job)
+
+    def __store_job(self, item: Dict[str, Any]) -> None:
+        """Save the screenshot event in the job store."""
+        if self.job_store is None or EDPCKeys.P_JOB_ID in item:
+            return
+        try:
+            self.job_store.add(item)
+        except Exception as ex:
+            self.logger.error = f"Job store exception: {ex}"
+
+    def __store_done(self, job: ConvertJob) -> None:
+        """Remove the finished job from the job store."""
+        if self.job_store is None:
+            return
+        try:
+            self.job_store.done(job.item)
+        except Exception as ex:
+            self.logger.error = f"Job store exception: {ex}"
+
+    def __deferred_push(self, job: ConvertJob) -> None:
+        """Defer conversion of the screenshot copied by the finished job."""
+        if job.convert is not False or not job.done or job.dst is None:
+            return
+        item: Dict[str, Any] = {
+            key: value
+            for key, value in job.item.items()
+            if key not in (EDPCKeys.P_JOB_ID, EDPCKeys.P_BACKLOG)
+        }
+        item[EDPCKeys.P_FILENAME] = job.dst
+        item[EDPCKeys.P_DEFERRED] = True
+        self.__store_job(item)
+        self.scheduler.push(item)
+        self.logger.debug = f"Conversion deferred: {job.dst}"
+
+    def __deferred_feed(self) -> None:
+        """Send the deferred conversions, which are due, to the pool."""
+        for item in self.scheduler.due():
+            self.logger.info = "Dispatching the deferred conversion job..."
+            job = ConvertJob(item)
+            # the copied screenshot is converted and removed
+            job.convert = True
+            job.remove = True
+            try:
+                self.__submit(job)
+            except RuntimeError as ex:
+                self.logger.error = f"Deferred conversion not started: {ex}"
+
+    def __backlog_feed(self) -> None:
+        """Hand out the next portion of the backlog to the conversion pool.
+
+        Only a few backlog jobs are in flight at once, so the new
+        screenshot events are not stuck behind the whole batch.
+        """
+        backlog: Optional[Backlog] = self.backlog
+        if backlog is None:
+            return
+        window: int = self.pool_size * self.BACKLOG_WINDOW
+        for item in backlog.take(window - backlog.running):
+            self.__submit(ConvertJob(item))
+        if self.config_dialog and self.config_dialog.status:
+            self.config_dialog.status["text"] = backlog.progress
+        if not backlog.active:
+            self.logger.info = f"{backlog.progress}, done."
+
+    def __job_report(self, job: ConvertJob) -> None:
+        """Report the result of finished conversion job."""
+        if job.done:
+            # processing is done
+            if job.has_messages():
+                for msg in job.messages:
+                    self.logger.info = msg
+                    if self.config_dialog and self.config_dialog.status:
+                        self.config_dialog.status["text"] = msg
+                job.messages = None
+        else:
+            # processing error
+            self.logger.error = "Image processing error"
+            if self.config_dialog and self.config_dialog.status:
+                self.config_dialog.status["text"] = "Image processing error"
+        self.logger.info = "Done."
+
 
 # #[EOF]#######################################################################
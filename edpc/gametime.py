@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+  gametime.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 18:10:32
+
+  Purpose: Fast conversion of journal timestamps to game time strings.
+"""
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable
+
+from edpc.jsktoolbox.basetool.classes import BClasses
+
+
+class GameTime(BClasses):
+    """GameTime class.
+
+    Converts journal timestamps (2023-01-01T03:01:43Z) to game time
+    strings (33090101-010143). The fixed journal format is parsed with
+    slicing, the results of the last conversions are cached.
+    """
+
+    # journal timestamp format
+    LOG_TIME: str = "%Y-%m-%dT%H:%M:%SZ"
+    # default game time format
+    PIC_TIME: str = "%Y%m%d-%H%M%S"
+
+    __delta: timedelta = None  # type: ignore
+    __format: str = None  # type: ignore
+    __cached: Callable[[str], str] = None  # type: ignore
+
+    def __init__(
+        self, delta: timedelta, pic_time: str = PIC_TIME, cache_size: int = 256
+    ) -> None:
+        """Initialize GameTime class.
+
+        delta: offset between the journal time and the game time,
+        pic_time: strftime format of the output string,
+        cache_size: number of the cached conversions.
+        """
+        self.__delta = delta
+        self.__format = pic_time
+        self.__cached = lru_cache(maxsize=cache_size)(self.__convert)
+
+    def convert(self, stamp: str) -> str:
+        """Give me the game time string for the journal timestamp.
+
+        Raises ValueError for malformed timestamps.
+        """
+        return self.__cached(stamp)
+
+    @classmethod
+    def parse(cls, stamp: str) -> datetime:
+        """Give me the datetime of the journal timestamp."""
+        if (
+            len(stamp) == 20
+            and stamp[4] == "-"
+            and stamp[7] == "-"
+            and stamp[10] == "T"
+            and stamp[13] == ":"
+            and stamp[16] == ":"
+            and stamp[19] == "Z"
+        ):
+            return datetime(
+                int(stamp[0:4]),
+                int(stamp[5:7]),
+                int(stamp[8:10]),
+                int(stamp[11:13]),
+                int(stamp[14:16]),
+                int(stamp[17:19]),
+            )
+        # not the canonical form, let strptime decide or raise ValueError
+        return datetime.strptime(stamp, cls.LOG_TIME)
+
+    def __convert(self, stamp: str) -> str:
+        """Convert the timestamp, not cached."""
+        dt_obj: datetime = self.parse(stamp) + self.__delta
+        if self.__format == self.PIC_TIME:
+            return (
+                f"{dt_obj.year:04d}{dt_obj.month:02d}{dt_obj.day:02d}-"
+                f"{dt_obj.hour:02d}{dt_obj.minute:02d}{dt_obj.second:02d}"
+            )
+        return dt_obj.strftime(self.__format)
+
+
+# #[EOF]#######################################################################
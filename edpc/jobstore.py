@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+  jobstore.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 15:21:48
+
+  Purpose: Persistent store of the conversion jobs.
+"""
+
+import json
+import sqlite3
+import time
+from inspect import currentframe
+from queue import Queue, SimpleQueue
+from threading import Lock
+from typing import Any, Dict, List, Optional, Union
+
+from edpc.jsktoolbox.raisetool import Raise
+from edpc.jsktoolbox.edmctool.base import BLogClient
+from edpc.jsktoolbox.edmctool.logs import LogClient
+from edpc.keys import EDPCKeys
+
+
+class JobStore(BLogClient):
+    """JobStore class.
+
+    SQLite journal of the screenshot events, which are not converted yet.
+    The events are stored when queued and removed when finished,
+    so the jobs interrupted by EDMC shutdown can be replayed on start.
+    The job id is carried in the event under the P_JOB_ID key.
+    """
+
+    __db: Optional[sqlite3.Connection] = None
+    __lock: Lock = None  # type: ignore
+
+    def __init__(self, queue: Union[Queue, SimpleQueue], path: str) -> None:
+        """Initialize JobStore class.
+
+        path: database file.
+        """
+        if not isinstance(queue, (Queue, SimpleQueue)):
+            raise Raise.error(
+                f"Queue or SimpleQueue type expected, '{type(queue)}' received.",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        self.logger = LogClient(queue)
+        # the store is used by the main, worker and conversion pool threads
+        self.__lock = Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("PRAGMA synchronous=NORMAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "created REAL NOT NULL, "
+            "item TEXT NOT NULL)"
+        )
+        self.__db.commit()
+
+    def add(self, item: Dict[str, Any]) -> int:
+        """Store the event and set its job id."""
+        with self.__lock:
+            if self.__db is None:
+                return 0
+            cursor: sqlite3.Cursor = self.__db.execute(
+                "INSERT INTO jobs (created, item) VALUES (?, ?)",
+                (time.time(), json.dumps(item)),
+            )
+            self.__db.commit()
+        item[EDPCKeys.P_JOB_ID] = cursor.lastrowid
+        return item[EDPCKeys.P_JOB_ID]
+
+    def done(self, item: Dict[str, Any]) -> None:
+        """Remove the finished event from the store."""
+        with self.__lock:
+            if self.__db is None or EDPCKeys.P_JOB_ID not in item:
+                return
+            self.__db.execute(
+                "DELETE FROM jobs WHERE id = ?", (item[EDPCKeys.P_JOB_ID],)
+            )
+            self.__db.commit()
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Give me the stored events in the order of arrival."""
+        out: List[Dict[str, Any]] = []
+        with self.__lock:
+            if self.__db is None:
+                return out
+            for job_id, data in self.__db.execute(
+                "SELECT id, item FROM jobs ORDER BY id"
+            ).fetchall():
+                try:
+                    item: Dict[str, Any] = json.loads(data)
+                except ValueError:
+                    self.logger.warning = (
+                        f"Corrupted job {job_id} removed from the store"
+                    )
+                    self.__db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+                    continue
+                item[EDPCKeys.P_JOB_ID] = job_id
+                out.append(item)
+            self.__db.commit()
+        return out
+
+    def close(self) -> None:
+        """Close the store."""
+        with self.__lock:
+            if self.__db is not None:
+                self.__db.close()
+                self.__db = None
+
+
+# #[EOF]#######################################################################
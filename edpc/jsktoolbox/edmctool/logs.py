@@ -10,9 +10,13 @@ Purpose: EDMC plugins individual logging subsystem classes.
 from inspect import currentframe
 import logging
 import os
-from typing import Union, Optional, List, Dict
-from logging.handlers import RotatingFileHandler
+import time
+from collections import deque
+from threading import Lock, Thread
+from _thread import LockType
+from typing import Any, Callable, Deque, Union, Optional, List, Dict, TextIO
 from queue import Queue, SimpleQueue
+from weakref import WeakKeyDictionary
 
 from ..edmctool.system import EnvLocal
 
@@ -25,9 +29,13 @@ class _Keys(object, metaclass=ReadOnlyClass):
     """Internal Keys container class."""
 
     LOG_DATA: str = "__logger_data__"
+    LOG_GATE: str = "__logger_gate__"
     LOG_LEVEL: str = "__logger_level__"
     LOG_QUEUE: str = "__logger_queue__"
+    LP_DISPATCH: str = "__log_processor_dispatch__"
     LP_ENGINE: str = "__log_processor_engine__"
+    LP_HANDLER: str = "__log_processor_handler__"
+    LP_LIMITS: str = "__log_processor_limits__"
     LP_NAME: str = "__log_processor_name__"
 
 
@@ -83,13 +91,229 @@ class Log(BData):
             self.log.append(f"{arg}")
 
 
+class _RotatingBufferHandler(logging.Handler):
+    """Buffered size and time rotating file handler.
+
+    Records are collected in a buffer and written with one call when the
+    buffer is full or the batch ends. The last records are kept in a ring
+    buffer in memory. Rotation only renames the current file to '.0' and
+    opens a new one, the backup files are shifted by a background thread.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int,
+        backup_count: int,
+        interval: float,
+        buffer_size: int,
+        ring_size: int,
+    ) -> None:
+        """Create handler.
+
+        filename: log file path,
+        max_bytes: file size limit, 0 - no limit,
+        backup_count: number of the backup files,
+        interval: file age limit in seconds since opening, 0 - no limit,
+        buffer_size: buffered bytes written at once,
+        ring_size: number of the last records kept in memory.
+        """
+        super().__init__()
+        self.__filename: str = filename
+        self.__max_bytes: int = max_bytes
+        self.__backup_count: int = backup_count
+        self.__interval: float = interval
+        self.__buffer_size: int = buffer_size
+        self.__buffer: List[str] = []
+        self.__buffered: int = 0
+        self.__hold: bool = False
+        self.__ring: Deque[str] = deque(maxlen=ring_size)
+        self.__shift_lock: LockType = Lock()
+        self.__shift_th: Optional[Thread] = None
+        self.__stream: Optional[TextIO] = None
+        self.__size: int = 0
+        self.__opened: float = 0.0
+        self.__open()
+
+    @property
+    def recent(self) -> List[str]:
+        """Give me the last formatted records."""
+        with self.lock:  # type: ignore
+            return list(self.__ring)
+
+    def __open(self) -> None:
+        """Open log file for appending."""
+        self.__stream = open(self.__filename, "a", encoding="utf-8")
+        self.__size = self.__stream.tell()
+        self.__opened = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Buffer the record."""
+        try:
+            msg: str = self.format(record)
+            self.__ring.append(msg)
+            self.__buffer.append(msg + "\n")
+            self.__buffered += len(msg) + 1
+            if not self.__hold or self.__buffered >= self.__buffer_size:
+                self.__write()
+        except Exception:
+            self.handleError(record)
+
+    def begin_batch(self) -> None:
+        """Postpone writing until end_batch or full buffer."""
+        self.__hold = True
+
+    def end_batch(self) -> None:
+        """Write the records buffered since begin_batch."""
+        self.__hold = False
+        self.flush()
+
+    def flush(self) -> None:
+        """Write the buffer to the file."""
+        with self.lock:  # type: ignore
+            self.__write()
+
+    def __write(self) -> None:
+        """Write the buffer and rotate the file if needed."""
+        if not self.__buffer or self.__stream is None:
+            return
+        data: str = "".join(self.__buffer)
+        self.__buffer.clear()
+        self.__buffered = 0
+        self.__stream.write(data)
+        self.__stream.flush()
+        self.__size += len(data)
+        if (self.__max_bytes and self.__size >= self.__max_bytes) or (
+            self.__interval and time.monotonic() - self.__opened >= self.__interval
+        ):
+            self.__rotate()
+
+    def __rotate(self) -> None:
+        """Start a new file, the backups are shifted in the background."""
+        # previous shift still running, try again after next write
+        if not self.__shift_lock.acquire(blocking=False):
+            return
+        self.__stream.close()  # type: ignore
+        try:
+            os.replace(self.__filename, f"{self.__filename}.0")
+        except OSError:
+            self.__shift_lock.release()
+            self.__open()
+            return
+        self.__open()
+        self.__shift_th = Thread(target=self.__shift, name="log rotate", daemon=True)
+        self.__shift_th.start()
+
+    def __shift(self) -> None:
+        """Shift backup files: .0 -> .1 -> .2 ..."""
+        try:
+            base: str = self.__filename
+            if self.__backup_count < 1:
+                os.remove(f"{base}.0")
+                return
+            for idx in range(self.__backup_count - 1, -1, -1):
+                if os.path.exists(f"{base}.{idx}"):
+                    os.replace(f"{base}.{idx}", f"{base}.{idx + 1}")
+        except OSError:
+            pass
+        finally:
+            self.__shift_lock.release()
+
+    def close(self) -> None:
+        """Write the buffer and close the file."""
+        with self.lock:  # type: ignore
+            self.__write()
+            if self.__stream is not None:
+                self.__stream.close()
+                self.__stream = None
+        if self.__shift_th is not None:
+            self.__shift_th.join()
+        super().close()
+
+
+class LogGate(NoDynamicAttributes):
+    """Effective log level shared by LogProcessor and LogClients.
+
+    There is one gate for every logging queue. LogProcessor bound to the
+    queue publishes its level, LogClients writing to the same queue drop
+    messages of disabled levels before they are formatted and queued.
+    """
+
+    __gates: "WeakKeyDictionary[Any, LogGate]" = WeakKeyDictionary()
+    __lock = Lock()
+    __level: int = logging.NOTSET
+
+    @classmethod
+    def get(cls, queue: Union[Queue, SimpleQueue]) -> "LogGate":
+        """Give me the gate of the queue."""
+        with cls.__lock:
+            gate: Optional[LogGate] = cls.__gates.get(queue)
+            if gate is None:
+                gate = cls()
+                cls.__gates[queue] = gate
+            return gate
+
+    @property
+    def level(self) -> int:
+        """Give me the lowest enabled level, NOTSET - all enabled."""
+        return self.__level
+
+    @level.setter
+    def level(self, arg: int) -> None:
+        self.__level = arg
+
+    def is_enabled(self, level: int) -> bool:
+        """Check, if messages of the level are passed."""
+        return level >= self.__level
+
+
 class LogProcessor(BData):
     """Log processor access API."""
 
-    def __init__(self, name: str) -> None:
-        """Create instance class object for processing single message."""
+    # default log file limits
+    MAX_BYTES: int = 1024 * 1024
+    BACKUP_COUNT: int = 5
+    INTERVAL: float = 24 * 3600.0
+    BUFFER_SIZE: int = 64 * 1024
+    RING_SIZE: int = 500
+
+    def __init__(
+        self,
+        name: str,
+        queue: Optional[Union[Queue, SimpleQueue]] = None,
+        max_bytes: int = MAX_BYTES,
+        backup_count: int = BACKUP_COUNT,
+        interval: float = INTERVAL,
+        ring_size: int = RING_SIZE,
+    ) -> None:
+        """Create instance class object for processing single message.
+
+        name: name of app and log file,
+        queue: optional logging queue, its LogClients get the loglevel
+        of the processor and skip disabled messages,
+        max_bytes: log file size limit, 0 - no limit,
+        backup_count: number of the backup log files,
+        interval: log file age limit in seconds, 0 - no limit,
+        ring_size: number of the last records kept in memory.
+        """
         # name of app
         self._set_data(key=_Keys.LP_NAME, value=name, set_default_type=str)
+        self._set_data(
+            key=_Keys.LP_LIMITS,
+            value={
+                "max_bytes": max_bytes,
+                "backup_count": backup_count,
+                "interval": interval,
+                "buffer_size": self.BUFFER_SIZE,
+                "ring_size": ring_size,
+            },
+            set_default_type=Dict,
+        )
+        self._set_data(
+            key=_Keys.LOG_GATE,
+            value=LogGate.get(queue) if queue is not None else None,
+            set_default_type=Optional[LogGate],
+        )
         self.loglevel = LogLevels().notset
         self.__logger_init()
 
@@ -114,57 +338,85 @@ class LogProcessor(BData):
         self.__engine = logging.getLogger(self._get_data(key=_Keys.LP_NAME))
         self.__engine.setLevel(LogLevels().debug)
 
-        log_handler = RotatingFileHandler(
+        log_handler = _RotatingBufferHandler(
             filename=os.path.join(
                 EnvLocal().tmpdir, f"{self._get_data(key=_Keys.LP_NAME)}.log"
             ),
-            maxBytes=100000,
-            backupCount=5,
+            **self._get_data(key=_Keys.LP_LIMITS),  # type: ignore
         )
 
         log_handler.setLevel(self.loglevel)
         log_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
         self.__engine.addHandler(log_handler)
+        self._set_data(
+            key=_Keys.LP_HANDLER,
+            value=log_handler,
+            set_default_type=Optional[_RotatingBufferHandler],
+        )
+        # level to logger method lookup, built once for all messages
+        self._set_data(
+            key=_Keys.LP_DISPATCH,
+            value={
+                logging.CRITICAL: self.__engine.critical,
+                logging.DEBUG: self.__engine.debug,
+                logging.ERROR: self.__engine.error,
+                logging.INFO: self.__engine.info,
+                logging.WARNING: self.__engine.warning,
+            },
+            set_default_type=Dict,
+        )
         self.__engine.info("Logger initialization complete")
 
     def close(self) -> None:
         """Close log subsystem."""
         if self.__engine is not None:
-            for handler in self.__engine.handlers:
+            for handler in list(self.__engine.handlers):
                 handler.close()
                 self.__engine.removeHandler(handler)
+        self._set_data(key=_Keys.LP_HANDLER, value=None)
+
+    @property
+    def recent(self) -> List[str]:
+        """Give me the last log records kept in memory."""
+        handler: Optional[_RotatingBufferHandler] = self._get_data(key=_Keys.LP_HANDLER)
+        return handler.recent if handler is not None else []
 
     def send(self, message: Log) -> None:
         """Send single message to log engine."""
+        self.send_batch([message])
+
+    def send_batch(self, messages: List[Log]) -> None:
+        """Send messages to log engine, the file is flushed once per batch."""
         if self.__engine is None:
             return
-        lgl = LogLevels()
-        if isinstance(message, Log):
-            if message.loglevel == lgl.critical:
-                for msg in message.log:
-                    self.__engine.critical("%s", msg)
-            elif message.loglevel == lgl.debug:
-                for msg in message.log:
-                    self.__engine.debug("%s", msg)
-            elif message.loglevel == lgl.error:
-                for msg in message.log:
-                    self.__engine.error("%s", msg)
-            elif message.loglevel == lgl.info:
-                for msg in message.log:
-                    self.__engine.info("%s", msg)
-            elif message.loglevel == lgl.warning:
-                for msg in message.log:
-                    self.__engine.warning("%s", msg)
-            else:
+        dispatch: Dict[int, Callable] = self._get_data(
+            key=_Keys.LP_DISPATCH
+        )  # type: ignore
+        handlers: List[_RotatingBufferHandler] = [
+            handler
+            for handler in self.__engine.handlers
+            if isinstance(handler, _RotatingBufferHandler)
+        ]
+        for handler in handlers:
+            handler.begin_batch()
+        try:
+            for message in messages:
+                if not isinstance(message, Log):
+                    raise Raise.error(
+                        f"Log type expected, {type(message)} received.",
+                        TypeError,
+                        self._c_name,
+                        currentframe(),
+                    )
+                func: Optional[Callable] = dispatch.get(message.loglevel)
                 for msg in message.log:
-                    self.__engine.notset("%s", msg)  # type: ignore
-        else:
-            raise Raise.error(
-                f"Log type expected, {type(message)} received.",
-                TypeError,
-                self._c_name,
-                currentframe(),
-            )
+                    if func is not None:
+                        func("%s", msg)
+                    else:
+                        self.__engine.log(message.loglevel, "%s", msg)
+        finally:
+            for handler in handlers:
+                handler.end_batch()
 
     @property
     def loglevel(self) -> int:
@@ -192,19 +444,59 @@ class LogProcessor(BData):
             self._set_data(
                 key=_Keys.LOG_LEVEL, value=LogLevels().info, set_default_type=int
             )
-        self.__logger_init()
+        gate: Optional[LogGate] = self._get_data(key=_Keys.LOG_GATE)
+        if gate is not None:
+            gate.level = self.loglevel
+        # the level is changed in place, the log file stays open
+        handler: Optional[_RotatingBufferHandler] = self._get_data(key=_Keys.LP_HANDLER)
+        if handler is not None:
+            handler.setLevel(self.loglevel)
+        else:
+            self.__logger_init()
 
 
 class LogClient(BData):
     """Log client class API."""
 
     def __init__(self, queue: Union[Queue, SimpleQueue]) -> None:
-        """Create instance class object."""
+        """Create instance class object.
+
+        Messages can be given as str, list or callable returning them,
+        the callable is called only if the level is enabled.
+        """
         self._set_data(
             key=_Keys.LOG_QUEUE,
             value=queue,
             set_default_type=Union[Queue, SimpleQueue],
         )
+        self._set_data(
+            key=_Keys.LOG_GATE, value=LogGate.get(queue), set_default_type=LogGate
+        )
+
+    def __put(self, level: int, message: Any, args: tuple = ()) -> None:
+        """Build and queue the message if the level is enabled."""
+        if not self._get_data(key=_Keys.LOG_GATE).is_enabled(level):  # type: ignore
+            return
+        if callable(message):
+            message = message()
+        if args:
+            message = message % args
+        log = Log(level)
+        log.log = message
+        self.queue.put(log)
+
+    def is_enabled(self, level: int) -> bool:
+        """Check, if messages of the level are passed to the processor."""
+        return self._get_data(key=_Keys.LOG_GATE).is_enabled(level)  # type: ignore
+
+    def log(self, level: int, message: Union[str, Callable[[], Any]], *args) -> None:
+        """Log message with %-style args formatted only if the level is enabled.
+
+        level: [int] - logging level,
+        message: [str|callable] - message or format string,
+        args: values for the format string.
+        """
+        self.__put(level, message, args)
 
     @property
     def queue(self) -> Union[Queue, SimpleQueue]:
@@ -219,14 +511,12 @@ class LogClient(BData):
         return ""
 
     @critical.setter
-    def critical(self, message: Union[str, List]) -> None:
+    def critical(self, message: Union[str, List, Callable[[], Any]]) -> None:
         """Setter for critical messages.
 
-        message: [str|list]
+        message: [str|list|callable]
         """
-        log = Log(LogLevels().critical)
-        log.log = message
-        self.queue.put(log)
+        self.__put(logging.CRITICAL, message)
 
     @property
     def debug(self) -> str:
@@ -234,14 +524,12 @@ class LogClient(BData):
         return ""
 
     @debug.setter
-    def debug(self, message: Union[str, List]) -> None:
+    def debug(self, message: Union[str, List, Callable[[], Any]]) -> None:
         """Setter for debug messages.
 
-        message: [str|list]
+        message: [str|list|callable]
         """
-        log = Log(LogLevels().debug)
-        log.log = message
-        self.queue.put(log)
+        self.__put(logging.DEBUG, message)
 
     @property
     def error(self) -> str:
@@ -249,14 +537,12 @@ class LogClient(BData):
         return ""
 
     @error.setter
-    def error(self, message: Union[str, List]) -> None:
+    def error(self, message: Union[str, List, Callable[[], Any]]) -> None:
         """Setter for error messages.
 
-        message: [str|list]
+        message: [str|list|callable]
         """
-        log = Log(LogLevels().error)
-        log.log = message
-        self.queue.put(log)
+        self.__put(logging.ERROR, message)
 
     @property
     def info(self) -> str:
@@ -264,14 +550,12 @@ class LogClient(BData):
         return ""
 
     @info.setter
-    def info(self, message: Union[str, List]) -> None:
+    def info(self, message: Union[str, List, Callable[[], Any]]) -> None:
         """Setter for info messages.
 
-        message: [str|list]
+        message: [str|list|callable]
         """
-        log = Log(LogLevels().info)
-        log.log = message
-        self.queue.put(log)
+        self.__put(logging.INFO, message)
 
     @property
     def warning(self) -> str:
@@ -279,14 +563,12 @@ class LogClient(BData):
         return ""
 
     @warning.setter
-    def warning(self, message: Union[str, List]) -> None:
+    def warning(self, message: Union[str, List, Callable[[], Any]]) -> None:
         """Setter for warning messages.
 
-        message: [str|list]
+        message: [str|list|callable]
         """
-        log = Log(LogLevels().warning)
-        log.log = message
-        self.queue.put(log)
+        self.__put(logging.WARNING, message)
 
     @property
     def notset(self) -> str:
@@ -294,14 +576,12 @@ class LogClient(BData):
         return ""
 
     @notset.setter
-    def notset(self, message: Union[str, List]) -> None:
+    def notset(self, message: Union[str, List, Callable[[], Any]]) -> None:
         """Setter for notset level messages.
 
-        message: [str|list]
+        message: [str|list|callable]
         """
-        log = Log(LogLevels().notset)
-        log.log = message
-        self.queue.put(log)
+        self.__put(logging.NOTSET, message)
 
 
 class LogLevels(NoDynamicAttributes):
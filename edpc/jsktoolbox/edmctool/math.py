@@ -7,13 +7,17 @@ Created: 10.10.2024, 13:00:50
 Purpose:
 """
 
+import heapq
+import logging
 import math
 import time
 import random
 
+from collections import OrderedDict
 from inspect import currentframe
 from queue import Queue, SimpleQueue
-from typing import Optional, List, Tuple, Union, Any, Dict
+from threading import Lock
+from typing import Callable, Optional, List, Sequence, Set, Tuple, Union, Any, Dict
 from types import FrameType, MethodType
 from abc import ABC, abstractmethod
 from itertools import permutations
@@ -24,6 +28,7 @@ from types import FrameType
 from .ed_keys import EDKeys
 
 from ..attribtool import ReadOnlyClass
+from ..basetool.classes import BClasses
 from ..raisetool import Raise
 from .base import BLogClient
 from .logs import LogClient
@@ -34,7 +39,7 @@ from .edsm_keys import EdsmKeys
 try:
     import numpy as np
 except ModuleNotFoundError:
-    pass
+    np = None  # type: ignore
 
 try:
     from scipy.spatial import distance
@@ -50,7 +55,9 @@ class IAlg(ABC):
         """Run the work."""
 
     @abstractmethod
-    def debug(self, currentframe: Optional[FrameType], message: str) -> None:
+    def debug(
+        self, currentframe: Optional[FrameType], message: Union[str, Callable[[], str]]
+    ) -> None:
         """Debug formatter for logger."""
 
     @property
@@ -67,6 +74,7 @@ class IAlg(ABC):
 class _Keys(object, metaclass=ReadOnlyClass):
     """Internal Keys container class."""
 
+    C_METHODS: str = "__e_c_methods__"
     E_METHODS: str = "__e_methods__"
     R_DATA: str = "__e_r_data__"
 
@@ -92,6 +100,15 @@ class Euclid(BLogClient):
                 self.__core,
             ],
         )
+        self._set_data(
+            key=_Keys.C_METHODS,
+            set_default_type=List,
+            value=[
+                self.__cdist_scipy,
+                self.__cdist_numpy,
+                self.__cdist_core,
+            ],
+        )
 
         # init log subsystem
         if isinstance(queue, (Queue, SimpleQueue)):
@@ -110,7 +127,7 @@ class Euclid(BLogClient):
                 set_default_type=RscanData,
                 value=r_data,
             )
-            self.debug(currentframe(), f"{r_data}")
+            self.debug(currentframe(), lambda: f"{r_data}")
         else:
             raise Raise.error(
                 f"RscanData type expected, '{type(r_data)}' received",
@@ -131,6 +148,11 @@ class Euclid(BLogClient):
         """Return test list."""
         return self._get_data(key=_Keys.E_METHODS)  # type: ignore
 
+    @property
+    def __cdist_methods(self) -> List[MethodType]:
+        """Return list of the batch methods."""
+        return self._get_data(key=_Keys.C_METHODS)  # type: ignore
+
     def benchmark(self) -> None:
         """Do benchmark test.
 
@@ -189,11 +211,42 @@ class Euclid(BLogClient):
             self.__euclid_methods.append(bench_out[idx])
             self.debug(currentframe(), f"{idx}: {bench_out[idx]}")
 
+        # batch methods: one-to-many and many-to-many on the arrays
+        points_1: Any = self.array(data1 * 10)
+        points_2: Any = self.array(data2)
+        test = []
+        bench_out = {}
+        for item in self.__cdist_methods:
+            if item(points_1[:1], points_2) is not None:
+                test.append(item)
+        for item in test:
+            t_start = time.perf_counter()
+            for idx in range(0, len(data1)):
+                item(points_1[idx : idx + 1], points_2)
+                item(points_1, points_2)
+            t_stop = time.perf_counter()
+            bench_out[t_stop - t_start] = item
+        self.__cdist_methods.clear()
+        for idx in sorted(bench_out.keys()):
+            self.__cdist_methods.append(bench_out[idx])
+            self.debug(currentframe(), f"{idx}: {bench_out[idx]}")
+
         if self.logger:
             self.logger.info = f"{p_name}->{c_name}: done."
 
-    def debug(self, currentframe: Optional[FrameType], message: str = "") -> None:
-        """Build debug message."""
+    def debug(
+        self,
+        currentframe: Optional[FrameType],
+        message: Union[str, Callable[[], str]] = "",
+    ) -> None:
+        """Build debug message.
+
+        message: string or callable returning it, called only if debug is enabled.
+        """
+        if not self.logger or not self.logger.is_enabled(logging.DEBUG):
+            return
+        if callable(message):
+            message = message()
         p_name: str = f"{self.__r_data.plugin_name}"
         c_name: str = f"{self._c_name}"
         m_name: str = (
@@ -201,8 +254,7 @@ class Euclid(BLogClient):
         )
         if message != "":
             message = f": {message}"
-        if self.logger:
-            self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
+        self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
 
     def __core(self, point_1: List[float], point_2: List[float]) -> float:
         """Do calculations without math libraries.
@@ -269,6 +321,37 @@ class Euclid(BLogClient):
             self.debug(currentframe(), f"{ex}")
         return None
 
+    def __cdist_core(self, points_1: Any, points_2: Any) -> Optional[Any]:
+        """Do batch calculations with math lib only."""
+        try:
+            return [[math.dist(i, j) for j in points_2] for i in points_1]
+        except Exception as ex:
+            self.debug(currentframe(), f"{ex}")
+        return None
+
+    def __cdist_numpy(self, points_1: Any, points_2: Any) -> Optional[Any]:
+        """Try to use numpy lib.
+
+        Broadcasting the difference of the arrays and the Einstein summation.
+        """
+        try:
+            tmp = (
+                np.asarray(points_1, dtype=np.float64)[:, None, :]
+                - np.asarray(points_2, dtype=np.float64)[None, :, :]
+            )
+            return np.sqrt(np.einsum("ijk,ijk->ij", tmp, tmp))
+        except Exception as ex:
+            self.debug(currentframe(), f"{ex}")
+        return None
+
+    def __cdist_scipy(self, points_1: Any, points_2: Any) -> Optional[Any]:
+        """Try to use scipy lib."""
+        try:
+            return distance.cdist(points_1, points_2)
+        except Exception as ex:
+            self.debug(currentframe(), f"{ex}")
+        return None
+
     def distance(self, point_1: List[float], point_2: List[float]) -> float:
         """Find the first working algorithm and do the calculations."""
         out: float = None  # type: ignore
@@ -283,8 +366,310 @@ class Euclid(BLogClient):
 
         return out
 
+    @staticmethod
+    def array(points: Sequence[Sequence[float]]) -> Any:
+        """Return points as (N, 3) float64 array, list of lists without numpy."""
+        if np is not None:
+            return np.asarray(points, dtype=np.float64).reshape(len(points), -1)
+        return [list(point) for point in points]
+
+    def cdist(self, points_1: Any, points_2: Any) -> Any:
+        """Return distances between each pair of the two sets of points.
+
+        points_1, points_2: (N, 3) and (M, 3) arrays or lists of points.
+        Returns (N, M) array, or list of lists if numpy is not available.
+        """
+        out: Any = None
+        i = 0
+
+        while out is None:
+            if i < len(self.__cdist_methods):
+                out = self.__cdist_methods[i](points_1, points_2)
+            else:
+                break
+            i += 1
+
+        return out
+
+    def distances(self, origin: Sequence[float], points: Any) -> Any:
+        """Return distances from the origin to each of the points.
+
+        points: (N, 3) array or list of points.
+        Returns (N,) array, or list if numpy is not available.
+        """
+        return self.cdist([origin], points)[0]
+
+
+class DistanceMatrix(BClasses):
+    """DistanceMatrix.
+
+    Pairwise distances of the set of points, built at once from
+    the contiguous array of coordinates: one NumPy broadcast operation,
+    or plain Python if NumPy is not available. The algorithms address
+    the points by index, so a route length is a gather and a sum.
+
+    The matrices are cached per point set, use get() to share them.
+    The matrix needs N*N*8 bytes, it is meant for the route sized sets
+    of points, not for the whole star fields.
+    """
+
+    # number of cached matrices
+    CACHE_SIZE: int = 8
+
+    __cache: "OrderedDict[Tuple[Tuple[float, ...], ...], DistanceMatrix]" = (
+        OrderedDict()
+    )
+    __lock = Lock()
+    __matrix: Any = None
+    __rows: List[List[float]] = None  # type: ignore
+
+    def __init__(
+        self, coords: Sequence[Sequence[float]], euclid: Optional[Euclid] = None
+    ) -> None:
+        """Create class object.
+
+        coords: points coordinates, [[x, y, z], ...].
+        euclid: Euclid - object of initialized vectors class, optional.
+        """
+        if euclid is not None:
+            arr: Any = euclid.array(coords)
+            out: Any = euclid.cdist(arr, arr)
+            if np is not None:
+                self.__matrix = np.asarray(out, dtype=np.float64)
+                self.__rows = self.__matrix.tolist()
+            else:
+                self.__rows = out
+                self.__matrix = self.__rows
+        elif np is not None:
+            arr = np.asarray(coords, dtype=np.float64).reshape(len(coords), -1)
+            diff = arr[:, None, :] - arr[None, :, :]
+            self.__matrix = np.sqrt(np.einsum("ijk,ijk->ij", diff, diff))
+            self.__rows = self.__matrix.tolist()
+        else:
+            self.__rows = [[math.dist(a, b) for b in coords] for a in coords]
+            self.__matrix = self.__rows
+
+    @classmethod
+    def get(
+        cls, points: Sequence[StarsSystem], euclid: Optional[Euclid] = None
+    ) -> "DistanceMatrix":
+        """Return cached matrix for the points, build it if needed.
+
+        euclid: if given, the matrix is built with its cdist method.
+        """
+        coords: Tuple[Tuple[float, ...], ...] = tuple(
+            tuple(point.star_pos) for point in points
+        )
+        with cls.__lock:
+            matrix: Optional[DistanceMatrix] = cls.__cache.get(coords)
+            if matrix is not None:
+                cls.__cache.move_to_end(coords)
+                return matrix
+        matrix = cls(coords, euclid)
+        with cls.__lock:
+            cls.__cache[coords] = matrix
+            while len(cls.__cache) > cls.CACHE_SIZE:
+                cls.__cache.popitem(last=False)
+        return matrix
+
+    @property
+    def size(self) -> int:
+        """Return number of points."""
+        return len(self.__rows)
+
+    @property
+    def matrix(self) -> Any:
+        """Return N x N matrix, numpy.ndarray or list of lists."""
+        return self.__matrix
+
+    def tolist(self) -> List[List[float]]:
+        """Return matrix as list of lists, fast for scalar access."""
+        return self.__rows
+
+    def distance(self, idx1: int, idx2: int) -> float:
+        """Return distance between points of the indexes."""
+        return self.__rows[idx1][idx2]
+
+    def legs(self, route: Sequence[int]) -> Any:
+        """Return distances between the consecutive points of the route."""
+        if np is not None:
+            idx = np.asarray(route, dtype=np.intp)
+            return self.__matrix[idx[:-1], idx[1:]]
+        return [self.__rows[a][b] for a, b in zip(route[:-1], route[1:])]
+
+    def route(self, route: Sequence[int], limit: Optional[float] = None) -> float:
+        """Return length of the route given as list of indexes.
+
+        limit: if given, returns inf for the route with a longer leg.
+        """
+        if len(route) < 2:
+            return 0.0
+        if np is not None:
+            legs = self.legs(route)
+            if limit is not None and legs.max() > limit:
+                return float("inf")
+            return float(legs.sum())
+        rows: List[List[float]] = self.__rows
+        total: float = 0.0
+        for idx1, idx2 in zip(route[:-1], route[1:]):
+            dist: float = rows[idx1][idx2]
+            if limit is not None and dist > limit:
+                return float("inf")
+            total += dist
+        return total
+
+    @staticmethod
+    def index(points: Sequence[StarsSystem]) -> Dict[int, int]:
+        """Return map of the points objects id to the matrix indexes."""
+        return {id(point): idx for idx, point in enumerate(points)}
+
+
+class SpatialIndex(BClasses):
+    """SpatialIndex.
+
+    Uniform voxel grid over StarsSystem.star_pos. With the cell size equal
+    to the jump range, the query for all systems within the range checks
+    only 27 neighbouring cells instead of the whole set of points.
+    Points can be inserted at any time, e.g. as the EDSM results arrive,
+    so one index may be shared by the algorithms.
+    """
+
+    __cell_size: float = 0.0
+    __cells: Dict[Tuple[int, int, int], List[int]] = None  # type: ignore
+    __coords: List[Tuple[float, float, float]] = None  # type: ignore
+    __ids: Dict[int, int] = None  # type: ignore
+    __points: List[StarsSystem] = None  # type: ignore
+
+    def __init__(
+        self, cell_size: float, points: Optional[Sequence[StarsSystem]] = None
+    ) -> None:
+        """Create class object.
+
+        cell_size: float - edge of the grid cell in ly, best the jump range.
+        points: list(StarsSystem,...) - optional initial set of points.
+        """
+        if not isinstance(cell_size, (int, float)) or cell_size <= 0:
+            raise Raise.error(
+                f"Positive cell size expected, '{cell_size}' received.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__cell_size = float(cell_size)
+        self.__cells = {}
+        self.__coords = []
+        self.__ids = {}
+        self.__points = []
+        if points:
+            self.extend(points)
+
+    @property
+    def cell_size(self) -> float:
+        """Return cell size."""
+        return self.__cell_size
+
+    @property
+    def points(self) -> List[StarsSystem]:
+        """Return indexed points in the insertion order."""
+        return self.__points
+
+    @property
+    def size(self) -> int:
+        """Return number of indexed points."""
+        return len(self.__points)
+
+    def __cell(self, pos: Sequence[float]) -> Tuple[int, int, int]:
+        """Return grid cell of the position."""
+        return (
+            math.floor(pos[0] / self.__cell_size),
+            math.floor(pos[1] / self.__cell_size),
+            math.floor(pos[2] / self.__cell_size),
+        )
+
+    def insert(self, point: StarsSystem) -> int:
+        """Add point to the index, return its insertion number.
+
+        The point already indexed is not added again.
+        """
+        idx: Optional[int] = self.__ids.get(id(point))
+        if idx is not None:
+            return idx
+        if not isinstance(point, StarsSystem):
+            raise Raise.error(
+                f"StarsSystem type expected, '{type(point)}' received.",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        pos: List = point.star_pos
+        if None in pos:
+            raise Raise.error(
+                f"Position of the system expected, '{point.name}' has none.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        idx = len(self.__points)
+        self.__ids[id(point)] = idx
+        self.__points.append(point)
+        self.__coords.append((float(pos[0]), float(pos[1]), float(pos[2])))
+        self.__cells.setdefault(self.__cell(pos), []).append(idx)
+        return idx
+
+    def extend(self, points: Sequence[StarsSystem]) -> None:
+        """Add points to the index."""
+        for point in points:
+            self.insert(point)
+
+    def position(self, idx: int) -> Tuple[float, float, float]:
+        """Return coordinates of the point with the insertion number."""
+        return self.__coords[idx]
+
+    def query(
+        self, origin: Sequence[float], radius: Optional[float] = None
+    ) -> List[Tuple[StarsSystem, float]]:
+        """Return systems within radius from origin, with their distances.
+
+        radius: float - search radius in ly, cell size by default.
+        Systems are returned in the insertion order.
+        """
+        return [
+            (self.__points[idx], dist) for idx, dist in self.query_ids(origin, radius)
+        ]
+
+    def query_ids(
+        self, origin: Sequence[float], radius: Optional[float] = None
+    ) -> List[Tuple[int, float]]:
+        """Return insertion numbers of the points within radius from origin.
+
+        radius: float - search radius in ly, cell size by default.
+        """
+        if radius is None:
+            radius = self.__cell_size
+        span: int = max(1, math.ceil(radius / self.__cell_size))
+        c_x, c_y, c_z = self.__cell(origin)
+        cells: Dict[Tuple[int, int, int], List[int]] = self.__cells
+        coords: List[Tuple[float, float, float]] = self.__coords
+        found: List[Tuple[int, float]] = []
+        # a few dozen candidates per query, math.dist in the loop is faster
+        # than a batch call with its list building and the filter pass
+        for x in range(c_x - span, c_x + span + 1):
+            for y in range(c_y - span, c_y + span + 1):
+                for z in range(c_z - span, c_z + span + 1):
+                    for idx in cells.get((x, y, z), ()):
+                        dist: float = math.dist(origin, coords[idx])
+                        if dist <= radius:
+                            found.append((idx, dist))
+        found.sort()
+        return found
+
 
 class AlgAStar(IAlg, BLogClient):
+    """A* search of the shortest jump path from start to the first system.
+
+    The nodes are the insertion numbers of the spatial index, the start
+    point is the node -1. The edges are jumps not longer than jump_range.
+    """
 
     __plugin_name: str = None  # type: ignore
     __math: Euclid = None  # type: ignore
@@ -292,6 +677,7 @@ class AlgAStar(IAlg, BLogClient):
     __jump_range: int = None  # type: ignore
     __final: List[StarsSystem] = None  # type: ignore
     __start_point: StarsSystem = None  # type: ignore
+    __index: SpatialIndex = None  # type: ignore
 
     def __init__(
         self,
@@ -301,7 +687,20 @@ class AlgAStar(IAlg, BLogClient):
         log_queue: Optional[Union[Queue, SimpleQueue]],
         euclid_alg: Euclid,
         plugin_name: str,
+        spatial_index: Optional[SpatialIndex] = None,
     ) -> None:
+        """Construct instance object.
+
+        params:
+        start: StarsSystem - object with starting position.
+        systems: list(StarsSystem,...) - list with point of interest to visit
+        jump_range: int - jump range in ly
+        log_queue: queue for LogClient
+        euclid_alg: Euclid - object of initialized vectors class
+        plugin_name: str - name of plugin for debug log
+        spatial_index: SpatialIndex - optional index shared between algorithms,
+            the systems are added to it
+        """
 
         self.__plugin_name = plugin_name
         # init log subsystem
@@ -351,78 +750,110 @@ class AlgAStar(IAlg, BLogClient):
 
         self.__start_point = start
         self.__points = systems
+        if spatial_index is None:
+            spatial_index = SpatialIndex(max(jump_range, 1))
+        spatial_index.extend(systems)
+        self.__index = spatial_index
         self.__final = []
 
-    def __get_neighbors(self, point: StarsSystem) -> List[StarsSystem]:
-        """Zwraca sąsiadów, którzy są w zasięgu max_range."""
-        neighbors: List[StarsSystem] = []
-        for p in self.__points:
-            if (
-                p not in self.__final
-                and self.__math.distance(point.star_pos, p.star_pos)
-                <= self.__jump_range
-            ):
-                neighbors.append(p)
-        return neighbors
-
     def __reconstruct_path(
-        self, came_from: dict, current: StarsSystem
+        self, came_from: Dict[int, int], current: int
     ) -> List[StarsSystem]:
         """Rekonstruuje ścieżkę od punktu startowego do celu."""
         path: List[StarsSystem] = []
         while current in came_from:
-            path.append(current)
-            current = came_from[current]
+            previous: int = came_from[current]
+            system: StarsSystem = self.__index.points[current]
+            system.data[EdsmKeys.DISTANCE] = math.dist(
+                (
+                    self.__index.position(previous)
+                    if previous >= 0
+                    else self.__start_point.star_pos
+                ),
+                self.__index.position(current),
+            )
+            path.append(system)
+            current = previous
         path.reverse()
         return path
 
-    def debug(self, currentframe: Optional[FrameType], message: str = "") -> None:
-        """Build debug message."""
+    def debug(
+        self,
+        currentframe: Optional[FrameType],
+        message: Union[str, Callable[[], str]] = "",
+    ) -> None:
+        """Build debug message.
+
+        message: string or callable returning it, called only if debug is enabled.
+        """
+        if not self.logger or not self.logger.is_enabled(logging.DEBUG):
+            return
+        if callable(message):
+            message = message()
         p_name: str = f"{self.__plugin_name}"
         c_name: str = f"{self._c_name}"
         m_name: str = f"{currentframe.f_code.co_name}" if currentframe else ""
         if message != "":
             message = f": {message}"
-        if self.logger:
-            self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
+        self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
 
     def run(self) -> None:
-        """Implementacja algorytmu A*."""
-        open_set: List[StarsSystem] = [self.__start_point]
-        came_from: Dict = {}
-        g_score: Dict[StarsSystem, float] = {self.__start_point: 0.0}
-        f_score: Dict[StarsSystem, float] = {
-            self.__start_point: self.__math.distance(
-                self.__start_point.star_pos, self.__points[0].star_pos
-            )
-        }
-        # self.debug(currentframe(), f"{g_score}")
-        # self.debug(currentframe(), f"{f_score}")
+        """Implementacja algorytmu A*.
 
-        while open_set:
-            current: StarsSystem = min(
-                open_set, key=lambda point: f_score.get(point, float("inf"))
-            )
-            # self.debug(currentframe(), f"{current}")
-            if current in self.__points:
+        Kolejka priorytetowa na kopcu z leniwym usuwaniem nieaktualnych
+        wpisów, celem jest pierwszy punkt z listy systems.
+        """
+        self.__final = []
+        if not self.__points:
+            return
+        index: SpatialIndex = self.__index
+        start: int = -1
+        goal: int = index.insert(self.__points[0])
+        goal_pos: Tuple[float, float, float] = index.position(goal)
+        start_pos: List = self.__start_point.star_pos
+        came_from: Dict[int, int] = {}
+        g_score: Dict[int, float] = {start: 0.0}
+        closed: Set[int] = set()
+        # (f_score, kolejność dodania, węzeł)
+        open_heap: List[Tuple[float, int, int]] = [
+            (math.dist(start_pos, goal_pos), 0, start)
+        ]
+        counter: int = 0
+
+        while open_heap:
+            current: int = heapq.heappop(open_heap)[2]
+            if current in closed:
+                # nieaktualny wpis, węzeł był już rozwinięty
+                continue
+            if current == goal:
                 self.__final = self.__reconstruct_path(came_from, current)
-
-            open_set.remove(current)
-            for neighbor in self.__get_neighbors(current):
-                tentative_g_score: float = g_score[current] + self.__math.distance(
-                    current.star_pos, neighbor.star_pos
-                )
-
-                if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                break
+            closed.add(current)
+            current_g: float = g_score[current]
+            for neighbor, dist in index.query_ids(
+                index.position(current) if current >= 0 else start_pos,
+                self.__jump_range,
+            ):
+                if neighbor in closed:
+                    continue
+                tentative_g_score: float = current_g + dist
+                if tentative_g_score < g_score.get(neighbor, float("inf")):
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g_score
-                    f_score[neighbor] = g_score[neighbor] + self.__math.distance(
-                        neighbor.star_pos, self.__points[0].star_pos
+                    counter += 1
+                    heapq.heappush(
+                        open_heap,
+                        (
+                            tentative_g_score
+                            + math.dist(index.position(neighbor), goal_pos),
+                            counter,
+                            neighbor,
+                        ),
                     )
-                    if neighbor not in open_set:
-                        open_set.append(neighbor)
-
-        self.__final = []
+        self.debug(
+            currentframe(),
+            lambda: f"expanded: {len(closed)}, path: {len(self.__final)}",
+        )
 
     @property
     def final_distance(self) -> float:
@@ -444,7 +875,16 @@ class AlgAStar(IAlg, BLogClient):
 
 
 class AlgTsp(IAlg, BLogClient):
-    """Travelling salesman problem."""
+    """Travelling salesman problem.
+
+    Up to HELD_KARP_MAX points the exact Held-Karp solver is used,
+    above that the nearest neighbour tour improved with 2-opt.
+    """
+
+    # largest number of points, with the start, for the exact solver
+    HELD_KARP_MAX: int = 16
+    # largest number of points for the permutations without numpy
+    PERMUTATIONS_MAX: int = 9
 
     __plugin_name: str = None  # type: ignore
     __math: Euclid = None  # type: ignore
@@ -452,6 +892,8 @@ class AlgTsp(IAlg, BLogClient):
     __tmp: List[Any] = None  # type: ignore
     __jump_range: int = None  # type: ignore
     __final: List[StarsSystem] = None  # type: ignore
+    __matrix: DistanceMatrix = None  # type: ignore
+    __time_budget: Optional[float] = None
 
     def __init__(
         self,
@@ -524,6 +966,34 @@ class AlgTsp(IAlg, BLogClient):
         self.__points.append(start)
         self.__points.extend(systems[:])
 
+    @property
+    def time_budget(self) -> Optional[float]:
+        """Return time limit for the solution search in seconds."""
+        return self.__time_budget
+
+    @time_budget.setter
+    def time_budget(self, value: Optional[float]) -> None:
+        """Set time limit for the solution search in seconds.
+
+        When the time is up, the best tour found so far is used.
+        None means no limit.
+        """
+        if value is not None and not isinstance(value, (int, float)):
+            raise Raise.error(
+                f"Float type expected, '{type(value)}' received.",
+                TypeError,
+                self._c_name,
+                currentframe(),
+            )
+        if value is not None and value <= 0:
+            raise Raise.error(
+                f"Positive time budget expected, '{value}' received.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__time_budget = value
+
     def run(self) -> None:
         """Run algorithm."""
         # stage 1: generate a cost table
@@ -535,30 +1005,49 @@ class AlgTsp(IAlg, BLogClient):
 
     def __stage_1_costs(self) -> None:
         """Stage 1: generate a cost table."""
-        count: int = len(self.__points)
-        for idx in range(count):
-            self.__tmp.append([])
-            for idx2 in range(count):
-                self.__tmp[idx].append(
-                    self.__math.distance(
-                        self.__points[idx].star_pos, self.__points[idx2].star_pos
-                    )
-                )
-        self.debug(currentframe(), f"{self.__tmp}")
+        self.__matrix = DistanceMatrix.get(self.__points, self.__math)
+        self.__tmp = self.__matrix.tolist()
+        self.debug(currentframe(), lambda: f"{self.__tmp}")
 
     def __stage_2_solution(self) -> None:
         """Stage 2: search the solution."""
-        out: List[Any] = []
-        vertex: List[int] = []
+        deadline: Optional[float] = (
+            time.monotonic() + self.__time_budget
+            if self.__time_budget is not None
+            else None
+        )
+        count: int = len(self.__points)
+        out: List[int] = list(range(count))
+        if count > 3:
+            if np is None and count <= self.PERMUTATIONS_MAX:
+                out = self.__solve_permutations()
+            else:
+                # heuristic tour, the best known solution if time is up
+                out = self.__two_opt(self.__nearest_neighbour(), deadline)
+                if np is not None and count <= self.HELD_KARP_MAX:
+                    exact: Optional[List[int]] = self.__held_karp(deadline)
+                    if exact is not None:
+                        out = exact
+            # the same cycle in reverse has the same length
+            reverse: List[int] = [0] + out[:0:-1]
+            if reverse < out:
+                out = reverse
+
+        # best solution
+        self.logger.debug = lambda: f"DATA: {self.__points}"
+        self.logger.debug = lambda: f"PATH: {out}"
+        # start system is the first
+        self.__tmp = out
+
+    def __solve_permutations(self) -> List[int]:
+        """Return the shortest cycle by checking all permutations."""
+        out: List[int] = []
+        vertex: List[int] = list(range(1, len(self.__points)))
         start: int = 0
-        for i in range(len(self.__points)):
-            if i != start:
-                vertex.append(i)
         # store minimum weight Hamilton Cycle
         min_path: float = float(maxsize)
-        next_permutation = permutations(vertex)
 
-        for i in next_permutation:
+        for i in permutations(vertex):
             # store current Path weight
             current_path_weight: float = 0.0
             # compute current path weight
@@ -570,62 +1059,139 @@ class AlgTsp(IAlg, BLogClient):
 
             # update minimum
             if min_path > current_path_weight:
-                out = [current_path_weight, i]
+                out = [start, *i]
                 min_path = current_path_weight
+        return out
 
-        # best solution
-        if self.logger:
-            self.logger.debug = f"DATA: {self.__points}"
-        if self.logger:
-            self.logger.debug = f"PATH: {out}"
-        # add start system as first
-        self.__tmp = [0]
-        # and merge with output
-        self.__tmp.extend(list(out[1]))
+    def __nearest_neighbour(self) -> List[int]:
+        """Return the nearest neighbour tour from the start point."""
+        rows: List[List[float]] = self.__tmp
+        current: int = 0
+        tour: List[int] = [0]
+        remaining: List[int] = list(range(1, len(rows)))
+        while remaining:
+            row: List[float] = rows[current]
+            current = min(remaining, key=row.__getitem__)
+            remaining.remove(current)
+            tour.append(current)
+        return tour
+
+    def __two_opt(self, tour: List[int], deadline: Optional[float]) -> List[int]:
+        """Improve the cycle with 2-opt moves until no move helps.
+
+        The start point stays first, the search stops at deadline.
+        """
+        rows: List[List[float]] = self.__tmp
+        count: int = len(tour)
+        improved: bool = True
+        while improved:
+            improved = False
+            for i in range(1, count - 1):
+                if deadline is not None and time.monotonic() > deadline:
+                    return tour
+                p_a: int = tour[i - 1]
+                p_b: int = tour[i]
+                row_a: List[float] = rows[p_a]
+                row_b: List[float] = rows[p_b]
+                d_ab: float = row_a[p_b]
+                for k in range(i + 1, count):
+                    p_c: int = tour[k]
+                    p_d: int = tour[(k + 1) % count]
+                    row_c: List[float] = rows[p_c]
+                    delta: float = row_a[p_c] + row_b[p_d] - d_ab - row_c[p_d]
+                    if delta < -1e-9:
+                        tour[i : k + 1] = tour[i : k + 1][::-1]
+                        p_b = tour[i]
+                        row_b = rows[p_b]
+                        d_ab = row_a[p_b]
+                        improved = True
+        return tour
+
+    def __held_karp(self, deadline: Optional[float]) -> Optional[List[int]]:
+        """Return the shortest cycle, None if the time is up.
+
+        Dynamic programming over the subsets of the points, the subsets
+        of the same size are processed at once on the numpy tables.
+        cost[mask, j]: shortest path from the start through the points
+        of mask ending at point j + 1.
+        """
+        dist = self.__matrix.matrix
+        size: int = len(self.__points) - 1
+        full: int = (1 << size) - 1
+        masks = np.arange(1 << size)
+        # number of points in the subsets
+        bits = np.zeros(1 << size, dtype=np.int8)
+        for j in range(size):
+            bits += (masks >> j) & 1
+        cost = np.full((1 << size, size), np.inf)
+        parent = np.full((1 << size, size), -1, dtype=np.int8)
+        cost[1 << np.arange(size), np.arange(size)] = dist[0, 1:]
+        inner = dist[1:, 1:]
+        for count in range(2, size + 1):
+            if deadline is not None and time.monotonic() > deadline:
+                self.debug(currentframe(), "time budget exceeded")
+                return None
+            layer = masks[bits == count]
+            for j in range(size):
+                ends = layer[(layer >> j) & 1 == 1]
+                prev = ends ^ (1 << j)
+                cand = cost[prev] + inner[:, j]
+                best = cand.argmin(axis=1)
+                cost[ends, j] = cand[np.arange(len(ends)), best]
+                parent[ends, j] = best
+        # close the cycle and walk back
+        last: int = int((cost[full] + dist[1:, 0]).argmin())
+        tour: List[int] = []
+        mask: int = full
+        while last >= 0:
+            tour.append(last + 1)
+            last, mask = int(parent[mask, last]), mask ^ (1 << last)
+        tour.append(0)
+        tour.reverse()
+        return tour
 
     def __final_update(self) -> None:
         """Build final dataset."""
         self.__final = []
         d_sum = 0
-        if self.logger:
-            self.logger.debug = f"TMP: {self.__tmp}"
+        self.logger.debug = lambda: f"TMP: {self.__tmp}"
         for idx in range(1, len(self.__tmp)):
             system: StarsSystem = self.__points[self.__tmp[idx]]
-            system.data[EdsmKeys.DISTANCE] = self.__math.distance(
-                self.__points[self.__tmp[idx - 1]].star_pos,
-                self.__points[self.__tmp[idx]].star_pos,
+            system.data[EdsmKeys.DISTANCE] = self.__matrix.distance(
+                self.__tmp[idx - 1], self.__tmp[idx]
             )
             d_sum += system.data[EdsmKeys.DISTANCE]
             self.__final.append(system)
-        if self.logger:
-            self.logger.debug = f"FINAL Distance: {d_sum:.2f} ly"
-        if self.logger:
-            self.logger.debug = f"INPUT: {self.__points}"
-        if self.logger:
-            self.logger.debug = f"OUTPUT: {self.__final}"
+        self.logger.log(logging.DEBUG, "FINAL Distance: %.2f ly", d_sum)
+        self.logger.debug = lambda: f"INPUT: {self.__points}"
+        self.logger.debug = lambda: f"OUTPUT: {self.__final}"
+
+    def debug(
+        self,
+        currentframe: Optional[FrameType],
+        message: Union[str, Callable[[], str]] = "",
+    ) -> None:
+        """Build debug message.
 
-    def debug(self, currentframe: Optional[FrameType], message: str = "") -> None:
-        """Build debug message."""
+        message: string or callable returning it, called only if debug is enabled.
+        """
+        if not self.logger or not self.logger.is_enabled(logging.DEBUG):
+            return
+        if callable(message):
+            message = message()
         p_name: str = f"{self.__plugin_name}"
         c_name: str = f"{self._c_name}"
         m_name: str = f"{currentframe.f_code.co_name}" if currentframe else ""
         if message != "":
             message = f": {message}"
-        if self.logger:
-            self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
+        self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
 
     @property
     def final_distance(self) -> float:
         if not self.__final:
             return 0.0
-        dist: float = self.__math.distance(
-            self.__points[0].star_pos, self.__final[0].star_pos
-        )
-        for item in range(1, len(self.__final) - 1):
-            dist += self.__math.distance(
-                self.__final[item].star_pos, self.__final[item + 1].star_pos
-            )
-        return dist if dist else 0.0
+        # the route of the matrix indexes, from the start point
+        return self.__matrix.route(self.__tmp)
 
     @property
     def get_final(self) -> List[StarsSystem]:
@@ -642,6 +1208,7 @@ class AlgGeneric(IAlg, BLogClient):
     __points: List[StarsSystem] = None  # type: ignore
     __jump_range: int = 0
     __final: List[StarsSystem] = None  # type: ignore
+    __index: SpatialIndex = None  # type: ignore
 
     def __init__(
         self,
@@ -651,6 +1218,7 @@ class AlgGeneric(IAlg, BLogClient):
         log_queue: Optional[Union[Queue, SimpleQueue]],
         euclid_alg: Euclid,
         plugin_name: str,
+        spatial_index: Optional[SpatialIndex] = None,
     ) -> None:
         """Construct instance object.
 
@@ -661,6 +1229,8 @@ class AlgGeneric(IAlg, BLogClient):
         log_queue: queue for LogClient
         euclid_alg: Euclid - object of initialized vectors class
         plugin_name: str - name of plugin for debug log
+        spatial_index: SpatialIndex - optional index shared between algorithms,
+            the systems are added to it
         """
         self.__plugin_name = plugin_name
         # init log subsystem
@@ -711,6 +1281,10 @@ class AlgGeneric(IAlg, BLogClient):
         self.__points = [
             system for system in systems if isinstance(system, StarsSystem)
         ]
+        if spatial_index is None:
+            spatial_index = SpatialIndex(max(jump_range, 1))
+        spatial_index.extend(self.__points)
+        self.__index = spatial_index
         self.__final = []
 
     def run(self) -> None:
@@ -724,21 +1298,20 @@ class AlgGeneric(IAlg, BLogClient):
 
         start_t: float = time.time()
         current_point: StarsSystem = self.__start_point
-        systems: List[StarsSystem] = self.__points[:]
-        remaining_systems: List[StarsSystem] = systems  # lista punktów do odwiedzenia
+        # punkty do odwiedzenia, indeks może zawierać też inne systemy
+        remaining: Dict[int, StarsSystem] = {
+            id(system): system for system in self.__points
+        }
 
-        while remaining_systems:
+        while remaining:
             # Szukamy najbliższego punktu, który jest w zasięgu jump_range z obecnego punktu
             next_point: Optional[StarsSystem] = None
             min_distance: float = float("inf")
 
-            for system in remaining_systems:
-                dist = self.__math.distance(current_point.star_pos, system.star_pos)
-                if (
-                    dist is not None
-                    and dist <= self.__jump_range
-                    and dist < min_distance
-                ):
+            for system, dist in self.__index.query(
+                current_point.star_pos, self.__jump_range
+            ):
+                if id(system) in remaining and dist < min_distance:
                     next_point = system
                     min_distance = dist
 
@@ -747,35 +1320,33 @@ class AlgGeneric(IAlg, BLogClient):
                 break
 
             # Przechodzimy do znalezionego punktu i usuwamy go z listy
+            next_point.data[EdsmKeys.DISTANCE] = min_distance
             self.__final.append(next_point)
-            remaining_systems.remove(next_point)
+            del remaining[id(next_point)]
             current_point = next_point  # Aktualizujemy bieżący punkt
 
-        # update distance
-        if self.__final:
-            dist: float = self.__math.distance(
-                self.__start_point.star_pos, self.__final[0].star_pos
-            )
-            self.__final[0].data[EdsmKeys.DISTANCE] = dist
-            for item in range(len(self.__final) - 1):
-                dist = self.__math.distance(
-                    self.__final[item].star_pos,
-                    self.__final[item + 1].star_pos,
-                )
-                self.__final[item + 1].data[EdsmKeys.DISTANCE] = dist
-
         end_t: float = time.time()
         self.debug(currentframe(), f"Evolution took {end_t - start_t} seconds.")
 
-    def debug(self, currentframe: Optional[FrameType], message: str = "") -> None:
-        """Build debug message."""
+    def debug(
+        self,
+        currentframe: Optional[FrameType],
+        message: Union[str, Callable[[], str]] = "",
+    ) -> None:
+        """Build debug message.
+
+        message: string or callable returning it, called only if debug is enabled.
+        """
+        if not self.logger or not self.logger.is_enabled(logging.DEBUG):
+            return
+        if callable(message):
+            message = message()
         p_name: str = f"{self.__plugin_name}"
         c_name: str = f"{self._c_name}"
         m_name: str = f"{currentframe.f_code.co_name}" if currentframe else ""
         if message != "":
             message = f": {message}"
-        if self.logger:
-            self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
+        self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
 
     @property
     def final_distance(self) -> float:
@@ -810,6 +1381,8 @@ class AlgGenetic(IAlg, BLogClient):
     __generations: int = None  # type: ignore
     __mutation_rate: float = None  # type: ignore
     __crossover_rate: float = None  # type: ignore
+    __matrix: DistanceMatrix = None  # type: ignore
+    __index: Dict[int, int] = None  # type: ignore
 
     def __init__(
         self,
@@ -881,6 +1454,8 @@ class AlgGenetic(IAlg, BLogClient):
             system for system in systems if isinstance(system, StarsSystem)
         ]
         self.__start_point = start
+        self.__matrix = DistanceMatrix.get([start] + self.__points, self.__math)
+        self.__index = DistanceMatrix.index([start] + self.__points)
         self.__population_size = len(systems) * 3
         self.__generations = 200
         self.__mutation_rate = 0.01
@@ -888,21 +1463,16 @@ class AlgGenetic(IAlg, BLogClient):
 
     def __generate_individual(self) -> List[StarsSystem]:
         individual: List[StarsSystem] = [self.__start_point]
-        remaining_points: List[StarsSystem] = self.__points[:]
-        while remaining_points:
-            closest_point: StarsSystem = min(
-                remaining_points,
-                key=lambda point: self.__math.distance(
-                    individual[-1].star_pos, point.star_pos
-                ),
-            )
-            if (
-                self.__math.distance(individual[-1].star_pos, closest_point.star_pos)
-                > self.__jump_range
-            ):
+        rows: List[List[float]] = self.__matrix.tolist()
+        current: int = 0
+        remaining: List[int] = list(range(1, self.__matrix.size))
+        while remaining:
+            row: List[float] = rows[current]
+            current = min(remaining, key=row.__getitem__)
+            if row[current] > self.__jump_range:
                 break
-            individual.append(closest_point)
-            remaining_points.remove(closest_point)
+            individual.append(self.__points[current - 1])
+            remaining.remove(current)
         return individual
 
     def __generate_population(self) -> List[List[StarsSystem]]:
@@ -912,11 +1482,9 @@ class AlgGenetic(IAlg, BLogClient):
         return population
 
     def __get_fitness(self, individual: List[StarsSystem]) -> float:
-        distance: float = 0
-        for i in range(len(individual) - 1):
-            distance += self.__math.distance(
-                individual[i].star_pos, individual[i + 1].star_pos
-            )
+        distance: float = self.__matrix.route(
+            [self.__index[id(system)] for system in individual]
+        )
         return 1 / distance if distance > 0 else float("inf")
 
     def __select_parents(
@@ -994,15 +1562,25 @@ class AlgGenetic(IAlg, BLogClient):
             start = end
         self.debug(currentframe(), f"FINAL Distance: {d_sum:.2f} ly")
 
-    def debug(self, currentframe: Optional[FrameType], message: str = "") -> None:
-        """Build debug message."""
+    def debug(
+        self,
+        currentframe: Optional[FrameType],
+        message: Union[str, Callable[[], str]] = "",
+    ) -> None:
+        """Build debug message.
+
+        message: string or callable returning it, called only if debug is enabled.
+        """
+        if not self.logger or not self.logger.is_enabled(logging.DEBUG):
+            return
+        if callable(message):
+            message = message()
         p_name: str = f"{self.__plugin_name}"
         c_name: str = f"{self._c_name}"
         m_name: str = f"{currentframe.f_code.co_name}" if currentframe else ""
         if message != "":
             message = f": {message}"
-        if self.logger:
-            self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
+        self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
 
     @property
     def final_distance(self) -> float:
@@ -1266,15 +1844,25 @@ class AlgGenetic2(IAlg, BLogClient):
         end_t: float = time.time()
         self.debug(currentframe(), f"Evolution took {end_t - start_t} seconds.")
 
-    def debug(self, currentframe: Optional[FrameType], message: str = "") -> None:
-        """Build debug message."""
+    def debug(
+        self,
+        currentframe: Optional[FrameType],
+        message: Union[str, Callable[[], str]] = "",
+    ) -> None:
+        """Build debug message.
+
+        message: string or callable returning it, called only if debug is enabled.
+        """
+        if not self.logger or not self.logger.is_enabled(logging.DEBUG):
+            return
+        if callable(message):
+            message = message()
         p_name: str = f"{self.__plugin_name}"
         c_name: str = f"{self._c_name}"
         m_name: str = f"{currentframe.f_code.co_name}" if currentframe else ""
         if message != "":
             message = f": {message}"
-        if self.logger:
-            self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
+        self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
 
     @property
     def final_distance(self) -> float:
@@ -1308,6 +1896,8 @@ class AlgSimulatedAnnealing(IAlg, BLogClient):
     __cooling_rate: float = 0.0
     __best_distance: float = float("inf")
     __current_solution: List[StarsSystem] = None  # type: ignore
+    __matrix: DistanceMatrix = None  # type: ignore
+    __index: Dict[int, int] = None  # type: ignore
 
     def __init__(
         self,
@@ -1380,6 +1970,8 @@ class AlgSimulatedAnnealing(IAlg, BLogClient):
             system for system in systems if isinstance(system, StarsSystem)
         ]
         self.__jump_range = jump_range
+        self.__matrix = DistanceMatrix.get([start] + self.__points, self.__math)
+        self.__index = DistanceMatrix.index([start] + self.__points)
         self.__initial_temp = 1000.0  # 1000
         self.__cooling_rate = 0.003  # 0.003
         # initial_temp: Im wyższa temperatura początkowa, tym większe jest
@@ -1398,18 +1990,10 @@ class AlgSimulatedAnnealing(IAlg, BLogClient):
 
     def calculate_total_distance(self, path: List[StarsSystem]) -> float:
         """Calculate the total distance of the path, starting from the start point."""
-        total_dist = 0
-        current_star: StarsSystem = self.__start_point
-        for next_star in path:
-            dist: float = self.__math.distance(
-                current_star.star_pos, next_star.star_pos
-            )
-            if dist <= self.__jump_range:  # Only count valid jumps
-                total_dist += dist
-            else:
-                return float("inf")  # Penalize paths that exceed jump_range
-            current_star = next_star
-        return total_dist
+        # paths with a jump exceeding jump_range are penalized with inf
+        return self.__matrix.route(
+            [0] + [self.__index[id(system)] for system in path], self.__jump_range
+        )
 
     def accept_solution(
         self, current_distance: float, new_distance: float, temperature: float
@@ -1474,15 +2058,25 @@ class AlgSimulatedAnnealing(IAlg, BLogClient):
         end_t: float = time.time()
         self.debug(currentframe(), f"Evolution took {end_t - start_t} seconds.")
 
-    def debug(self, currentframe: Optional[FrameType], message: str = "") -> None:
-        """Build debug message."""
+    def debug(
+        self,
+        currentframe: Optional[FrameType],
+        message: Union[str, Callable[[], str]] = "",
+    ) -> None:
+        """Build debug message.
+
+        message: string or callable returning it, called only if debug is enabled.
+        """
+        if not self.logger or not self.logger.is_enabled(logging.DEBUG):
+            return
+        if callable(message):
+            message = message()
         p_name: str = f"{self.__plugin_name}"
         c_name: str = f"{self._c_name}"
         m_name: str = f"{currentframe.f_code.co_name}" if currentframe else ""
         if message != "":
             message = f": {message}"
-        if self.logger:
-            self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
+        self.logger.debug = f"{p_name}->{c_name}.{m_name}{message}"
 
     @property
     def final_distance(self) -> float:
@@ -9,9 +9,10 @@ Purpose: logger engine classes.
 import os
 import sys
 import syslog
+import time
 
 from inspect import currentframe
-from typing import Optional, Union
+from typing import Optional, TextIO, Union
 
 from .keys import LogKeys, SysLogKeys
 
@@ -101,18 +102,41 @@ class LoggerEngineStderr(ILoggerEngine, BLoggerEngine, BData, NoDynamicAttribute
 
 
 class LoggerEngineFile(ILoggerEngine, BLoggerEngine, BData, NoDynamicAttributes):
-    """FILE Logger engine."""
+    """FILE Logger engine.
+
+    The log file is kept open. Unbuffered engine flushes every message,
+    buffered one flushes after flush_size bytes or flush_interval seconds;
+    the processor thread flushes it also when idle, see flush_due.
+    A log file moved or removed by an external tool is detected at most
+    every flush_interval seconds, always before the next message is written,
+    so the messages after the rotation are not appended to the moved file.
+    """
 
     def __init__(
         self,
         name: Optional[str] = None,
         formatter: Optional[BLogFormatter] = None,
         buffered: bool = False,
+        flush_interval: float = 1.0,
+        flush_size: int = 64 * 1024,
     ) -> None:
-        """Constructor."""
+        """Constructor.
+
+        ### Arguments:
+        * name [Optional[str]] - app name,
+        * formatter [Optional[BLogFormatter]] - messages formatter,
+        * buffered [bool] - flush in batches instead of every message,
+        * flush_interval [float] - max seconds between flushes when buffered,
+        * flush_size [int] - max unflushed bytes when buffered.
+        """
         if name is not None:
             self.name = name
         self._data[LogKeys.BUFFERED] = buffered
+        self._data[LogKeys.FLUSH_INTERVAL] = flush_interval
+        self._data[LogKeys.FLUSH_SIZE] = flush_size
+        self._data[LogKeys.HANDLE] = None
+        self._data[LogKeys.LAST_FLUSH] = time.monotonic()
+        self._data[LogKeys.PENDING] = 0
         self._data[LogKeys.FORMATTER] = None
         if formatter is not None:
             if isinstance(formatter, BLogFormatter):
@@ -125,22 +149,87 @@ class LoggerEngineFile(ILoggerEngine, BLoggerEngine, BData, NoDynamicAttributes)
                     currentframe(),
                 )
 
+    def __del__(self) -> None:
+        """Close log file."""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @property
+    def __path(self) -> str:
+        """Return log file path."""
+        if self.logfile is None:
+            raise Raise.error(
+                f"The {self._c_name} is not configured correctly.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        return os.path.join(self.logdir if self.logdir else "", self.logfile)
+
+    def __handle(self) -> TextIO:
+        """Return opened log file."""
+        if self._data[LogKeys.HANDLE] is None:
+            self._data[LogKeys.HANDLE] = open(self.__path, "a")
+        return self._data[LogKeys.HANDLE]
+
+    @property
+    def flush_due(self) -> Optional[float]:
+        """Return seconds to the interval flush, None if nothing to flush."""
+        if not self._data[LogKeys.PENDING]:
+            return None
+        return max(
+            0.0,
+            self._data[LogKeys.LAST_FLUSH]
+            + self._data[LogKeys.FLUSH_INTERVAL]
+            - time.monotonic(),
+        )
+
     def send(self, message: str) -> None:
         """Send message to file."""
         if self._data[LogKeys.FORMATTER]:
             message = self._data[LogKeys.FORMATTER].format(message, self.name)
-            if self.logfile is None:
-                raise Raise.error(
-                    f"The {self._c_name} is not configured correctly.",
-                    ValueError,
-                    self._c_name,
-                    currentframe(),
-                )
-            log_dir: str = self.logdir if self.logdir else ""
-            with open(os.path.join(log_dir, self.logfile), "a") as file:
-                if file.writable:
-                    file.write(message)
-                    file.write("\n")
+        if (
+            time.monotonic() - self._data[LogKeys.LAST_FLUSH]
+            >= self._data[LogKeys.FLUSH_INTERVAL]
+        ):
+            # write out the older messages and check the rotation first
+            self.flush()
+        handle: TextIO = self.__handle()
+        handle.write(f"{message}\n")
+        if self._data[LogKeys.BUFFERED]:
+            self._data[LogKeys.PENDING] += len(message) + 1
+            if self._data[LogKeys.PENDING] >= self._data[LogKeys.FLUSH_SIZE]:
+                self.flush()
+        else:
+            handle.flush()
+
+    def flush(self) -> None:
+        """Write buffered messages to the log file."""
+        handle: Optional[TextIO] = self._data[LogKeys.HANDLE]
+        self._data[LogKeys.PENDING] = 0
+        self._data[LogKeys.LAST_FLUSH] = time.monotonic()
+        if handle is None:
+            return
+        handle.flush()
+        # rotated by an external tool: file moved, removed or replaced
+        try:
+            rotated: bool = (
+                os.stat(self.__path).st_ino != os.fstat(handle.fileno()).st_ino
+            )
+        except OSError:
+            rotated = True
+        if rotated:
+            self.close()
+
+    def close(self) -> None:
+        """Flush and close the log file, it is opened again by next send."""
+        handle: Optional[TextIO] = self._data[LogKeys.HANDLE]
+        self._data[LogKeys.HANDLE] = None
+        self._data[LogKeys.PENDING] = 0
+        if handle is not None:
+            handle.close()
 
     @property
     def logdir(self) -> Optional[str]:
@@ -158,6 +247,7 @@ class LoggerEngineFile(ILoggerEngine, BLoggerEngine, BData, NoDynamicAttributes)
         if not pc_ld.exists:
             pc_ld.create()
         if pc_ld.exists and pc_ld.is_dir:
+            self.close()
             self._data[LogKeys.DIR] = pc_ld.path
 
     @property
@@ -194,6 +284,7 @@ class LoggerEngineFile(ILoggerEngine, BLoggerEngine, BData, NoDynamicAttributes)
                     currentframe(),
                 )
         self.logdir = pc_ld.dirname if pc_ld.dirname else ""
+        self.close()
         self._data[LogKeys.FILE] = pc_ld.filename
 
 
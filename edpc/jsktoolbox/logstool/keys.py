@@ -24,10 +24,15 @@ class LogKeys(object, metaclass=ReadOnlyClass):
     DIR: str = "__dir__"
     FACILITY: str = "__facility__"
     FILE: str = "__file__"
+    FLUSH_INTERVAL: str = "__flush_interval__"
+    FLUSH_SIZE: str = "__flush_size__"
     FORMATTER: str = "__formatter__"
+    HANDLE: str = "__handle__"
+    LAST_FLUSH: str = "__last_flush__"
     LEVEL: str = "__level__"
     NAME: str = "__name__"
     NO_CONF: str = "__no_conf__"
+    PENDING: str = "__pending__"
     QUEUE: str = "__queue__"
     SYSLOG: str = "__syslog__"
 
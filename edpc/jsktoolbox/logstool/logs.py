@@ -6,13 +6,12 @@ Created: 04.09.2023
 Purpose: logs subsystem classes.
 """
 
-import time
 import threading
 from inspect import currentframe
 
 from typing import Optional
 
-from .queue import LoggerQueue
+from .queue import LoggerQueue, LoggerQueuePolicy
 
 from .keys import LogKeys, LogsLevelKeys
 
@@ -167,10 +166,17 @@ class LoggerClient(BLoggerQueue, NoDynamicAttributes):
 class LoggerEngine(BLoggerQueue, NoDynamicAttributes):
     """LoggerEngine container class."""
 
-    def __init__(self) -> None:
-        """Constructor."""
+    def __init__(
+        self, queue_size: int = 0, queue_policy: str = LoggerQueuePolicy.DROP_OLDEST
+    ) -> None:
+        """Constructor.
+
+        ### Arguments:
+        * queue_size [int] - maximum number of queued messages, 0 - unbounded,
+        * queue_policy [str] - LoggerQueuePolicy key used when the queue is full.
+        """
         # make logs queue object
-        self.logs_queue = LoggerQueue()
+        self.logs_queue = LoggerQueue(queue_size, queue_policy)
         # default logs level configuration
         self._data[LogKeys.NO_CONF] = {}
         self._data[LogKeys.NO_CONF][LogsLevelKeys.INFO] = [LoggerEngineStdout()]
@@ -252,6 +258,29 @@ class LoggerEngine(BLoggerQueue, NoDynamicAttributes):
             else:
                 return None
 
+    def flush(self) -> None:
+        """Flush the engines with buffered output, e.g. LoggerEngineFile."""
+        for key in (LogKeys.CONF, LogKeys.NO_CONF):
+            for engines in self._data.get(key, {}).values():
+                for engine in engines:
+                    if hasattr(engine, "flush"):
+                        engine.flush()
+
+    @property
+    def flush_timeout(self) -> Optional[float]:
+        """Return seconds to the nearest flush of the engines, None if none.
+
+        The processor thread waits for the messages no longer than that.
+        """
+        out: Optional[float] = None
+        for key in (LogKeys.CONF, LogKeys.NO_CONF):
+            for engines in self._data.get(key, {}).values():
+                for engine in engines:
+                    due: Optional[float] = getattr(engine, "flush_due", None)
+                    if due is not None and (out is None or due < out):
+                        out = due
+        return out
+
 
 class ThLoggerProcessor(threading.Thread, ThBaseObject, NoDynamicAttributes):
     """LoggerProcessor thread class."""
@@ -262,7 +291,6 @@ class ThLoggerProcessor(threading.Thread, ThBaseObject, NoDynamicAttributes):
         self._stop_event = threading.Event()
         self._debug = debug
         self.daemon = True
-        self.sleep_period = 0.2
 
     @property
     def logger_engine(self) -> Optional[LoggerEngine]:
@@ -316,20 +344,34 @@ class ThLoggerProcessor(threading.Thread, ThBaseObject, NoDynamicAttributes):
             )
         if self._debug:
             self.logger_client.message_debug = f"[{self._c_name}] starting..."
-        # run
+        # run, woken up by every put to the queue, or when the buffered
+        # messages have to be written out
+        queue: Optional[LoggerQueue] = self.logger_engine.logs_queue
         while not self.stopped:
+            if queue is not None:
+                timeout: Optional[float] = self.logger_engine.flush_timeout
+                if not queue.wait(timeout) and timeout is not None:
+                    self.logger_engine.flush()
             self.logger_engine.send()
-            time.sleep(self.sleep_period)
         if self._debug:
             self.logger_client.message_debug = f"[{self._c_name}] stopped."
         self.logger_engine.send()
+        self.logger_engine.flush()
 
-    def stop(self) -> None:
-        """Set stop event."""
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Set stop event, wait for the queued messages to be sent.
+
+        ### Arguments:
+        * timeout [Optional[float]] - join limit in seconds, None - no limit.
+        """
         if self._debug and self.logger_client:
             self.logger_client.message_debug = f"[{self._c_name}] stopping..."
         if self._stop_event:
             self._stop_event.set()
+        if self.logger_engine and self.logger_engine.logs_queue:
+            self.logger_engine.logs_queue.wakeup()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
 
     @property
     def stopped(self) -> bool:
@@ -7,43 +7,124 @@ Created: 6.09.2024, 16:43:41
 Purpose: Queue for logs subsystem.
 """
 
-from typing import Optional, Tuple, List, Any
+from collections import deque
+from inspect import currentframe
+from threading import Condition
+from typing import Deque, Optional, Tuple
 
-from ..attribtool import NoDynamicAttributes
+from ..attribtool import NoDynamicAttributes, ReadOnlyClass
 from ..basetool.classes import BClasses
 from .keys import LogsLevelKeys
 from ..raisetool import Raise
 
 
-from inspect import currentframe
-from typing import List
+class LoggerQueuePolicy(object, metaclass=ReadOnlyClass):
+    """Keys for the full queue policies."""
+
+    # remove the oldest message to make room for the new one
+    DROP_OLDEST: str = "drop_oldest"
+    # discard the new message
+    DROP_NEWEST: str = "drop_newest"
+    # wait for room, up to the timeout, then discard the new message
+    BLOCK: str = "block"
+
+    keys: Tuple[str, ...] = (DROP_OLDEST, DROP_NEWEST, BLOCK)
 
 
 class LoggerQueue(BClasses, NoDynamicAttributes):
-    """LoggerQueue simple class."""
+    """LoggerQueue class.
 
-    __queue: List[List[str]] = []
+    Thread safe FIFO of (log_level, message) tuples, optionally bounded.
+    """
 
-    def __init__(self) -> None:
-        """Constructor."""
-        self.__queue = []
+    __queue: Deque[Tuple[str, str]] = None  # type: ignore
+    __cond: Condition = None  # type: ignore
+    __maxsize: int = 0
+    __policy: str = LoggerQueuePolicy.DROP_OLDEST
+    __timeout: Optional[float] = None
+    __dropped: int = 0
+    __wake: bool = False
 
-    def get(self) -> Optional[tuple[str, ...]]:
-        """Get item from queue.
+    def __init__(
+        self,
+        maxsize: int = 0,
+        policy: str = LoggerQueuePolicy.DROP_OLDEST,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Constructor.
 
-        Returns queue tuple[log_level:str, message:str] or None if empty.
+        ### Arguments:
+        * maxsize [int] - maximum number of messages, 0 - unbounded,
+        * policy [str] - LoggerQueuePolicy key used when the queue is full,
+        * timeout [Optional[float]] - BLOCK policy wait limit in seconds, None - no limit.
         """
-        try:
-            return tuple(self.__queue.pop(0))
-        except IndexError:
-            return None
-        except Exception as ex:
+        if policy not in LoggerQueuePolicy.keys:
             raise Raise.error(
-                f"Unexpected exception was thrown: {ex}",
-                Exception,
+                f"LoggerQueuePolicy key expected, '{policy}' received.",
+                KeyError,
                 self._c_name,
                 currentframe(),
             )
+        self.__queue = deque()
+        self.__cond = Condition()
+        self.__maxsize = max(0, maxsize)
+        self.__policy = policy
+        self.__timeout = timeout
+        self.__dropped = 0
+        self.__wake = False
+
+    @property
+    def size(self) -> int:
+        """Return number of queued messages."""
+        return len(self.__queue)
+
+    @property
+    def maxsize(self) -> int:
+        """Return maximum number of messages, 0 - unbounded."""
+        return self.__maxsize
+
+    @property
+    def policy(self) -> str:
+        """Return full queue policy."""
+        return self.__policy
+
+    @property
+    def dropped(self) -> int:
+        """Return number of messages dropped because the queue was full."""
+        return self.__dropped
+
+    def get(self) -> Optional[Tuple[str, ...]]:
+        """Get item from queue.
+
+        Returns queue tuple[log_level:str, message:str] or None if empty.
+        """
+        with self.__cond:
+            if not self.__queue:
+                return None
+            item: Tuple[str, str] = self.__queue.popleft()
+            if self.__maxsize:
+                # room for a blocked producer
+                self.__cond.notify_all()
+            return item
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a message or wakeup call.
+
+        ### Arguments:
+        * timeout [Optional[float]] - wait limit in seconds, None - no limit.
+
+        Returns True if the queue is not empty.
+        """
+        with self.__cond:
+            self.__cond.wait_for(lambda: self.__queue or self.__wake, timeout)
+            self.__wake = False
+            return bool(self.__queue)
+
+    def wakeup(self) -> None:
+        """Wake up threads waiting for a message."""
+        with self.__cond:
+            self.__wake = True
+            self.__cond.notify_all()
 
     def put(self, message: str, log_level: str = LogsLevelKeys.INFO) -> None:
         """Put item to queue."""
@@ -54,12 +135,21 @@ class LoggerQueue(BClasses, NoDynamicAttributes):
                 self._c_name,
                 currentframe(),
             )
-        self.__queue.append(
-            [
-                log_level,
-                message,
-            ]
-        )
+        with self.__cond:
+            if self.__maxsize and len(self.__queue) >= self.__maxsize:
+                if self.__policy == LoggerQueuePolicy.DROP_OLDEST:
+                    self.__queue.popleft()
+                    self.__dropped += 1
+                elif self.__policy == LoggerQueuePolicy.DROP_NEWEST:
+                    self.__dropped += 1
+                    return
+                elif not self.__cond.wait_for(
+                    lambda: len(self.__queue) < self.__maxsize, self.__timeout
+                ):
+                    self.__dropped += 1
+                    return
+            self.__queue.append((log_level, message))
+            self.__cond.notify_all()
 
 
 # #[EOF]#######################################################################
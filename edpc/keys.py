@@ -23,6 +23,9 @@ class EDPCKeys(object, metaclass=ReadOnlyClass):
     P_CMDR: str = "Cmdr"
     P_EVENT: str = "event"
     P_SCREENSHOT: str = "Screenshot"
+    P_BACKLOG: str = "__backlog_key__"
+    P_DEFERRED: str = "__deferred__"
+    P_JOB_ID: str = "__job_id__"
 
     # CONFIG
     CONF_PIC_SRC_DIR: str = "picsrcdir"
@@ -30,16 +33,31 @@ class EDPCKeys(object, metaclass=ReadOnlyClass):
     CONF_PIC_MOVE: str = "picmove"
     CONF_PIC_CONVERT: str = "picconvert"
     CONF_PIC_TYPE: str = "pictype"
+    CONF_PIC_WORKERS: str = "picworkers"
+    CONF_PIC_PROFILE: str = "picprofile"
+    CONF_PIC_DEFER: str = "picdefer"
+    CONF_PIC_LOW_PRIO: str = "piclowprio"
+    CONF_PIC_DEDUP: str = "picdedup"
+    CONF_PIC_THUMBS: str = "picthumbs"
+    CONF_PIC_METADATA: str = "picmetadata"
     CONF_LOG_LEVEL: str = "loglevel"
 
     # SYSTEM
+    BACKLOG: str = "__backlog__"
     CONFIG_DIALOG: str = "__config_dialog__"
     DIR: str = "__dir__"
     ENGINE: str = "__engine__"
+    JOB_STORE: str = "__job_store__"
+    JOURNAL_DIR: str = "__journal_dir__"
     LOGGER: str = "__logger__"
     LOG_PROCESSOR: str = "__log_processor__"
+    LOW_PRIORITY: str = "__low_priority__"
     MESSAGES: str = "__messages__"
+    PLUGIN_DIR: str = "__plugin_dir__"
+    POOL: str = "__pool__"
+    POOL_SIZE: str = "__pool_size__"
     QLOG: str = "__qlog__"
+    SCHEDULER: str = "__scheduler__"
     SHUTTING_DOWN: str = "__shutting_down__"
     TH_LOG: str = "__th_log__"
     TH_QUEUE: str = "__th_queue__"
@@ -47,11 +65,24 @@ class EDPCKeys(object, metaclass=ReadOnlyClass):
 
     # converter
     CONVERT_TYPE: str = "__convert_type__"
+    DEDUP: str = "__dedup__"
+    DEDUP_INDEX: str = "__dedup_index__"
     DELTA_TIME: str = "__time_delta__"
     DST_DIR: str = "__dst_dir__"
+    GAME_TIME: str = "__game_time__"
+    PROFILE: str = "__profile__"
+    JOB_CONVERT: str = "__job_convert__"
+    JOB_DONE: str = "__job_done__"
+    JOB_DST: str = "__job_dst__"
+    JOB_ITEM: str = "__job_item__"
+    JOB_REMOVE: str = "__job_remove__"
+    METADATA: str = "__metadata__"
+    NAMES_INDEX: str = "__names_index__"
     REMOVE: str = "__remove__"
     SRC_DIR: str = "__src_dir__"
+    STREAM_LIMIT: str = "__stream_limit__"
     SUFFIX: str = "__suffix__"
+    THUMBNAILS: str = "__thumbnails__"
 
     # template
     LOG_TIME: str = "__log_time__"
@@ -60,16 +91,24 @@ class EDPCKeys(object, metaclass=ReadOnlyClass):
     PIC_TIME: str = "__pic_time__"
 
     # DIALOG
+    BACKLOG_COMMAND: str = "__backlog_command__"
     DST_ENTRY: str = "__dst_entry__"
     PIC_CONVERT: str = "__pic_convert__"
     PIC_CONV_CHECK: str = "__pic_conv_check__"
+    PIC_DEDUP: str = "__pic_dedup__"
+    PIC_DEFER: str = "__pic_defer__"
     PIC_DST_DIR: str = "__pic_dst_dir__"
+    PIC_LOW_PRIO: str = "__pic_low_prio__"
+    PIC_METADATA: str = "__pic_metadata__"
     PIC_MOVE: str = "__pic_move__"
     PIC_MOVE_CHECK: str = "__pic_move_check__"
+    PIC_PROFILE: str = "__pic_profile__"
     PIC_SRC_DIR: str = "__pic_src_dir__"
+    PIC_THUMBS: str = "__pic_thumbs__"
     PIC_STATUS: str = "__pic_status__"
     PIC_TYPE: str = "__pic_type__"
     PIC_TYPE_CHECK: str = "__pic_type_check__"
+    PIC_WORKERS: str = "__pic_workers__"
     PLUGIN_NAME: str = "__plugin_name__"
     SRC_ENTRY: str = "__src_entry__"
     STATUS: str = "__status__"
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+  metadata.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 21:03:55
+
+  Purpose: Screenshot metadata for the image headers.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+from edpc.jsktoolbox.basetool.classes import BClasses
+from edpc.gametime import GameTime
+from edpc.keys import EDPCKeys
+
+
+class Metadata(BClasses):
+    """Metadata class.
+
+    Builds EXIF, XMP and PNG text chunks from the screenshot event,
+    so the metadata is written by the encoder together with the image.
+    """
+
+    SOFTWARE: str = "EDPC"
+    # signature of the JPEG APP1 segment with the XMP packet
+    XMP_SIGNATURE: bytes = b"http://ns.adobe.com/xap/1.0/\x00"
+    # XMP namespace of the plugin specific properties
+    NAMESPACE: str = "urn:edpc:1.0:"
+
+    # EXIF tags
+    __IMAGE_DESCRIPTION: int = 0x010E
+    __SOFTWARE: int = 0x0131
+    __DATE_TIME: int = 0x0132
+    __ARTIST: int = 0x013B
+    __XMP: int = 0x02BC
+    __EXIF_IFD: int = 0x8769
+    __DATE_TIME_ORIGINAL: int = 0x9003
+    __OFFSET_TIME_ORIGINAL: int = 0x9011
+
+    __system: str = ""
+    __body: str = ""
+    __cmdr: str = ""
+    __timestamp: str = ""
+    __date: Optional[datetime] = None
+
+    def __init__(self, item: Dict[str, Any]) -> None:
+        """Initialize Metadata class.
+
+        item: screenshot event.
+        """
+        self.__system = str(item.get(EDPCKeys.P_SYSTEM, "") or "")
+        self.__body = str(item.get(EDPCKeys.P_BODY, "") or "")
+        self.__cmdr = str(item.get(EDPCKeys.P_CMDR, "") or "")
+        self.__timestamp = str(item.get(EDPCKeys.P_TIMESTAMP, "") or "")
+        try:
+            self.__date = GameTime.parse(self.__timestamp)
+        except ValueError:
+            self.__date = None
+
+    @property
+    def description(self) -> str:
+        """Give me the description: 'system / body'."""
+        if self.__system and self.__body and self.__body != self.__system:
+            return f"{self.__system} / {self.__body}"
+        return self.__body or self.__system
+
+    @property
+    def exif_date(self) -> str:
+        """Give me the EXIF formatted UTC date, empty if unknown."""
+        if self.__date is None:
+            return ""
+        return self.__date.strftime("%Y:%m:%d %H:%M:%S")
+
+    def exif(self) -> Image.Exif:
+        """Give me the EXIF block."""
+        exif = Image.Exif()
+        exif[self.__SOFTWARE] = self.SOFTWARE
+        if self.description:
+            exif[self.__IMAGE_DESCRIPTION] = self.description
+        if self.__cmdr:
+            exif[self.__ARTIST] = self.__cmdr
+        if self.exif_date:
+            exif[self.__DATE_TIME] = self.exif_date
+            ifd = exif.get_ifd(self.__EXIF_IFD)
+            ifd[self.__DATE_TIME_ORIGINAL] = self.exif_date
+            ifd[self.__OFFSET_TIME_ORIGINAL] = "+00:00"
+        return exif
+
+    def xmp(self) -> bytes:
+        """Give me the XMP packet."""
+        props: List[str] = [f"<xmp:CreatorTool>{self.SOFTWARE}</xmp:CreatorTool>"]
+        if self.__date is not None:
+            props.append(f"<xmp:CreateDate>{escape(self.__timestamp)}</xmp:CreateDate>")
+        if self.__cmdr:
+            props.append(
+                "<dc:creator><rdf:Seq>"
+                f"<rdf:li>{escape(self.__cmdr)}</rdf:li>"
+                "</rdf:Seq></dc:creator>"
+            )
+        if self.description:
+            props.append(
+                "<dc:description><rdf:Alt>"
+                f'<rdf:li xml:lang="x-default">{escape(self.description)}</rdf:li>'
+                "</rdf:Alt></dc:description>"
+            )
+        for name, value in (
+            ("System", self.__system),
+            ("Body", self.__body),
+            ("Commander", self.__cmdr),
+            ("Timestamp", self.__timestamp),
+        ):
+            if value:
+                props.append(f"<edpc:{name}>{escape(value)}</edpc:{name}>")
+        return (
+            '<?xpacket begin="\ufeff" id="W5M0MpCehiHzreSzNTczkc9d"?>'
+            '<x:xmpmeta xmlns:x="adobe:ns:meta/">'
+            '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+            '<rdf:Description rdf:about=""'
+            ' xmlns:dc="http://purl.org/dc/elements/1.1/"'
+            ' xmlns:xmp="http://ns.adobe.com/xap/1.0/"'
+            f' xmlns:edpc="{self.NAMESPACE}">'
+            + "".join(props)
+            + "</rdf:Description></rdf:RDF></x:xmpmeta>"
+            '<?xpacket end="w"?>'
+        ).encode("utf-8")
+
+    def text(self) -> Dict[str, str]:
+        """Give me the PNG text keywords."""
+        out: Dict[str, str] = {"Software": self.SOFTWARE}
+        if self.description:
+            out["Description"] = self.description
+        if self.__cmdr:
+            out["Author"] = self.__cmdr
+        if self.__date is not None:
+            out["Creation Time"] = self.__timestamp
+        if self.__system:
+            out["System"] = self.__system
+        if self.__body:
+            out["Body"] = self.__body
+        return out
+
+    def png_chunks(self) -> List[Tuple[bytes, bytes]]:
+        """Give me tEXt/iTXt chunks (type, data) for the PNG stream."""
+        chunks: List[Tuple[bytes, bytes]] = []
+        for key, value in self.text().items():
+            try:
+                chunks.append(
+                    (b"tEXt", key.encode("latin-1") + b"\0" + value.encode("latin-1"))
+                )
+            except UnicodeEncodeError:
+                chunks.append((b"iTXt", self.__itxt(key, value.encode("utf-8"))))
+        chunks.append((b"iTXt", self.__itxt("XML:com.adobe.xmp", self.xmp())))
+        return chunks
+
+    def pil_params(self, suffix: str) -> Dict[str, Any]:
+        """Give me Pillow save parameters for the output suffix."""
+        suffix = suffix.lower()
+        if suffix == "png":
+            info = PngInfo()
+            for key, value in self.text().items():
+                try:
+                    value.encode("latin-1")
+                    info.add_text(key, value)
+                except UnicodeEncodeError:
+                    info.add_itxt(key, value)
+            info.add_itxt("XML:com.adobe.xmp", self.xmp().decode("utf-8"))
+            return {"pnginfo": info}
+        if suffix in ("tif", "tiff"):
+            # the TIFF encoder takes the XMP packet as a tag only
+            exif: Image.Exif = self.exif()
+            exif[self.__XMP] = self.xmp()
+            return {"exif": exif.tobytes()}
+        if suffix in ("jpg", "jpeg"):
+            # the xmp parameter of the JPEG encoder needs Pillow 11,
+            # the segment is passed as the extra markers instead
+            return {"exif": self.exif().tobytes(), "extra": self.jpeg_app1()}
+        if suffix in ("webp", "avif"):
+            return {"exif": self.exif().tobytes(), "xmp": self.xmp()}
+        return {}
+
+    def jpeg_app1(self) -> bytes:
+        """Give me the JPEG APP1 segment with the XMP packet."""
+        data: bytes = self.XMP_SIGNATURE + self.xmp()
+        if len(data) + 2 > 0xFFFF:
+            # does not fit in a single marker segment
+            return b""
+        return b"\xff\xe1" + (len(data) + 2).to_bytes(2, "big") + data
+
+    def tiff_tags(self) -> List[Tuple[int, int, bytes]]:
+        """Give me TIFF tags (tag, type, value bytes) for the TIFF stream.
+
+        Types: 2 - ASCII, 1 - BYTE.
+        """
+        tags: List[Tuple[int, int, bytes]] = []
+        if self.description:
+            tags.append((270, 2, self.__ascii(self.description)))
+        tags.append((305, 2, self.__ascii(self.SOFTWARE)))
+        if self.exif_date:
+            tags.append((306, 2, self.__ascii(self.exif_date)))
+        if self.__cmdr:
+            tags.append((315, 2, self.__ascii(self.__cmdr)))
+        tags.append((self.__XMP, 1, self.xmp()))
+        return tags
+
+    @staticmethod
+    def __ascii(value: str) -> bytes:
+        """Give me NUL terminated TIFF ASCII value."""
+        return value.encode("ascii", "replace") + b"\0"
+
+    @staticmethod
+    def __itxt(key: str, value: bytes) -> bytes:
+        """Give me uncompressed iTXt chunk data."""
+        return key.encode("latin-1") + b"\0\0\0\0\0" + value
+
+
+# #[EOF]#######################################################################
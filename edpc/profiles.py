@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+  profiles.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 11:40:05
+
+  Purpose: Encoder profiles for the picture converter.
+"""
+
+from inspect import currentframe
+from typing import Any, Dict, List, Tuple
+
+from PIL import Image
+
+try:
+    # AVIF support for Pillow versions without native plugin
+    import pillow_avif  # type: ignore
+except ModuleNotFoundError:
+    pass
+
+from edpc.jsktoolbox.attribtool import ReadOnlyClass
+from edpc.jsktoolbox.basetool.classes import BClasses
+from edpc.jsktoolbox.raisetool import Raise
+
+
+class ProfileKeys(object, metaclass=ReadOnlyClass):
+    """Keys for encoder profiles."""
+
+    FAST: str = "fast"
+    BALANCED: str = "balanced"
+    SMALL: str = "small"
+
+
+class EncoderProfiles(BClasses):
+    """EncoderProfiles class.
+
+    Container for speed-vs-size presets of the supported output formats.
+    Every preset is a tuple of Pillow save parameters and the compression
+    level used by the streaming writers.
+    """
+
+    __profiles: Dict[str, Dict[str, Tuple[Dict[str, Any], int]]] = {
+        "jpg": {
+            ProfileKeys.FAST: (
+                {"quality": 90, "optimize": False, "subsampling": 2},
+                0,
+            ),
+            ProfileKeys.BALANCED: (
+                {"quality": 92, "optimize": True, "subsampling": 2},
+                0,
+            ),
+            ProfileKeys.SMALL: (
+                {
+                    "quality": 85,
+                    "optimize": True,
+                    "progressive": True,
+                    "subsampling": 2,
+                },
+                0,
+            ),
+        },
+        "png": {
+            ProfileKeys.FAST: ({"compress_level": 1}, 1),
+            ProfileKeys.BALANCED: ({"compress_level": 6}, 6),
+            ProfileKeys.SMALL: ({"compress_level": 9, "optimize": True}, 9),
+        },
+        "tif": {
+            ProfileKeys.FAST: ({"compression": None}, 0),
+            ProfileKeys.BALANCED: ({"compression": "tiff_lzw"}, 1),
+            ProfileKeys.SMALL: ({"compression": "tiff_adobe_deflate"}, 9),
+        },
+        "webp": {
+            ProfileKeys.FAST: ({"quality": 80, "method": 0}, 0),
+            ProfileKeys.BALANCED: ({"quality": 80, "method": 4}, 0),
+            ProfileKeys.SMALL: ({"quality": 75, "method": 6}, 0),
+        },
+        "avif": {
+            ProfileKeys.FAST: ({"quality": 70, "speed": 10}, 0),
+            ProfileKeys.BALANCED: ({"quality": 70, "speed": 6}, 0),
+            ProfileKeys.SMALL: ({"quality": 60, "speed": 2}, 0),
+        },
+    }
+
+    @property
+    def names(self) -> List[str]:
+        """Give me the list of profile names."""
+        return [ProfileKeys.FAST, ProfileKeys.BALANCED, ProfileKeys.SMALL]
+
+    @property
+    def formats(self) -> List[str]:
+        """Give me the list of output formats supported by Pillow."""
+        Image.init()
+        extensions: Dict[str, str] = Image.registered_extensions()
+        return [
+            suffix
+            for suffix in self.__profiles
+            if f".{suffix}" in extensions and extensions[f".{suffix}"] in Image.SAVE
+        ]
+
+    def __get(self, suffix: str, profile: str) -> Tuple[Dict[str, Any], int]:
+        """Give me the preset for the suffix and profile."""
+        suffix = suffix.lower()
+        if suffix in ("jpeg", "jpe"):
+            suffix = "jpg"
+        elif suffix == "tiff":
+            suffix = "tif"
+        if suffix not in self.__profiles:
+            raise Raise.error(
+                f"Unsupported output type: {suffix}",
+                KeyError,
+                self._c_name,
+                currentframe(),
+            )
+        if profile not in self.__profiles[suffix]:
+            profile = ProfileKeys.BALANCED
+        return self.__profiles[suffix][profile]
+
+    def params(self, suffix: str, profile: str) -> Dict[str, Any]:
+        """Give me Pillow save parameters for the suffix and profile."""
+        return dict(self.__get(suffix, profile)[0])
+
+    def compress_level(self, suffix: str, profile: str) -> int:
+        """Give me the compression level for the streaming writers."""
+        return self.__get(suffix, profile)[1]
+
+
+# #[EOF]#######################################################################
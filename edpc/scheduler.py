@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+  scheduler.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 16:48:03
+
+  Purpose: Scheduling of the deferred conversion jobs.
+"""
+
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from threading import Lock
+from _thread import LockType
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from edpc.jsktoolbox.basetool.classes import BClasses
+
+
+class DeferredScheduler(BClasses):
+    """DeferredScheduler class.
+
+    Holds the conversion jobs postponed while the game is active.
+    A job becomes due when the game was idle (no journal events)
+    for the delay period, but not later than MAX_WAIT after it was queued.
+    """
+
+    # maximum time in seconds the job can wait for idle game
+    MAX_WAIT: float = 1800.0
+
+    __lock: LockType = None  # type: ignore
+    __heap: List[Tuple[float, int, Dict[str, Any]]] = None  # type: ignore
+    __seq: Iterator[int] = None  # type: ignore
+    __delay: float = 0.0
+    __activity: float = 0.0
+
+    def __init__(self, delay: float = 0.0) -> None:
+        """Initialize DeferredScheduler class.
+
+        delay: idle period in seconds, 0 - deferring disabled.
+        """
+        self.__lock = Lock()
+        self.__heap = []
+        self.__seq = itertools.count()
+        self.__delay = delay
+        self.__activity = time.monotonic()
+
+    @property
+    def delay(self) -> float:
+        """Give me the idle period in seconds."""
+        return self.__delay
+
+    @delay.setter
+    def delay(self, value: float) -> None:
+        self.__delay = max(0.0, float(value))
+
+    @property
+    def enabled(self) -> bool:
+        """Give me True if the conversions are deferred."""
+        return self.__delay > 0
+
+    @property
+    def pending(self) -> List[Dict[str, Any]]:
+        """Give me the deferred jobs with seconds left to their due time.
+
+        Every element is a dict with 'item' and 'due' keys.
+        """
+        with self.__lock:
+            now: float = time.monotonic()
+            return [
+                {"item": dict(item), "due": max(0.0, self.__due(queued) - now)}
+                for queued, _, item in sorted(self.__heap)
+            ]
+
+    def __len__(self) -> int:
+        return len(self.__heap)
+
+    def touch(self) -> None:
+        """Record the game activity, postpones the deferred jobs."""
+        self.__activity = time.monotonic()
+
+    def push(self, item: Dict[str, Any]) -> None:
+        """Defer the job."""
+        with self.__lock:
+            heapq.heappush(self.__heap, (time.monotonic(), next(self.__seq), item))
+
+    def due(self) -> List[Dict[str, Any]]:
+        """Give me the jobs ready to run and remove them from the scheduler."""
+        out: List[Dict[str, Any]] = []
+        with self.__lock:
+            now: float = time.monotonic()
+            while self.__heap and self.__due(self.__heap[0][0]) <= now:
+                out.append(heapq.heappop(self.__heap)[2])
+        return out
+
+    def wait(self) -> Optional[float]:
+        """Give me seconds to the nearest due time, None if nothing waits."""
+        with self.__lock:
+            if not self.__heap:
+                return None
+            return max(0.0, self.__due(self.__heap[0][0]) - time.monotonic())
+
+    def __due(self, queued: float) -> float:
+        """Give me the due time of the job queued at the given time."""
+        return min(max(queued, self.__activity) + self.__delay, queued + self.MAX_WAIT)
+
+
+class ThreadPriority(BClasses):
+    """ThreadPriority class.
+
+    Lowers the CPU and I/O priority of the calling thread.
+    """
+
+    # Windows THREAD_MODE_BACKGROUND_BEGIN
+    __WIN_BACKGROUND: int = 0x00010000
+    # niceness of the background threads
+    NICE: int = 10
+
+    @classmethod
+    def lower(cls) -> bool:
+        """Lower priority of the current thread, True on success."""
+        try:
+            if sys.platform == "win32":
+                import ctypes
+
+                kernel32 = ctypes.windll.kernel32  # type: ignore
+                return bool(
+                    kernel32.SetThreadPriority(
+                        kernel32.GetCurrentThread(), cls.__WIN_BACKGROUND
+                    )
+                )
+            if sys.platform.startswith("linux"):
+                # on Linux the nice value is per thread and the I/O priority
+                # of the default I/O class follows it
+                os.setpriority(
+                    os.PRIO_PROCESS,
+                    threading.get_native_id(),
+                    min(19, os.getpriority(os.PRIO_PROCESS, 0) + cls.NICE),
+                )
+                return True
+        except Exception:
+            pass
+        return False
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+"""
+  streams.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 09:12:40
+
+  Purpose: Streaming BMP conversion with bounded memory usage.
+"""
+
+import os
+import struct
+import zlib
+from inspect import currentframe
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple
+
+from edpc.jsktoolbox.basetool.classes import BClasses
+from edpc.jsktoolbox.raisetool import Raise
+
+
+class BmpReader(BClasses):
+    """BmpReader class.
+
+    Reads uncompressed 24/32-bit BMP files in strips of rows,
+    from the top to the bottom of the image, as RGB bytes.
+    """
+
+    __file: Optional[BinaryIO] = None
+    __width: int = 0
+    __height: int = 0
+    __bpp: int = 0
+    __stride: int = 0
+    __offset: int = 0
+    __top_down: bool = False
+
+    def __init__(self, path: str) -> None:
+        """Open BMP file and parse its headers."""
+        self.__file = open(path, "rb")
+        try:
+            self.__parse()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> "BmpReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __parse(self) -> None:
+        """Parse BITMAPFILEHEADER and BITMAPINFOHEADER."""
+        head: bytes = self.__file.read(54)  # type: ignore
+        if len(head) < 54 or head[:2] != b"BM":
+            raise Raise.error(
+                "BMP signature not found.", ValueError, self._c_name, currentframe()
+            )
+        self.__offset = struct.unpack_from("<I", head, 10)[0]
+        dib_size: int = struct.unpack_from("<I", head, 14)[0]
+        width, height, _, bpp, compression = struct.unpack_from("<iiHHI", head, 18)
+        if dib_size < 40 or width <= 0 or height == 0:
+            raise Raise.error(
+                f"Unsupported BMP header, size: {dib_size}.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        if not (
+            (bpp == 24 and compression == 0)
+            or (bpp == 32 and compression == 0)
+            or (bpp == 32 and compression == 3 and self.__bgrx_masks())
+        ):
+            raise Raise.error(
+                f"Unsupported BMP format, bpp: {bpp}, compression: {compression}.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        self.__width = width
+        self.__height = abs(height)
+        self.__top_down = height < 0
+        self.__bpp = bpp
+        self.__stride = ((bpp * width + 31) // 32) * 4
+
+    def __bgrx_masks(self) -> bool:
+        """Check that BI_BITFIELDS masks describe the BGRX layout."""
+        self.__file.seek(54)  # type: ignore
+        masks: bytes = self.__file.read(12)  # type: ignore
+        if len(masks) < 12:
+            return False
+        return struct.unpack("<III", masks) == (0x00FF0000, 0x0000FF00, 0x000000FF)
+
+    @property
+    def width(self) -> int:
+        """Give me image width."""
+        return self.__width
+
+    @property
+    def height(self) -> int:
+        """Give me image height."""
+        return self.__height
+
+    def strips(self, rows: int) -> Iterator[Tuple[int, bytes]]:
+        """Give me strips of the image.
+
+        Yields tuples (number of rows, RGB bytes), top to bottom.
+        """
+        rows = max(1, rows)
+        step: int = self.__bpp // 8
+        line: int = self.__width * step
+        top: int = 0
+        while top < self.__height:
+            count: int = min(rows, self.__height - top)
+            # file row index of the first row of the strip
+            first: int = top if self.__top_down else self.__height - top - count
+            self.__file.seek(self.__offset + first * self.__stride)  # type: ignore
+            raw: bytes = self.__file.read(count * self.__stride)  # type: ignore
+            if len(raw) < count * self.__stride:
+                raise Raise.error(
+                    "Unexpected end of BMP file.",
+                    EOFError,
+                    self._c_name,
+                    currentframe(),
+                )
+            if self.__stride == line and self.__top_down:
+                bgr: bytes = raw
+            else:
+                order = range(count) if self.__top_down else range(count - 1, -1, -1)
+                bgr = b"".join(
+                    raw[i * self.__stride : i * self.__stride + line] for i in order
+                )
+            rgb = bytearray(count * self.__width * 3)
+            rgb[0::3] = bgr[2::step]
+            rgb[1::3] = bgr[1::step]
+            rgb[2::3] = bgr[0::step]
+            yield count, bytes(rgb)
+            top += count
+
+    def close(self) -> None:
+        """Close BMP file."""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+class PngWriter(BClasses):
+    """PngWriter class.
+
+    Encodes RGB rows to PNG file incrementally.
+    The rows are written with the Up filter, it needs the previous row only.
+    """
+
+    __file: Optional[BinaryIO] = None
+    __zip: Optional["zlib._Compress"] = None
+    __width: int = 0
+    __buffer: bytearray = None  # type: ignore
+    __prior: bytes = b""
+    __masks: Tuple[int, int, int] = (0, 0, 0)
+
+    # size of the IDAT chunks
+    CHUNK: int = 256 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        width: int,
+        height: int,
+        compress_level: int = 6,
+        chunks: Optional[List[Tuple[bytes, bytes]]] = None,
+    ) -> None:
+        """Create PNG file and write its header.
+
+        chunks: ancillary chunks (type, data) written before the image data.
+        """
+        self.__file = open(path, "wb")
+        self.__width = width
+        self.__buffer = bytearray()
+        # the row above the first one is zero
+        self.__prior = bytes(width * 3)
+        self.__zip = zlib.compressobj(compress_level)
+        self.__file.write(b"\x89PNG\r\n\x1a\n")
+        self.__chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        for tag, data in chunks or []:
+            self.__chunk(tag, data)
+
+    def __chunk(self, tag: bytes, data: bytes) -> None:
+        """Write single PNG chunk."""
+        self.__file.write(struct.pack(">I", len(data)))  # type: ignore
+        self.__file.write(tag)  # type: ignore
+        self.__file.write(data)  # type: ignore
+        self.__file.write(  # type: ignore
+            struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)) & 0xFFFFFFFF)
+        )
+
+    def __up(self, size: int, rgb: bytes) -> bytes:
+        """Give me the Up filtered rows: bytes minus the bytes of the row above.
+
+        The bytes are subtracted modulo 256 all at once, as lanes
+        of the big integers.
+        """
+        line: int = self.__width * 3
+        if self.__masks[0] != size:
+            # masks of the high bits and the low 7 bits of the lanes
+            self.__masks = (
+                size,
+                int.from_bytes(b"\x80" * size, "big"),
+                int.from_bytes(b"\x7f" * size, "big"),
+            )
+        _, high, low = self.__masks
+        cur: int = int.from_bytes(rgb, "big")
+        prior: int = int.from_bytes(self.__prior + rgb[: size - line], "big")
+        self.__prior = rgb[size - line : size]
+        out: int = ((cur | high) - (prior & low)) ^ ((cur ^ prior ^ high) & high)
+        return out.to_bytes(size, "big")
+
+    def write(self, rows: int, rgb: bytes) -> None:
+        """Write strip of RGB rows."""
+        line: int = self.__width * 3
+        filtered: bytes = self.__up(rows * line, rgb)
+        # filter type 2 (Up) for every scanline
+        data: bytes = b"".join(
+            b"\x02" + filtered[i * line : (i + 1) * line] for i in range(rows)
+        )
+        self.__buffer += self.__zip.compress(data)  # type: ignore
+        while len(self.__buffer) >= self.CHUNK:
+            self.__chunk(b"IDAT", bytes(self.__buffer[: self.CHUNK]))
+            del self.__buffer[: self.CHUNK]
+
+    def close(self) -> None:
+        """Finish PNG stream and close the file."""
+        if self.__file is None:
+            return
+        self.__buffer += self.__zip.flush()  # type: ignore
+        if self.__buffer:
+            self.__chunk(b"IDAT", bytes(self.__buffer))
+        self.__chunk(b"IEND", b"")
+        self.__file.close()
+        self.__file = None
+
+    def abort(self) -> None:
+        """Close the file without finishing the stream."""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+class TiffWriter(BClasses):
+    """TiffWriter class.
+
+    Writes RGB rows to TIFF file as strips, optionally deflate compressed.
+    """
+
+    __file: Optional[BinaryIO] = None
+    __width: int = 0
+    __height: int = 0
+    __rows: int = 0
+    __level: int = 0
+    __offsets: List[int] = None  # type: ignore
+    __counts: List[int] = None  # type: ignore
+    __tags: List[Tuple[int, int, bytes]] = None  # type: ignore
+
+    def __init__(
+        self,
+        path: str,
+        width: int,
+        height: int,
+        rows: int,
+        compress_level: int = 0,
+        tags: Optional[List[Tuple[int, int, bytes]]] = None,
+    ) -> None:
+        """Create TIFF file and write its header.
+
+        rows: number of rows in every strip except the last one,
+        compress_level: 0 - no compression, 1-9 - Adobe Deflate level,
+        tags: additional tags (tag, type, value bytes), e.g. ImageDescription.
+        """
+        self.__tags = list(tags or [])
+        self.__file = open(path, "wb")
+        self.__width = width
+        self.__height = height
+        self.__rows = rows
+        self.__level = compress_level
+        self.__offsets = []
+        self.__counts = []
+        # little-endian header, IFD offset is written on close
+        self.__file.write(b"II*\x00\x00\x00\x00\x00")
+
+    def write(self, rows: int, rgb: bytes) -> None:
+        """Write strip of RGB rows."""
+        if self.__level > 0:
+            rgb = zlib.compress(rgb, self.__level)
+        self.__offsets.append(self.__file.tell())  # type: ignore
+        self.__counts.append(len(rgb))
+        self.__file.write(rgb)  # type: ignore
+
+    def close(self) -> None:
+        """Write IFD and close the file."""
+        if self.__file is None:
+            return
+        if self.__file.tell() % 2:
+            self.__file.write(b"\x00")
+        count: int = len(self.__offsets)
+        # out of line values: BitsPerSample, X/YResolution, strips
+        extra: int = self.__file.tell()
+        bps_at: int = extra
+        res_at: int = bps_at + 8
+        off_at: int = res_at + 8
+        cnt_at: int = off_at + 4 * count
+        data: bytes = (
+            struct.pack("<HHHH", 8, 8, 8, 0)
+            + struct.pack("<II", 72, 1)
+            + struct.pack(f"<{count}I", *self.__offsets)
+            + struct.pack(f"<{count}I", *self.__counts)
+        )
+        self.__file.write(data)
+        # additional tags, values longer than 4 bytes out of line
+        extra_entries: List[Tuple[int, int, int, int]] = []
+        for tag, typ, value in self.__tags:
+            if len(value) <= 4:
+                extra_entries.append(
+                    (
+                        tag,
+                        typ,
+                        len(value),
+                        struct.unpack("<I", value.ljust(4, b"\0"))[0],
+                    )
+                )
+                continue
+            if self.__file.tell() % 2:
+                self.__file.write(b"\x00")
+            extra_entries.append((tag, typ, len(value), self.__file.tell()))
+            self.__file.write(value)
+        if self.__file.tell() % 2:
+            self.__file.write(b"\x00")
+        ifd_at: int = self.__file.tell()
+        entries: List[Tuple[int, int, int, int]] = [
+            (256, 4, 1, self.__width),
+            (257, 4, 1, self.__height),
+            (258, 3, 3, bps_at),
+            (259, 3, 1, 8 if self.__level > 0 else 1),
+            (262, 3, 1, 2),
+            (273, 4, count, off_at if count > 1 else self.__offsets[0]),
+            (277, 3, 1, 3),
+            (278, 4, 1, self.__rows),
+            (279, 4, count, cnt_at if count > 1 else self.__counts[0]),
+            (282, 5, 1, res_at),
+            (283, 5, 1, res_at),
+            (284, 3, 1, 1),
+            (296, 3, 1, 2),
+        ]
+        entries = sorted(entries + extra_entries)
+        ifd: bytes = struct.pack("<H", len(entries))
+        for tag, typ, num, value in entries:
+            ifd += struct.pack("<HHII", tag, typ, num, value)
+        ifd += struct.pack("<I", 0)
+        self.__file.write(ifd)
+        self.__file.seek(4)
+        self.__file.write(struct.pack("<I", ifd_at))
+        self.__file.close()
+        self.__file = None
+
+    def abort(self) -> None:
+        """Close the file without writing IFD."""
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
+class StreamConverter(BClasses):
+    """StreamConverter class.
+
+    Converts BMP to PNG or TIFF strip by strip, so the peak memory usage
+    depends on the strip size, not on the size of the screenshot.
+    """
+
+    # supported output suffixes
+    SUFFIXES: Tuple[str, ...] = ("png", "tif", "tiff")
+    # approximate size of the single strip in bytes
+    STRIP_SIZE: int = 1024 * 1024
+
+    def convert(
+        self,
+        src: str,
+        dst: str,
+        suffix: str,
+        compress_level: int,
+        pyramid: Optional[Any] = None,
+        metadata: Optional[Any] = None,
+    ) -> None:
+        """Convert src BMP file to dst file.
+
+        pyramid: optional consumer of the strips with start(width, height)
+        and feed(rows, rgb) methods, e.g. thumbs.Pyramid,
+        metadata: optional source of png_chunks() and tiff_tags(),
+        e.g. metadata.Metadata.
+
+        Raises ValueError for unsupported BMP formats and output suffixes,
+        the partially written dst file is removed on error.
+        """
+        if suffix.lower() not in self.SUFFIXES:
+            raise Raise.error(
+                f"Unsupported output type: {suffix}",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        with BmpReader(src) as reader:
+            rows: int = max(1, self.STRIP_SIZE // (reader.width * 3))
+            if suffix.lower() == "png":
+                writer = PngWriter(
+                    dst,
+                    reader.width,
+                    reader.height,
+                    compress_level,
+                    metadata.png_chunks() if metadata is not None else None,
+                )
+            else:
+                writer = TiffWriter(
+                    dst,
+                    reader.width,
+                    reader.height,
+                    rows,
+                    compress_level,
+                    metadata.tiff_tags() if metadata is not None else None,
+                )
+            try:
+                if pyramid is not None:
+                    pyramid.start(reader.width, reader.height)
+                for count, rgb in reader.strips(rows):
+                    writer.write(count, rgb)
+                    if pyramid is not None:
+                        pyramid.feed(count, rgb)
+                writer.close()
+            except Exception:
+                writer.abort()
+                if os.path.exists(dst):
+                    os.remove(dst)
+                raise
+
+    @staticmethod
+    def pixels(src: str) -> int:
+        """Give me number of pixels of BMP file, 0 if not supported."""
+        try:
+            with BmpReader(src) as reader:
+                return reader.width * reader.height
+        except Exception:
+            return 0
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+  thumbs.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 20:14:37
+
+  Purpose: Downscaled renditions of the converted screenshots.
+"""
+
+import os
+from typing import List, Optional, Tuple, Union
+
+from PIL import Image
+
+from edpc.jsktoolbox.basetool.classes import BClasses
+
+
+class Pyramid(BClasses):
+    """Pyramid class.
+
+    Writes downscaled JPEG renditions of the screenshot to the 'thumbs'
+    subdirectory next to the converted file: <name>_<size>.jpg, where size
+    is the length of the longer edge. The renditions are made from the
+    already decoded image, every next one from the previous, larger one.
+
+    For the streaming conversion the strips are box-reduced when fed,
+    so only the reduced image is kept in memory.
+    """
+
+    # name of the renditions subdirectory
+    DIR: str = "thumbs"
+    # JPEG quality of the renditions
+    QUALITY: int = 85
+
+    __dst: str = None  # type: ignore
+    __sizes: List[int] = None  # type: ignore
+    __paths: List[str] = None  # type: ignore
+    __width: int = 0
+    __factor: int = 1
+    __canvas: Optional[Image.Image] = None
+    __top: int = 0
+    __rest: bytes = b""
+
+    def __init__(self, dst: str, sizes: List[int]) -> None:
+        """Initialize Pyramid class.
+
+        dst: path of the converted screenshot,
+        sizes: lengths of the longer edge of the renditions.
+        """
+        self.__dst = dst
+        self.__sizes = sorted(set(sizes), reverse=True)
+        self.__paths = []
+
+    @staticmethod
+    def parse(arg: Union[str, List[int]]) -> List[int]:
+        """Give me the list of sizes from '256,1024' like string."""
+        if isinstance(arg, str):
+            out: List[int] = []
+            for item in arg.replace(";", ",").split(","):
+                item = item.strip()
+                if item.isdigit() and int(item) >= 16:
+                    out.append(int(item))
+            return sorted(set(out))
+        return sorted({int(size) for size in arg if int(size) >= 16})
+
+    @property
+    def paths(self) -> List[str]:
+        """Give me the paths of the written renditions."""
+        return list(self.__paths)
+
+    def from_image(self, img: Image.Image) -> List[str]:
+        """Write the renditions of the decoded image."""
+        current: Image.Image = img
+        for size in self.__sizes:
+            target: Optional[Tuple[int, int]] = self.__fit(current.size, size)
+            if target is None:
+                continue
+            current = current.resize(target, Image.Resampling.LANCZOS, reducing_gap=2.0)
+            self.__save(current, size)
+        return self.paths
+
+    def start(self, width: int, height: int) -> None:
+        """Prepare the reduction of the streamed image."""
+        self.__width = width
+        self.__top = 0
+        self.__rest = b""
+        largest: int = self.__sizes[0] if self.__sizes else max(width, height)
+        # box reduce to the size not smaller than the largest rendition
+        self.__factor = max(1, max(width, height) // largest)
+        f: int = self.__factor
+        self.__canvas = Image.new("RGB", ((width + f - 1) // f, (height + f - 1) // f))
+
+    def feed(self, rows: int, rgb: bytes) -> None:
+        """Reduce the strip of RGB rows."""
+        if self.__canvas is None:
+            return
+        line: int = self.__width * 3
+        data: bytes = self.__rest + rgb if self.__rest else rgb
+        count: int = len(data) // line
+        # only full blocks of rows, the rest waits for the next strip
+        usable: int = count - count % self.__factor
+        self.__rest = data[usable * line :]
+        if usable:
+            self.__paste(data[: usable * line], usable)
+
+    def finish(self) -> List[str]:
+        """Write the renditions of the streamed image."""
+        if self.__canvas is None:
+            return self.paths
+        if self.__rest:
+            self.__paste(self.__rest, len(self.__rest) // (self.__width * 3))
+            self.__rest = b""
+        canvas: Image.Image = self.__canvas
+        self.__canvas = None
+        return self.from_image(canvas)
+
+    def __paste(self, data: bytes, rows: int) -> None:
+        """Reduce rows and paste them into the canvas."""
+        strip: Image.Image = Image.frombytes("RGB", (self.__width, rows), data)
+        if self.__factor > 1:
+            strip = strip.reduce(self.__factor)
+        self.__canvas.paste(strip, (0, self.__top))  # type: ignore
+        self.__top += strip.size[1]
+
+    def __fit(self, size: Tuple[int, int], edge: int) -> Optional[Tuple[int, int]]:
+        """Give me the size with the longer edge equal to edge.
+
+        None if the image is not larger than that.
+        """
+        width, height = size
+        if max(width, height) <= edge:
+            return None
+        if width >= height:
+            return edge, max(1, round(height * edge / width))
+        return max(1, round(width * edge / height)), edge
+
+    def __save(self, img: Image.Image, size: int) -> None:
+        """Write single rendition."""
+        directory: str = os.path.join(os.path.dirname(self.__dst), self.DIR)
+        os.makedirs(directory, exist_ok=True)
+        stem: str = os.path.splitext(os.path.basename(self.__dst))[0]
+        path: str = os.path.join(directory, f"{stem}_{size}.jpg")
+        img.save(path, quality=self.QUALITY)
+        self.__paths.append(path)
+
+
+# #[EOF]#######################################################################
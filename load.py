@@ -5,7 +5,6 @@ Created on 18 dec 2022.
 @author: szumak@virthost.pl
 """
 
-import time
 import tkinter as tk
 from typing import Any, Dict, Optional, Tuple
 
@@ -56,6 +55,27 @@ def plugin_start3(plugin_dir: str) -> str:
     edpc_object.config_dialog.pic_type = tk.StringVar(
         value=config.get_str(key=EDPCKeys.CONF_PIC_TYPE, default="jpg")
     )
+    edpc_object.config_dialog.pic_profile = tk.StringVar(
+        value=config.get_str(key=EDPCKeys.CONF_PIC_PROFILE, default="balanced")
+    )
+    edpc_object.config_dialog.pic_workers = tk.IntVar(
+        value=config.get_int(key=EDPCKeys.CONF_PIC_WORKERS, default=EDPC.POOL_SIZE)
+    )
+    edpc_object.config_dialog.pic_defer = tk.IntVar(
+        value=config.get_int(key=EDPCKeys.CONF_PIC_DEFER, default=0)
+    )
+    edpc_object.config_dialog.pic_low_prio = tk.IntVar(
+        value=config.get_int(key=EDPCKeys.CONF_PIC_LOW_PRIO, default=0)
+    )
+    edpc_object.config_dialog.pic_dedup = tk.StringVar(
+        value=config.get_str(key=EDPCKeys.CONF_PIC_DEDUP, default="off")
+    )
+    edpc_object.config_dialog.pic_thumbs = tk.StringVar(
+        value=config.get_str(key=EDPCKeys.CONF_PIC_THUMBS, default="")
+    )
+    edpc_object.config_dialog.pic_metadata = tk.IntVar(
+        value=config.get_int(key=EDPCKeys.CONF_PIC_METADATA, default=1)
+    )
 
     # init engine
     pic_src_dir: Optional[tk.StringVar] = edpc_object.config_dialog.pic_src_dir
@@ -73,6 +93,36 @@ def plugin_start3(plugin_dir: str) -> str:
     pic_type: Optional[tk.StringVar] = edpc_object.config_dialog.pic_type
     if pic_type:
         edpc_object.engine.suffix = pic_type.get()
+    pic_profile: Optional[tk.StringVar] = edpc_object.config_dialog.pic_profile
+    if pic_profile:
+        edpc_object.engine.profile = pic_profile.get()
+    pic_workers: Optional[tk.IntVar] = edpc_object.config_dialog.pic_workers
+    if pic_workers:
+        edpc_object.pool_size = pic_workers.get()
+    pic_defer: Optional[tk.IntVar] = edpc_object.config_dialog.pic_defer
+    if pic_defer is not None:
+        edpc_object.defer_delay = pic_defer.get()
+    pic_low_prio: Optional[tk.IntVar] = edpc_object.config_dialog.pic_low_prio
+    if pic_low_prio is not None:
+        edpc_object.low_priority = pic_low_prio.get()
+    pic_dedup: Optional[tk.StringVar] = edpc_object.config_dialog.pic_dedup
+    if pic_dedup:
+        edpc_object.engine.dedup = pic_dedup.get()
+    pic_thumbs: Optional[tk.StringVar] = edpc_object.config_dialog.pic_thumbs
+    if pic_thumbs is not None:
+        edpc_object.engine.thumbnails = pic_thumbs.get()
+    pic_metadata: Optional[tk.IntVar] = edpc_object.config_dialog.pic_metadata
+    if pic_metadata is not None:
+        edpc_object.engine.metadata = pic_metadata.get()
+
+    # backlog
+    edpc_object.plugin_dir = plugin_dir
+    edpc_object.journal_dir = config.get_str("journaldir") or config.default_journal_dir
+
+    # unfinished jobs from the previous session
+    edpc_object.open_job_store()
+    # index of the saved screenshots
+    edpc_object.open_dedup_index()
 
     # threading
     edpc_object.th_worker_engine.start()
@@ -86,9 +136,7 @@ def plugin_stop() -> None:
     edpc_object.logger.info = (
         f"Stopping plugin {edpc_object.config_dialog.plugin_name}..."
     )
-    edpc_object.shutting_down = True
-    edpc_object.qth.put(None)
-    time.sleep(3)
+    edpc_object.stop()
     edpc_object.logger.info = "Done."
     edpc_object.qlog.put(None)
 
@@ -136,6 +184,13 @@ def prefs_changed(cmdr: str, is_beta: bool) -> None:
     pic_move: Optional[tk.IntVar] = edpc_object.config_dialog.pic_move
     pic_convert: Optional[tk.IntVar] = edpc_object.config_dialog.pic_convert
     pic_type: Optional[tk.StringVar] = edpc_object.config_dialog.pic_type
+    pic_profile: Optional[tk.StringVar] = edpc_object.config_dialog.pic_profile
+    pic_workers: Optional[tk.IntVar] = edpc_object.config_dialog.pic_workers
+    pic_defer: Optional[tk.IntVar] = edpc_object.config_dialog.pic_defer
+    pic_low_prio: Optional[tk.IntVar] = edpc_object.config_dialog.pic_low_prio
+    pic_dedup: Optional[tk.StringVar] = edpc_object.config_dialog.pic_dedup
+    pic_thumbs: Optional[tk.StringVar] = edpc_object.config_dialog.pic_thumbs
+    pic_metadata: Optional[tk.IntVar] = edpc_object.config_dialog.pic_metadata
 
     if Directory().is_directory(edpc_object.config_dialog.src_entry.get()):
         edpc_object.config_dialog.pic_src_dir = tk.StringVar(
@@ -156,6 +211,20 @@ def prefs_changed(cmdr: str, is_beta: bool) -> None:
         config.set(EDPCKeys.CONF_PIC_CONVERT, pic_convert.get())
     if pic_type:
         config.set(EDPCKeys.CONF_PIC_TYPE, pic_type.get())
+    if pic_profile:
+        config.set(EDPCKeys.CONF_PIC_PROFILE, pic_profile.get())
+    if pic_workers:
+        config.set(EDPCKeys.CONF_PIC_WORKERS, pic_workers.get())
+    if pic_defer is not None:
+        config.set(EDPCKeys.CONF_PIC_DEFER, pic_defer.get())
+    if pic_low_prio is not None:
+        config.set(EDPCKeys.CONF_PIC_LOW_PRIO, pic_low_prio.get())
+    if pic_dedup:
+        config.set(EDPCKeys.CONF_PIC_DEDUP, pic_dedup.get())
+    if pic_thumbs is not None:
+        config.set(EDPCKeys.CONF_PIC_THUMBS, pic_thumbs.get())
+    if pic_metadata is not None:
+        config.set(EDPCKeys.CONF_PIC_METADATA, pic_metadata.get())
 
     # engine update
     if pic_dst_dir:
@@ -168,6 +237,20 @@ def prefs_changed(cmdr: str, is_beta: bool) -> None:
         edpc_object.engine.convert_type = pic_convert.get()
     if pic_type:
         edpc_object.engine.suffix = pic_type.get()
+    if pic_profile:
+        edpc_object.engine.profile = pic_profile.get()
+    if pic_workers:
+        edpc_object.pool_size = pic_workers.get()
+    if pic_defer is not None:
+        edpc_object.defer_delay = pic_defer.get()
+    if pic_low_prio is not None:
+        edpc_object.low_priority = pic_low_prio.get()
+    if pic_dedup:
+        edpc_object.engine.dedup = pic_dedup.get()
+    if pic_thumbs is not None:
+        edpc_object.engine.thumbnails = pic_thumbs.get()
+    if pic_metadata is not None:
+        edpc_object.engine.metadata = pic_metadata.get()
     edpc_object.logger.info = "update complete"
 
 
@@ -188,6 +271,9 @@ def journal_entry(
     entry:      The journal event
     state:      More info about the commander, their ship, and their cargo
     """
+    # every journal event means the game is active
+    edpc_object.scheduler.touch()
+
     if entry[EDPCKeys.P_EVENT] == EDPCKeys.P_SCREENSHOT:
         edpc_object.logger.info = "Got a new screenshot event."
         edpc_object.logger.debug = f"entry: {entry}"
@@ -209,5 +295,5 @@ def journal_entry(
             event[EDPCKeys.P_BODY] = f"{system}({station})"
 
         edpc_object.logger.info = "Put them in the queue..."
-        edpc_object.qth.put(event)
+        edpc_object.queue_job(event)
         edpc_object.logger.info = "Done."
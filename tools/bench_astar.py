@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+  bench_astar.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 23:58:41
+
+  Purpose: AlgAStar benchmark on synthetic star fields.
+
+  Compares the former A* loop (list open set with min() and remove(),
+  StarsSystem keyed dictionaries) with AlgAStar (binary heap with lazy
+  deletion, integer node ids). Both search the same spatial index from
+  the corner of the field to the system closest to the opposite corner.
+  The former loop is given the goal test it was missing, so both return
+  the same path.
+
+  usage: python tools/bench_astar.py [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import timeit
+from queue import SimpleQueue
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from edpc.jsktoolbox.edmctool.data import RscanData
+from edpc.jsktoolbox.edmctool.math import AlgAStar, Euclid, SpatialIndex
+from edpc.jsktoolbox.edmctool.stars import StarsSystem
+
+# jump range in ly and the mean number of systems within it
+JUMP_RANGE: int = 20
+NEIGHBORS: int = 8
+
+
+def field(size: int, seed: int) -> Tuple[StarsSystem, List[StarsSystem]]:
+    """Return start point and systems, the goal system is the first one."""
+    rnd = random.Random(seed)
+    side: float = (size * 4 / 3 * math.pi * JUMP_RANGE**3 / NEIGHBORS) ** (1 / 3)
+    systems: List[StarsSystem] = [
+        StarsSystem(f"S{i}", i, [rnd.uniform(0, side) for _ in range(3)])
+        for i in range(size)
+    ]
+    corner: List[float] = [side, side, side]
+    goal: StarsSystem = min(systems, key=lambda s: math.dist(s.star_pos, corner))
+    systems.remove(goal)
+    systems.insert(0, goal)
+    return StarsSystem("start", 0, [0.0, 0.0, 0.0]), systems
+
+
+def legacy(
+    start: StarsSystem, systems: List[StarsSystem], index: SpatialIndex
+) -> List[StarsSystem]:
+    """The former AlgAStar.run loop, with the goal test."""
+    goal: StarsSystem = systems[0]
+    open_set: List[StarsSystem] = [start]
+    came_from: Dict = {}
+    g_score: Dict[StarsSystem, float] = {start: 0.0}
+    f_score: Dict[StarsSystem, float] = {
+        start: math.dist(start.star_pos, goal.star_pos)
+    }
+    while open_set:
+        current: StarsSystem = min(
+            open_set, key=lambda point: f_score.get(point, float("inf"))
+        )
+        if current is goal:
+            path: List[StarsSystem] = []
+            while current in came_from:
+                path.append(current)
+                current = came_from[current]
+            path.reverse()
+            return path
+        open_set.remove(current)
+        for neighbor, dist in index.query(current.star_pos, JUMP_RANGE):
+            tentative_g_score: float = g_score[current] + dist
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                f_score[neighbor] = tentative_g_score + math.dist(
+                    neighbor.star_pos, goal.star_pos
+                )
+                if neighbor not in open_set:
+                    open_set.append(neighbor)
+    return []
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="A* benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=10000,
+        help="largest field for the former loop, it is quadratic",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    opts = parser.parse_args()
+
+    queue: SimpleQueue = SimpleQueue()
+    r_data = RscanData()
+    r_data.plugin_name = "bench"
+    euclid = Euclid(queue, r_data)
+
+    for size in opts.sizes:
+        start, systems = field(size, opts.seed)
+        index = SpatialIndex(JUMP_RANGE, systems)
+        alg = AlgAStar(start, systems, JUMP_RANGE, queue, euclid, "bench", index)
+
+        best: float = min(timeit.repeat(alg.run, number=1, repeat=3))
+        print(
+            f"{size:7d} heap   {best * 1e3:10.1f} ms "
+            f"jumps: {len(alg.get_final):4d} {alg.final_distance:9.1f} ly"
+        )
+        if size > opts.legacy_max:
+            print(f"{size:7d} former    skipped, see --legacy-max")
+            continue
+        path: List[StarsSystem] = []
+
+        def former() -> None:
+            nonlocal path
+            path = legacy(start, systems, index)
+
+        best_l: float = min(timeit.repeat(former, number=1, repeat=3))
+        dist: float = sum(
+            math.dist(a.star_pos, b.star_pos) for a, b in zip([start] + path, path)
+        )
+        print(
+            f"{size:7d} former {best_l * 1e3:10.1f} ms "
+            f"jumps: {len(path):4d} {dist:9.1f} ly  x{best_l / best:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
+
+
+# #[EOF]#######################################################################
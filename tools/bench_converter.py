@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+  bench_converter.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 13:05:27
+
+  Purpose: PicConverter benchmark.
+
+  Generates synthetic BMP screenshots in a temporary directory and measures
+  the copy, move and convert paths of PicConverter for every supported
+  output format. Results are printed as JSON:
+  p50/p95 latency, throughput of the source data and peak RSS of the case.
+
+  usage: python tools/bench_converter.py [--sizes 1080p,4k] [--runs 5]
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from queue import SimpleQueue
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RESOLUTIONS: Dict[str, Tuple[int, int]] = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+    "8k": (7680, 4320),
+}
+
+
+def make_bmp(path: str, width: int, height: int) -> None:
+    """Write synthetic 24-bit BMP, row by row.
+
+    The picture is a gradient with a repeating noise pattern, so it is
+    neither trivially compressible nor pure noise.
+    """
+    stride: int = ((24 * width + 31) // 32) * 4
+    noise: bytes = os.urandom(4096)
+    with open(path, "wb") as file:
+        file.write(b"BM")
+        file.write(struct.pack("<IHHI", 54 + stride * height, 0, 0, 54))
+        file.write(
+            struct.pack("<IiiHHIIiiII", 40, width, height, 1, 24, 0, 0, 0, 0, 0, 0)
+        )
+        base: bytes = bytes(range(256)) * (stride // 256 + 2)
+        dots: int = len(range(0, stride, 11))
+        pattern: bytes = noise * (dots // len(noise) + 2)
+        for row in range(height):
+            shift: int = (row * 7) % len(noise)
+            line = bytearray(base[row % 256 : row % 256 + stride])
+            line[0::11] = pattern[shift : shift + dots]
+            file.write(line)
+
+
+def peak_rss() -> Optional[float]:
+    """Give me peak RSS of the current process in MB."""
+    try:
+        import resource
+
+        rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # bytes on macOS, kilobytes elsewhere
+        return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil  # type: ignore
+
+        return psutil.Process().memory_info().peak_wset / 1024 / 1024
+    except Exception:
+        return None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Give me the nearest-rank percentile of the values."""
+    data: List[float] = sorted(values)
+    idx: int = max(0, min(len(data), math.ceil(pct / 100 * len(data))) - 1)
+    return data[idx]
+
+
+def run_case(
+    args: Tuple[str, str, str, str, Optional[str], str, int]
+) -> Dict[str, Any]:
+    """Run single benchmark case in the current process."""
+    case, master, src_dir, dst_dir, suffix, profile, runs = args
+    from edpc.converter import PicConverter
+
+    queue: SimpleQueue = SimpleQueue()
+    engine = PicConverter(queue)
+    engine.src_dir.dir = src_dir
+    engine.dst_dir.dir = dst_dir
+    engine.convert_type = suffix is not None
+    engine.suffix = suffix or "bmp"
+    engine.profile = profile
+    engine.remove = case == "move"
+
+    name: str = "Screenshot_0001.bmp"
+    times: List[float] = []
+    for _ in range(runs):
+        shutil.copyfile(master, os.path.join(src_dir, name))
+        t_start: float = time.perf_counter()
+        done: bool = engine.convert(
+            {"timestamp": "2024-01-01T10:00:00Z", "Filename": name, "Body": "Bench"}
+        )
+        times.append(time.perf_counter() - t_start)
+        if not done:
+            raise RuntimeError(f"conversion failed: {engine.messages}")
+        engine.messages = None
+        while not queue.empty():
+            queue.get()
+        for item in os.listdir(dst_dir):
+            os.remove(os.path.join(dst_dir, item))
+    return {"times": times, "peak_rss_mb": peak_rss()}
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="PicConverter benchmark")
+    parser.add_argument("--sizes", default=",".join(RESOLUTIONS))
+    parser.add_argument("--formats", default="")
+    parser.add_argument("--profile", default="balanced")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", default="")
+    opts = parser.parse_args()
+
+    from PIL import __version__ as pil_version
+    from edpc.profiles import EncoderProfiles
+
+    formats: List[str] = (
+        opts.formats.split(",") if opts.formats else EncoderProfiles().formats
+    )
+    results: List[Dict[str, Any]] = []
+    ctx = multiprocessing.get_context("spawn")
+    tmp: str = tempfile.mkdtemp(prefix="edpc_bench_")
+    try:
+        for size in opts.sizes.split(","):
+            width, height = RESOLUTIONS[size]
+            master: str = os.path.join(tmp, f"{size}.bmp")
+            make_bmp(master, width, height)
+            mbytes: float = os.path.getsize(master) / 1024 / 1024
+            cases: List[Tuple[str, Optional[str]]] = [("copy", None), ("move", None)]
+            cases.extend(("convert", suffix) for suffix in formats)
+            for case, suffix in cases:
+                src_dir: str = tempfile.mkdtemp(dir=tmp)
+                dst_dir: str = tempfile.mkdtemp(dir=tmp)
+                # every case in a fresh process, so the peak RSS is its own
+                with ctx.Pool(1) as pool:
+                    out: Dict[str, Any] = pool.apply(
+                        run_case,
+                        (
+                            (
+                                case,
+                                master,
+                                src_dir,
+                                dst_dir,
+                                suffix,
+                                opts.profile,
+                                opts.runs,
+                            ),
+                        ),
+                    )
+                p50: float = percentile(out["times"], 50)
+                results.append(
+                    {
+                        "resolution": size,
+                        "width": width,
+                        "height": height,
+                        "source_mb": round(mbytes, 2),
+                        "case": case,
+                        "suffix": suffix,
+                        "profile": opts.profile if suffix else None,
+                        "runs": opts.runs,
+                        "p50_ms": round(p50 * 1000, 2),
+                        "p95_ms": round(percentile(out["times"], 95) * 1000, 2),
+                        "mb_s": round(mbytes / p50, 2) if p50 > 0 else None,
+                        "peak_rss_mb": (
+                            round(out["peak_rss_mb"], 2)
+                            if out["peak_rss_mb"] is not None
+                            else None
+                        ),
+                    }
+                )
+                print(json.dumps(results[-1]), file=sys.stderr)
+            os.remove(master)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report: str = json.dumps(
+        {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pillow": pil_version,
+            "results": results,
+        },
+        indent=2,
+    )
+    if opts.output:
+        with open(opts.output, "w") as file:
+            file.write(report)
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+  bench_logfile.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 23:12:08
+
+  Purpose: LoggerEngineFile throughput benchmark.
+
+  Compares opening the log file for every message, as LoggerEngineFile
+  did before, with the engine keeping the file open, unbuffered
+  (flush per message) and buffered (flush in batches).
+
+  usage: python tools/bench_logfile.py [--number 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from edpc.jsktoolbox.logstool.engines import LoggerEngineFile
+from edpc.jsktoolbox.logstool.formatters import LogFormatterDateTime
+
+
+def legacy(path: str, messages: List[str]) -> None:
+    """The former LoggerEngineFile.send, file opened per message."""
+    for message in messages:
+        with open(path, "a") as file:
+            file.write(message)
+            file.write("\n")
+
+
+def engine(path: str, messages: List[str], buffered: bool) -> None:
+    """LoggerEngineFile with the file kept open."""
+    eng = LoggerEngineFile(buffered=buffered)
+    eng.logfile = path
+    for message in messages:
+        eng.send(message)
+    eng.close()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="log file engine benchmark")
+    parser.add_argument("--number", type=int, default=100000)
+    opts = parser.parse_args()
+
+    formatter = LogFormatterDateTime()
+    messages: List[str] = [
+        formatter.format(f"message {i:08d} from the benchmark", "BENCH")
+        for i in range(opts.number)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = (
+            ("open per message", lambda p: legacy(p, messages)),
+            ("kept open", lambda p: engine(p, messages, False)),
+            ("kept open, buffered", lambda p: engine(p, messages, True)),
+        )
+        for idx, (name, func) in enumerate(cases):
+            path: str = os.path.join(tmp, f"case{idx}.log")
+            best: float = min(timeit.repeat(lambda: func(path), number=1, repeat=3))
+            print(
+                f"{name:20s} {best / opts.number * 1e6:8.3f} us/msg "
+                f"{opts.number / best:12.0f} msg/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+  bench_timestamp.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 18.10.2026, 18:32:50
+
+  Purpose: Timestamp conversion micro-benchmark.
+
+  Compares the strptime/strftime based conversion, used by PicConverter
+  before, with GameTime for unique (cache misses) and repeated
+  (cache hits) timestamps.
+
+  usage: python tools/bench_timestamp.py [--number 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import timeit
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from edpc.gametime import GameTime
+
+DELTA: timedelta = datetime(3309, 1, 1, 1, 1, 43) - datetime(2023, 1, 1, 2, 1, 43)
+
+
+def legacy(arg: str) -> str:
+    """The former PicConverter.str_time implementation."""
+    str_time: time.struct_time = time.strptime(arg, "%Y-%m-%dT%H:%M:%SZ")
+    dt_obj = datetime(*str_time[:6])
+    return (dt_obj + DELTA).strftime("%Y%m%d-%H%M%S")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="timestamp conversion benchmark")
+    parser.add_argument("--number", type=int, default=100000)
+    opts = parser.parse_args()
+
+    start = datetime(2024, 1, 1)
+    stamps: List[str] = [
+        (start + timedelta(seconds=i * 7)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for i in range(opts.number)
+    ]
+    game_time = GameTime(DELTA)
+    # every call is a cache miss
+    cold = GameTime(DELTA, cache_size=0)
+    for stamp in stamps[:1000]:
+        if legacy(stamp) != game_time.convert(stamp):
+            raise SystemExit(f"result mismatch for {stamp}")
+
+    cases = (
+        ("legacy, unique", lambda: [legacy(s) for s in stamps]),
+        ("GameTime, unique", lambda: [cold.convert(s) for s in stamps]),
+        ("legacy, repeated", lambda: [legacy(stamps[0]) for _ in stamps]),
+        ("GameTime, repeated", lambda: [game_time.convert(stamps[0]) for _ in stamps]),
+    )
+    for name, func in cases:
+        best: float = min(timeit.repeat(func, number=1, repeat=3))
+        print(f"{name:20s} {best / opts.number * 1e6:8.3f} us/call")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# #[EOF]#######################################################################
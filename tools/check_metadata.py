@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+  check_metadata.py
+  Author : Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+  Created: 19.10.2026, 10:42:17
+
+  Purpose: Check that the encoders write the screenshot metadata.
+
+  Encodes a sample screenshot to every output type with the metadata
+  enabled, through Pillow and through the streaming converter, and checks
+  that the written file contains the XMP packet. Exits with status 1
+  if any file does not.
+
+  usage: python tools/check_metadata.py
+"""
+
+import os
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PIL
+from PIL import Image
+
+from edpc.keys import EDPCKeys
+from edpc.metadata import Metadata
+from edpc.streams import StreamConverter
+
+ITEM: Dict[str, Any] = {
+    EDPCKeys.P_SYSTEM: "Sol",
+    EDPCKeys.P_BODY: "Earth",
+    EDPCKeys.P_CMDR: "Zażółć",
+    EDPCKeys.P_TIMESTAMP: "2023-01-01T03:01:43Z",
+}
+
+
+def contains(path: str, packet: bytes) -> bool:
+    """Check that the file contains the packet."""
+    with open(path, "rb") as file:
+        return packet in file.read()
+
+
+def main() -> None:
+    """Run the check."""
+    metadata = Metadata(ITEM)
+    packet: bytes = metadata.xmp()
+    failed: List[str] = []
+    print(f"Pillow {PIL.__version__}")
+    with tempfile.TemporaryDirectory() as tmp:
+        src: str = os.path.join(tmp, "src.bmp")
+        Image.new("RGB", (320, 200), (10, 20, 30)).save(src)
+        cases: List[str] = []
+        with Image.open(src) as img:
+            for suffix in ("jpg", "png", "webp", "tif"):
+                dst: str = os.path.join(tmp, f"pil.{suffix}")
+                try:
+                    img.save(dst, **metadata.pil_params(suffix))
+                except (KeyError, OSError) as ex:
+                    print(f"pil    {suffix:5s} skipped: {ex}")
+                    continue
+                cases.append(dst)
+        for suffix in StreamConverter.SUFFIXES:
+            dst = os.path.join(tmp, f"stream.{suffix}")
+            StreamConverter().convert(src, dst, suffix, 6, None, metadata)
+            cases.append(dst)
+        for dst in cases:
+            name: str = os.path.basename(dst)
+            found: bool = contains(dst, packet)
+            print(f"{name:12s} {'ok' if found else 'MISSING XMP'}")
+            if not found:
+                failed.append(name)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
+
+
+# #[EOF]#######################################################################